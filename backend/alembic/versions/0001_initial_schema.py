@@ -0,0 +1,79 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 19:53:22.683261
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('programs',
+    sa.Column('position', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.Text(), nullable=False),
+    sa.Column('award_level', sa.String(length=32), nullable=False),
+    sa.Column('award', sa.String(length=32), nullable=False),
+    sa.Column('total_credits', sa.Integer(), nullable=False),
+    sa.Column('delivery_mode', sa.String(length=64), nullable=False),
+    sa.Column('delivery', sa.String(length=64), nullable=False),
+    sa.Column('campuses', sa.Text(), nullable=False),
+    sa.Column('url', sa.Text(), nullable=False),
+    sa.Column('tags', sa.Text(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('valid', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('position')
+    )
+    op.create_index('ix_programs_id', 'programs', ['id'])
+    op.create_index('ix_programs_award', 'programs', ['award', 'position'])
+
+    op.create_table('program_tags',
+    sa.Column('tag', sa.String(length=64), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tag', 'position')
+    )
+    op.create_index('ix_program_tags_position', 'program_tags', ['position'])
+
+    op.create_table('goals',
+    sa.Column('position', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('data', sa.Text(), nullable=False),
+    sa.PrimaryKeyConstraint('position')
+    )
+    op.create_index('ix_goals_id', 'goals', ['id'])
+
+    op.create_table('goal_candidates',
+    sa.Column('goal_id', sa.Integer(), nullable=False),
+    sa.Column('program_id', sa.Integer(), nullable=False),
+    sa.Column('fit', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('goal_id', 'program_id')
+    )
+
+    op.create_table('cost_models',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('data', sa.Text(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cost_models')
+    op.drop_table('goal_candidates')
+    op.drop_index('ix_goals_id', table_name='goals')
+    op.drop_table('goals')
+    op.drop_index('ix_program_tags_position', table_name='program_tags')
+    op.drop_table('program_tags')
+    op.drop_index('ix_programs_award', table_name='programs')
+    op.drop_index('ix_programs_id', table_name='programs')
+    op.drop_table('programs')
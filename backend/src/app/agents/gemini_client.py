@@ -0,0 +1,144 @@
+import asyncio, json, os, random, threading, weakref
+from typing import Any, AsyncIterator, Dict, Tuple
+import httpx
+
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class GeminiError(Exception):
+    """Non-2xx answer from the Gemini REST API (after retries, if retryable)."""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"Gemini API error {status_code}: {text[:200]}")
+        self.status_code = status_code
+        self.text = text
+
+
+class GeminiClient:
+    """
+    Async client for the Gemini generateContent REST endpoint.
+
+    One pooled httpx.AsyncClient per event loop (keep-alive, so no TLS handshake
+    per call) is shared by every request, in-flight calls are capped by a semaphore, and
+    429/5xx/transport errors are retried with exponential backoff + jitter
+    (honouring Retry-After when the server sends it).
+    """
+
+    def __init__(self, api_key: str | None = None, base_url: str = GEMINI_BASE_URL,
+                 model: str = GEMINI_MODEL, timeout: float = 30.0, connect_timeout: float = 5.0,
+                 max_concurrency: int = 8, max_retries: int = 3, backoff: float = 0.5,
+                 max_connections: int = 20):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_connections)
+        # httpx clients and semaphores are bound to the event loop that first uses them
+        self._per_loop: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _ensure(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pair = self._per_loop.get(loop)
+            if pair is None:
+                # a client of a closed loop can't be awaited any more; dropping it lets its
+                # sockets (and the loop they reference) be collected
+                for old in [l for l in self._per_loop if l.is_closed()]:
+                    del self._per_loop[old]
+                pair = self._per_loop[loop] = (httpx.AsyncClient(timeout=self.timeout, limits=self.limits),
+                                               asyncio.Semaphore(self.max_concurrency))
+            return pair
+
+    def url(self, method: str = "generateContent") -> str:
+        return f"{self.base_url}/models/{self.model}:{method}"
+
+    def _delay(self, attempt: int, resp: httpx.Response | None) -> float:
+        if resp is not None:
+            try:
+                return min(float(resp.headers["retry-after"]), 30.0)
+            except (KeyError, ValueError):
+                pass
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def generate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        client, sem = self._ensure()
+        params = {"key": self.api_key} if self.api_key else None
+        async with sem:
+            for attempt in range(self.max_retries + 1):
+                resp = None
+                try:
+                    resp = await client.post(self.url(), json=payload, params=params)
+                except httpx.TransportError:
+                    if attempt == self.max_retries:
+                        raise
+                else:
+                    if resp.status_code == 200:
+                        return resp.json()
+                    if resp.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                        raise GeminiError(resp.status_code, resp.text)
+                await asyncio.sleep(self._delay(attempt, resp))
+
+    async def stream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Text chunks from streamGenerateContent (alt=sse) as the model produces them.
+        Failures are retried like generate() as long as nothing has been yielded yet.
+        """
+        client, sem = self._ensure()
+        params = {"alt": "sse"}
+        if self.api_key:
+            params["key"] = self.api_key
+        async with sem:
+            for attempt in range(self.max_retries + 1):
+                resp = None
+                started = False
+                try:
+                    async with client.stream("POST", self.url("streamGenerateContent"),
+                                             json=payload, params=params) as resp:
+                        if resp.status_code == 200:
+                            async for line in resp.aiter_lines():
+                                if not line.startswith("data:"):
+                                    continue
+                                chunk = json.loads(line[5:].strip())
+                                parts = (chunk.get("candidates") or [{}])[0].get("content", {}).get("parts", [])
+                                for part in parts:
+                                    if part.get("text"):
+                                        started = True
+                                        yield part["text"]
+                            return
+                        text = (await resp.aread()).decode("utf-8", errors="replace")
+                        if resp.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                            raise GeminiError(resp.status_code, text)
+                except httpx.TransportError:
+                    if started or attempt == self.max_retries:
+                        raise
+                await asyncio.sleep(self._delay(attempt, resp))
+
+    async def aclose(self):
+        # the running loop's client; other loops close theirs (or are dropped once closed)
+        with self._lock:
+            pair = self._per_loop.pop(asyncio.get_running_loop(), None)
+        if pair is not None:
+            await pair[0].aclose()
+
+
+_client: GeminiClient | None = None
+
+def gemini_client() -> GeminiClient:
+    global _client
+    if _client is None:
+        _client = GeminiClient(
+            api_key=os.getenv("GEMINI_API_KEY"),
+            timeout=float(os.getenv("GEMINI_TIMEOUT", "30")),
+            connect_timeout=float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5")),
+            max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+            max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "3")),
+        )
+    return _client
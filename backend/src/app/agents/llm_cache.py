@@ -0,0 +1,151 @@
+import hashlib, json, os, re, sqlite3, threading, time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from ..util.files import STORE
+
+
+def normalize_prompt(prompt: str) -> str:
+    # "I want to be a nurse!" and "i want to be a  nurse" share an entry
+    p = re.sub(r"\s+", " ", (prompt or "").lower()).strip()
+    return p.rstrip(" .!?")
+
+
+def seed_version(*deps) -> str:
+    """Combined digest of the seed files (name, kind) a cached answer was built from."""
+    h = hashlib.sha256()
+    for name, kind in deps:
+        h.update(STORE.digest(name, kind).encode())
+    return h.hexdigest()[:16]
+
+
+class LLMCache:
+    """
+    TTL + LRU cache for LLM answers, keyed on (namespace, normalized prompt, seed version).
+
+    The in-memory tier is an OrderedDict; when db_path is set, entries are also
+    written to a SQLite table so they survive restarts and are shared by workers
+    on the same host. When a new seed version is seen for a namespace, entries
+    built from the old seeds are dropped from memory; their rows stay on disk for
+    workers still on the old seeds (a rolling reload) until they expire.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600.0, db_path: str | None = None,
+                 purge_interval: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # expired rows are never returned, so deleting them can wait
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        self._mem: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+        self._seeds: Dict[str, str] = {}
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self.db_path = db_path
+        self._db = None
+        if db_path:
+            self._open_db()
+            # a SQLite connection must not cross fork(); prefork workers open their own
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _open_db(self):
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, namespace TEXT, seed TEXT, value TEXT, expires_at REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_expires_at ON llm_cache (expires_at)")
+        self._db.commit()
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._open_db()
+
+    @staticmethod
+    def make_key(namespace: str, prompt: str, seed: str) -> str:
+        raw = f"{namespace}\x00{seed}\x00{normalize_prompt(prompt)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _check_seed(self, namespace: str, seed: str):
+        # caller holds the lock
+        old = self._seeds.get(namespace)
+        if old == seed:
+            return
+        self._seeds[namespace] = seed
+        if old is None:
+            return
+        for k in [k for k, v in self._mem.items() if v[0] == namespace and v[1] != seed]:
+            del self._mem[k]
+
+    def get(self, namespace: str, prompt: str, seed: str) -> Any | None:
+        key = self.make_key(namespace, prompt, seed)
+        now = time.time()
+        with self._lock:
+            self._check_seed(namespace, seed)
+            hit = self._mem.get(key)
+            if hit is not None:
+                if hit[3] > now:
+                    self._mem.move_to_end(key)
+                    self.hits += 1
+                    return hit[2]
+                del self._mem[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[1] > now:
+                    value = json.loads(row[0])
+                    self._put(key, namespace, seed, value, row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def _put(self, key, namespace, seed, value, expires_at):
+        self._mem[key] = (namespace, seed, value, expires_at)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, namespace: str, prompt: str, seed: str, value: Any):
+        key = self.make_key(namespace, prompt, seed)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._check_seed(namespace, seed)
+            self._put(key, namespace, seed, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, namespace, seed, value, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)", (key, namespace, seed, json.dumps(value), expires_at))
+                now = time.time()
+                if now >= self._next_purge:
+                    self._db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+                    self._next_purge = now + self.purge_interval
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self._mem),
+            "disk": self._db is not None,
+        }
+
+
+LLM_CACHE = LLMCache(
+    max_entries=int(os.getenv("LLM_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("LLM_CACHE_TTL", "3600")),
+    db_path=os.getenv("LLM_CACHE_DB") or None,
+)
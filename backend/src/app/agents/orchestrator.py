@@ -1,49 +1,35 @@
-import os, json
-from typing import Any, Dict, List
-from dotenv import load_dotenv
-import google.generativeai as genai
+import contextvars, os, json, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
 
 from .tools import tool_search_programs, tool_get_program_details, tool_estimate_cost
-from ..util.files import load_csv, load_json
-from ..services.matcher import remaining_credits
 from ..services.cost_estimator import estimate_terms, estimate_cost
-from ..services.typing import CostModel
+from ..repositories.program_repo import program_repo
+from ..repositories.cost_repo import cost_repo
+from .llm_cache import LLM_CACHE, seed_version
+from .registry import gemini_model
+from ..util.metrics import span
 
-load_dotenv()
-
-def _valid_program_ids() -> set[int]:
-    ids = set()
-    for p in load_csv("programs_mdc.csv"):
-        try: ids.add(int(p["id"]))
-        except: pass
-    return ids
+def _known_program_ids(ids) -> set:
+    # the ids among `ids` that name a program of the store (valid or not)
+    return {p.id for p in program_repo().get_many(ids)}
 
 def _fallback(req: Dict[str, Any]) -> Dict[str, Any]:
     # Use the heuristic path if AI fails
-    mappings = load_json("goal_program_map_mdc.json")
-    programs = load_csv("programs_mdc.csv")
-    base_scores = {}
-    for m in mappings:
-        if int(m.get("goal_id", -1)) == int(req["goalId"]):
-            pid = int(m["program_id"])
-            base_scores[pid] = max(base_scores.get(pid, 0), int(m.get("fit_strength", 3)))
-    cm = CostModel(**load_json("cost_model.json"))
+    cm = cost_repo().cost_model()
     cands = []
-    for p in programs:
-        pid = int(p["id"])
-        if pid not in base_scores:
-            continue
-        total = int(p.get("total_credits") or 0)
-        rem = max(0, total - int(req.get("earnedCredits") or 0))
+    for p, fit in program_repo().candidates(req["goalId"], valid_only=False):
+        pid = p.id
+        rem = max(0, p.total_credits - int(req.get("earnedCredits") or 0))
         terms = estimate_terms(rem)
         cost = estimate_cost(rem, terms, cm, pid)
         cands.append({
-            "score": base_scores[pid],
-            "program": { "id": pid, "name": p.get("name"), "award_level": p.get("award_level"), "url": p.get("url") },
+            "score": fit,
+            "program": { "id": pid, "name": p.name, "award_level": p.award_level, "url": p.url },
             "remaining_credits": rem,
             "estimated_terms": terms,
             "estimated_cost": cost,
-            "why_this": f"Heuristic match (fit_strength={base_scores[pid]})."
+            "why_this": f"Heuristic match (fit_strength={fit})."
         })
     cands.sort(key=lambda x: (-x["score"], x["remaining_credits"]))
     return {
@@ -52,64 +38,87 @@ def _fallback(req: Dict[str, Any]) -> Dict[str, Any]:
             "debug": {"origin": "fallback"}
     }
 
-def recommend_with_gemini(req: Dict[str, Any]) -> Dict[str, Any]:
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        return _fallback(req)
+def _search(args):
+    goal_id = args.get("goalId")
+    return {"candidates": tool_search_programs(
+        goalId=int(goal_id) if goal_id is not None else None,
+        priorEducation=args.get("priorEducation"),
+        earnedCredits=int(args.get("earnedCredits",0)),
+        preferOnline=bool(args.get("preferOnline",False)),
+        query=args.get("query")
+    )}
 
-    genai.configure(api_key=api_key)
+def _details(args):
+    return {"program": tool_get_program_details(int(args.get("program_id")))}
 
-    # Load function declarations from JSON files
-    base = os.path.join(os.path.dirname(__file__), "schemas")
-    f_search = json.load(open(os.path.join(base, "searchPrograms.json"), "r", encoding="utf-8"))
-    f_details = json.load(open(os.path.join(base, "getProgramDetails.json"), "r", encoding="utf-8"))
-    f_cost = json.load(open(os.path.join(base, "estimateCost.json"), "r", encoding="utf-8"))
+def _cost(args):
+    return {"estimate": tool_estimate_cost(int(args.get("program_id")), int(args.get("remaining_credits",0)))}
 
-    model = genai.GenerativeModel(
-        model="gemini-1.5-pro-latest",
-        tools=[{"function_declarations":[f_search, f_details, f_cost]}],
-        system_instruction=open(os.path.join(os.path.dirname(__file__), "prompts", "system_prompt.txt"), "r", encoding="utf-8").read()
-    )
+TOOLS = {"searchPrograms": _search, "getProgramDetails": _details, "estimateCost": _cost}
 
-    chat = model.start_chat(history=[])
+_tool_pool = ThreadPoolExecutor(max_workers=int(os.getenv("AGENT_TOOL_WORKERS", "4")),
+                                thread_name_prefix="agent-tool")
 
-    # Kick off with user inputs
-    resp = chat.send_message(json.dumps({
+def _run_tool(call) -> Dict[str, Any]:
+    args = dict(call.args.items()) if hasattr(call, "args") else {}
+    with span(f"tool.{call.name}"):
+        return TOOLS[call.name](args)
+
+def recommend_with_gemini(req: Dict[str, Any]) -> Dict[str, Any]:
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        return _fallback(req)
+
+    user_input = {
         "goalId": req["goalId"],
         "priorEducation": req.get("priorEducation","hs"),
         "earnedCredits": int(req.get("earnedCredits",0)),
         "preferOnline": bool(req.get("preferOnline",False))
-    }))
+    }
+    cache_key = json.dumps(user_input, sort_keys=True)
+    # goal keywords and preferred awards shape the tool results, so goal edits invalidate too
+    seed = seed_version(("programs_mdc.csv", "programs"), ("goal_program_map_mdc.json", "mappings"),
+                        ("cost_model.json", "json"), ("career_goals.json", "json"))
+    cached = LLM_CACHE.get("recommend_ai", cache_key, seed)
+    if cached is not None:
+        return dict(cached, debug={"origin": "ai", "cache": "hit"})
+
+    # Prebuilt once per API key: schemas, system prompt and the model object
+    model = gemini_model(api_key)
 
-    # Handle tool calls
+    chat = model.start_chat(history=[])
+
+    # Kick off with user inputs
+    steps = []
+    t0 = time.perf_counter()
+    with span("gemini.agent"):
+        resp = chat.send_message(json.dumps(user_input))
+    model_ms = (time.perf_counter() - t0) * 1000
+
+    # Handle tool calls: all calls of one turn run concurrently and their
+    # responses go back to the model in a single message
     MAX_STEPS = 6
     for _ in range(MAX_STEPS):
         parts = getattr(resp.candidates[0].content, "parts", []) if resp and resp.candidates else []
         calls = [p.function_call for p in parts if getattr(p, "function_call", None)]
-        if not calls:
+        steps.append({"model_ms": round(model_ms, 1), "tools": [c.name for c in calls]})
+        if not calls or any(c.name not in TOOLS for c in calls):
+            # Done, or unknown tool; stop tool loop
             break
 
-        for call in calls:
-            name = call.name
-            args = dict(call.args.items()) if hasattr(call, "args") else {}
-
-            if name == "searchPrograms":
-                out = tool_search_programs(
-                    goalId=int(args.get("goalId")),
-                    priorEducation=args.get("priorEducation"),
-                    earnedCredits=int(args.get("earnedCredits",0)),
-                    preferOnline=bool(args.get("preferOnline",False))
-                )
-                resp = chat.send_message(genai.FunctionResponse(name=name, response={"candidates": out}))
-            elif name == "getProgramDetails":
-                out = tool_get_program_details(int(args.get("program_id")))
-                resp = chat.send_message(genai.FunctionResponse(name=name, response={"program": out}))
-            elif name == "estimateCost":
-                out = tool_estimate_cost(int(args.get("program_id")), int(args.get("remaining_credits",0)))
-                resp = chat.send_message(genai.FunctionResponse(name=name, response={"estimate": out}))
-            else:
-                # Unknown tool; stop tool loop
-                break
+        t0 = time.perf_counter()
+        ctxs = [contextvars.copy_context() for _ in calls]
+        results = list(_tool_pool.map(lambda ctx, call: ctx.run(_run_tool, call), ctxs, calls))
+        steps[-1]["tool_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+        from google.generativeai import protos
+        t0 = time.perf_counter()
+        with span("gemini.agent"):
+            resp = chat.send_message([
+                protos.Part(function_response=protos.FunctionResponse(name=call.name, response=out))
+                for call, out in zip(calls, results)
+            ])
+        model_ms = (time.perf_counter() - t0) * 1000
 
     # Final answer should be JSON per system prompt
     try:
@@ -118,18 +127,19 @@ def recommend_with_gemini(req: Dict[str, Any]) -> Dict[str, Any]:
         return _fallback(req)
 
     # Validate program IDs and trim to 3
-    valid_ids = _valid_program_ids()
-    recs = []
-    for r in data.get("recommendations", []):
-        pid = r.get("program", {}).get("id")
-        if isinstance(pid, int) and pid in valid_ids:
-            recs.append(r)
+    answered = data.get("recommendations", [])
+    ids = [r.get("program", {}).get("id") for r in answered]
+    valid_ids = _known_program_ids(pid for pid in ids if isinstance(pid, int))
+    recs = [r for r, pid in zip(answered, ids) if isinstance(pid, int) and pid in valid_ids]
 
     if not recs:
         return _fallback(req)
 
-    return {
+    out = {
             "recommendations": recs[:3],
             "advising_disclaimer": data.get("advising_disclaimer") or "Check the official MDC catalog/advisors for the most current requirements.",
-            "debug": {"origin": "ai"}
+            "debug": {"origin": "ai", "steps": steps}
     }
+    # Only real AI answers are cached; fallbacks are cheap to recompute
+    LLM_CACHE.set("recommend_ai", cache_key, seed, out)
+    return out
@@ -0,0 +1,155 @@
+import json, os, threading
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from ..util.files import load_json, load_programs, STORE
+from .llm_cache import seed_version
+
+AGENT_DIR = os.path.dirname(__file__)
+GEMINI_AGENT_MODEL = "gemini-1.5-pro-latest"
+PROMPT_SLOT = "\x00PROMPT\x00"
+
+
+def approx_tokens(text: str) -> int:
+    # ~4 characters per token for English text; good enough to watch payload size
+    return (len(text) + 3) // 4
+
+
+class PromptTemplate:
+    """A context prompt with everything but the user input rendered ahead of time."""
+    __slots__ = ("head", "tail", "seed", "chars", "tokens")
+
+    def __init__(self, rendered: str, seed: str):
+        self.head, self.tail = rendered.split(PROMPT_SLOT)
+        self.seed = seed
+        self.chars = len(self.head) + len(self.tail)
+        self.tokens = approx_tokens(self.head + self.tail)
+
+    def render(self, prompt: str) -> str:
+        return self.head + prompt + self.tail
+
+
+def _invoke_llm_deps(data_dir: str):
+    return [(f"{data_dir}/career_goals.json", "json"), (f"{data_dir}/programs_mdc.csv", "programs"),
+            (f"{data_dir}/cost_model.json", "json"), (f"{data_dir}/transfer_pathways.json", "json")]
+
+
+def _build_invoke_llm_prompt(data_dir: str) -> PromptTemplate:
+    goals = load_json(f"{data_dir}/career_goals.json")
+    programs = load_programs(f"{data_dir}/programs_mdc.csv")
+    cost_model = load_json(f"{data_dir}/cost_model.json")
+    transfer_pathways = load_json(f"{data_dir}/transfer_pathways.json")
+
+    sample_programs = programs[:6]
+
+    # 🧠 Structured system prompt
+    context = f"""
+    You are ElevatePath, an AI academic advisor for Miami Dade College.
+
+    Your goal is to respond in JSON that follows this schema:
+
+    {{
+      "career_goal": "string",
+      "pathway_data": {{
+        "mdc_phase": {{
+          "degree_name": "string",
+          "courses": [{{"code": "string", "name": "string", "credits": number}}],
+          "duration_semesters": number,
+          "total_cost": number,
+          "total_credits": number
+        }},
+        "fiu_phase": {{
+          "degree_name": "string",
+          "transfer_credits": number,
+          "required_courses": [{{"code": "string", "name": "string", "credits": number}}],
+          "duration_semesters": number,
+          "total_cost": number,
+          "remaining_credits": number
+        }},
+        "advanced_phase": {{
+          "masters": {{
+            "degree_name": "string",
+            "duration_years": number,
+            "total_cost": number,
+            "total_credits": number
+          }},
+          "phd": {{
+            "degree_name": "string",
+            "duration_years": number,
+            "funding_available": boolean
+          }}
+        }},
+        "total_summary": {{
+          "total_years": number,
+          "total_cost": number,
+          "career_outlook": "string"
+        }}
+      }}
+    }}
+
+    Generate realistic data using these examples:
+    - Career Goals: {[g['name'] for g in goals[:8]]}
+    - Programs: {[p.name for p in sample_programs]}
+    - Transfer Options: {list(transfer_pathways.get("by_program", {}).keys())[:5]}
+    - Average Cost: {cost_model.get('average_tuition', 'N/A')}
+
+    User input: "{PROMPT_SLOT}"
+    """
+    return PromptTemplate(context, seed_version(*_invoke_llm_deps(data_dir)))
+
+
+def invoke_llm_prompt(data_dir: str) -> PromptTemplate:
+    """The /api/invoke_llm context, rebuilt only when one of its seed files changes."""
+    return STORE.derived(f"invoke_llm_prompt:{data_dir}", _invoke_llm_deps(data_dir),
+                         lambda: _build_invoke_llm_prompt(data_dir))
+
+
+@lru_cache(maxsize=None)
+def function_declarations() -> List[Dict[str, Any]]:
+    base = os.path.join(AGENT_DIR, "schemas")
+    out = []
+    for name in ("searchPrograms.json", "getProgramDetails.json", "estimateCost.json"):
+        with open(os.path.join(base, name), "r", encoding="utf-8") as f:
+            out.append(json.load(f))
+    return out
+
+
+@lru_cache(maxsize=None)
+def system_prompt() -> str:
+    with open(os.path.join(AGENT_DIR, "prompts", "system_prompt.txt"), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+_model: Tuple[str, Any] | None = None  # (api key, model)
+_model_lock = threading.Lock()
+
+def gemini_model(api_key: str):
+    """
+    GenerativeModel for the tool-calling agent. genai.configure sets one key for the
+    whole process, so only the model of the configured key is kept: another key
+    reconfigures the SDK and replaces it.
+    """
+    global _model
+    with _model_lock:
+        if _model is None or _model[0] != api_key:
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+            _model = (api_key, genai.GenerativeModel(
+                model_name=GEMINI_AGENT_MODEL,
+                tools=[{"function_declarations": function_declarations()}],
+                system_instruction=system_prompt()
+            ))
+        return _model[1]
+
+
+def stats() -> Dict[str, Any]:
+    """Static prompt sizes, to keep an eye on what every request sends."""
+    agent = system_prompt() + json.dumps(function_declarations())
+    out = {"agent": {"chars": len(agent), "approx_tokens": approx_tokens(agent)}}
+    data_dir = os.path.abspath("data/seed")
+    try:
+        t = invoke_llm_prompt(data_dir)
+        out["invoke_llm"] = {"chars": t.chars, "approx_tokens": t.tokens, "seed": t.seed}
+    except FileNotFoundError as e:
+        out["invoke_llm"] = {"error": str(e)}
+    return out
@@ -0,0 +1,123 @@
+import json
+from typing import Any, Iterator, List, Tuple
+
+# Top-level pieces of the invoke_llm answer, in the order the schema lists them
+PATHWAY_FIELDS = (
+    "career_goal",
+    "pathway_data.mdc_phase",
+    "pathway_data.fiu_phase",
+    "pathway_data.advanced_phase",
+    "pathway_data.total_summary",
+)
+
+
+def sse(event: str, data: Any) -> str:
+    """One Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class _Frame:
+    __slots__ = ("kind", "path", "start", "key", "expect_key", "value_start")
+
+    def __init__(self, kind: str, path: str, start: int):
+        self.kind = kind            # "obj" | "arr"
+        self.path = path
+        self.start = start
+        self.key = None
+        self.expect_key = kind == "obj"
+        self.value_start = None     # start of a scalar value being read
+
+
+class JsonFieldStream:
+    """
+    Incremental scanner over a JSON document that arrives in chunks.
+
+    feed() returns (path, value) for every watched field whose value has been
+    fully received, so e.g. "pathway_data.mdc_phase" can be sent to the client
+    while the model is still writing "fiu_phase". Paths are dotted object keys.
+    """
+
+    def __init__(self, fields=PATHWAY_FIELDS):
+        self.fields = set(fields)
+        self.buf = ""
+        self.pos = 0
+        self.stack: List[_Frame] = []
+        self.in_string = False
+        self.escape = False
+        self.string_start = 0
+        self.done = set()
+
+    def _child_path(self, frame: _Frame) -> str:
+        if frame.kind == "arr":
+            return f"{frame.path}[]"
+        return f"{frame.path}.{frame.key}" if frame.path else str(frame.key)
+
+    def _emit(self, path: str, start: int, end: int, out: List[Tuple[str, Any]]):
+        if path in self.fields and path not in self.done:
+            try:
+                out.append((path, json.loads(self.buf[start:end])))
+                self.done.add(path)
+            except ValueError:
+                pass
+
+    def _end_scalar(self, top: _Frame, end: int, out):
+        if top.value_start is not None:
+            self._emit(self._child_path(top), top.value_start, end, out)
+            top.value_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.buf += chunk
+        out: List[Tuple[str, Any]] = []
+        buf = self.buf
+        for i in range(self.pos, len(buf)):
+            c = buf[i]
+            top = self.stack[-1] if self.stack else None
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    if top is not None and top.kind == "obj" and top.expect_key:
+                        top.key = json.loads(buf[self.string_start:i + 1])
+                    elif top is not None:
+                        self._emit(self._child_path(top), self.string_start, i + 1, out)
+                continue
+            if c == '"':
+                self.in_string = True
+                self.string_start = i
+            elif c in "{[":
+                path = self._child_path(top) if top is not None else ""
+                self.stack.append(_Frame("obj" if c == "{" else "arr", path, i))
+            elif c in "}]":
+                if top is None:
+                    continue
+                self._end_scalar(top, i, out)
+                self.stack.pop()
+                self._emit(top.path, top.start, i + 1, out)
+            elif top is None:
+                continue
+            elif c == ":":
+                top.expect_key = False
+            elif c == ",":
+                self._end_scalar(top, i, out)
+                top.expect_key = top.kind == "obj"
+            elif not c.isspace() and top.value_start is None and not top.expect_key:
+                top.value_start = i  # number / true / false / null
+            elif c.isspace() and top.value_start is not None:
+                self._end_scalar(top, i, out)
+        self.pos = len(buf)
+        return out
+
+
+def fields_of(data: Any, fields=PATHWAY_FIELDS) -> Iterator[Tuple[str, Any]]:
+    """The watched fields of an already-parsed answer (used for cache hits)."""
+    for path in fields:
+        cur = data
+        for part in path.split("."):
+            if not isinstance(cur, dict) or part not in cur:
+                break
+            cur = cur[part]
+        else:
+            yield path, cur
@@ -1,58 +1,62 @@
-# backend/src/app/agents/tools.py (replace _programs with this)
-from typing import Any, Dict, List
-from ..util.files import load_csv, load_json
-from ..services.matcher import score_candidates, boost_by_delivery, remaining_credits
+# backend/src/app/agents/tools.py
+# Programs, goals and costs come from the configured store (repositories/), never straight from the seeds
+from ..services.matcher import boost_by_delivery, boost_program_by_goal_prefs
 from ..services.cost_estimator import estimate_terms, estimate_cost
-from ..services.typing import CostModel
-from ..util.validate import is_valid_program  # <-- NEW
-from ..util.files import load_csv, load_json
-from ..services.matcher import (
-    score_candidates, boost_by_delivery, remaining_credits,
-    _goal_prefs, boost_by_goal_prefs
-)
-from ..services.cost_estimator import estimate_terms, estimate_cost
-from ..services.typing import CostModel
-
+from ..repositories.program_repo import program_repo
+from ..repositories.goal_repo import goal_repo
+from ..repositories.cost_repo import cost_repo
 
 VALID_AWARDS = {"AA","AS","AAS","BAS","BS","CERTIFICATE"}
 
-def _programs():
-    progs = load_csv("programs_mdc.csv")
-    out = []
-    for p in progs:
-        try:
-            p["total_credits"] = int(p.get("total_credits") or 0)
-        except Exception:
-            p["total_credits"] = 0
-        if is_valid_program(p):
-            out.append(p)
-    return out
-def tool_search_programs(goalId: int, priorEducation: str | None, earnedCredits: int | None, preferOnline: bool | None):
-    mappings = load_json("goal_program_map_mdc.json")
-    progs = _programs()
-    scored = score_candidates(goalId, mappings)
-    prefs = _goal_prefs(goalId)
-
+def _keyword_matches(query: str, goalId: int | None, preferOnline: bool | None):
+    # keyword search (rag/search.py), restricted to the goal's candidates when a goal is given
+    repo = program_repo()
+    scored = {p.id: fit for p, fit in repo.candidates(goalId)} if goalId is not None else None
+    prefs = goal_repo().prefs(goalId) if goalId is not None else None
     res = []
-    for p in progs:
-        try:
-            pid = int(p["id"])
-        except Exception:
-            continue
-        if pid not in scored:
-            continue
+    for h in repo.search_index().search(query, limit=None, valid_only=True):
+        p = h.program
+        if scored is not None:
+            if p.id not in scored:
+                continue
+            s = boost_program_by_goal_prefs(boost_by_delivery(scored[p.id], p.delivery_mode, bool(preferOnline)), p, prefs)
+        else:
+            s = boost_by_delivery(0, p.delivery_mode, bool(preferOnline))
+        res.append({
+            "program_id": p.id,
+            "name": p.name,
+            "award_level": p.award_level,
+            "url": p.url or None,
+            "score": s,
+            "relevance": round(h.score, 3),
+            "matched": h.terms,
+        })
+    # hits arrive by relevance, so the stable sort keeps it as the tie-break
+    res.sort(key=lambda x: -x["score"])
+    return res[:6]
+
+def tool_search_programs(goalId: int | None, priorEducation: str | None, earnedCredits: int | None,
+                         preferOnline: bool | None, query: str | None = None):
+    if query and query.strip():
+        return _keyword_matches(query, goalId, preferOnline)
+    if goalId is None:
+        return []
 
-        s = scored[pid]
-        s = boost_by_delivery(s, p.get("delivery_mode"), bool(preferOnline))
-        s = boost_by_goal_prefs(s, p, prefs)
+    prefs = goal_repo().prefs(goalId)
+
+    res = []
+    # valid rows mapped to the goal, in catalog order
+    for p, s in program_repo().candidates(goalId):
+        s = boost_by_delivery(s, p.delivery_mode, bool(preferOnline))
+        s = boost_program_by_goal_prefs(s, p, prefs)
         # optional:
-        # s += penalty_generic_title(p.get("name"))
+        # s += penalty_generic_title(p.name)
 
         res.append({
-            "program_id": pid,
-            "name": p.get("name"),
-            "award_level": p.get("award_level"),
-            "url": p.get("url") or None,
+            "program_id": p.id,
+            "name": p.name,
+            "award_level": p.award_level,
+            "url": p.url or None,
             "score": s
         })
 
@@ -60,22 +64,22 @@ def tool_search_programs(goalId: int, priorEducation: str | None, earnedCredits:
     return res[:6]
 
 def tool_get_program_details(program_id: int):
-    for p in _programs():
-        if str(p["id"]) == str(program_id):
-            return {
-                "program_id": int(p["id"]),
-                "name": p.get("name"),
-                "award_level": p.get("award_level"),
-                "total_credits": int(p.get("total_credits") or 0),
-                "url": p.get("url") or None,
-                "delivery_mode": p.get("delivery_mode"),
-                "campuses": p.get("campuses"),
-                "tags": p.get("tags"),
-                "description": p.get("description")
-            }
-    return None
+    p = program_repo().get(program_id, valid_only=True)
+    if p is None:
+        return None
+    return {
+        "program_id": p.id,
+        "name": p.name,
+        "award_level": p.award_level,
+        "total_credits": p.total_credits,
+        "url": p.url or None,
+        "delivery_mode": p.delivery_mode,
+        "campuses": p.campuses,
+        "tags": p.tags,
+        "description": p.description
+    }
 
 def tool_estimate_cost(program_id: int, remaining_credits: int):
-    cm = CostModel(**load_json("cost_model.json"))
+    cm = cost_repo().cost_model()
     terms = estimate_terms(remaining_credits)
     return estimate_cost(remaining_credits, terms, cm, program_id) | {"estimated_terms": terms}
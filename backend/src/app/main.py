@@ -1,15 +1,50 @@
 # backend/src/app/main.py
+import time
+_t0 = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-import requests
-import os
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+import logging, os
 from pathlib import Path
 
+from backend.src.app.util.logging import setup_logging, log_payload
+from backend.src.app.util import logging as app_logging
+
+# .env has to be loaded before the app modules read their settings
+load_dotenv()
+setup_logging()
+log = logging.getLogger(__name__)
+
 # Import your existing route modules
 from backend.src.app.routes import goals, programs, recommendations
+from backend.src.app.agents.gemini_client import gemini_client, GeminiError
+from backend.src.app.agents.llm_cache import LLM_CACHE
+from backend.src.app.agents.registry import invoke_llm_prompt
+from backend.src.app.agents import registry
+from backend.src.app.agents.streaming import JsonFieldStream, fields_of, sse
+from backend.src.app.rag.search import tokenize
+from backend.src.app.repositories.goal_repo import goal_repo
+from backend.src.app.startup import STARTUP, warm_up
+from backend.src.app.middleware import ProfilerMiddleware, TimingMiddleware
+from backend.src.app.util.metrics import render_metrics, span
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Parse and index the seed data before the first request instead of during it
+    if os.getenv("WARMUP", "1") != "0":
+        await asyncio.to_thread(warm_up)
+    else:
+        STARTUP.ready = True
+    yield
+    # Close the pooled Gemini connections
+    await gemini_client().aclose()
 
 # Initialize FastAPI app
-app = FastAPI(title="ElevatePath API")
+app = FastAPI(title="ElevatePath API", lifespan=lifespan)
 
 # Allow requests from your frontend (Vite default port)
 app.add_middleware(
@@ -22,19 +57,27 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost: route latency histograms + Server-Timing; inside it the opt-in profiler
+app.add_middleware(ProfilerMiddleware)
+app.add_middleware(TimingMiddleware)
 
 # Load Gemini API key
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-print("✅ Loaded GEMINI_API_KEY:", bool(GEMINI_API_KEY))
+log.info("gemini api key loaded", extra={"configured": bool(GEMINI_API_KEY)})
 
 # Dynamically locate your data folder
 BASE_DIR = Path(__file__).resolve().parents[3]  # goes up from backend/src/app/main.py → backend/src → backend → project root
 DATA_DIR = BASE_DIR / "data" / "seed"
-print(f"📂 Using data directory: {DATA_DIR}")
+log.info("using data directory", extra={"data_dir": str(DATA_DIR)})
+
+def _llm_payload(context: str) -> dict:
+    return {
+        "contents": [{"role": "user", "parts": [{"text": context}]}],
+        "generationConfig": {"responseMimeType": "application/json"}
+    }
 
 @app.post("/api/invoke_llm")
 async def invoke_llm(request: Request):
-    from backend.src.app.util.files import load_json, load_csv
     import json
 
     body = await request.json()
@@ -43,94 +86,31 @@ async def invoke_llm(request: Request):
         return {"error": "Empty prompt"}
 
     data_dir = os.path.abspath("data/seed")
-    print("📂 Using data directory:", data_dir)
+    log.debug("invoke_llm", extra={"data_dir": data_dir, "prompt_chars": len(prompt)})
 
 
     try:
-        goals = load_json(f"{data_dir}/career_goals.json")
-        programs = load_csv(f"{data_dir}/programs_mdc.csv")
-        cost_model = load_json(f"{data_dir}/cost_model.json")
-        transfer_pathways = load_json(f"{data_dir}/transfer_pathways.json")
+        # Static part of the prompt is prebuilt per seed version; only the user input varies
+        template = invoke_llm_prompt(data_dir)
     except Exception as e:
-        print("❌ Error loading data files:", e)
+        log.exception("error loading data files")
         return {"error": f"Error loading data files: {e}"}
 
-    sample_programs = programs[:6]
-
-    # 🧠 Structured system prompt
-    context = f"""
-    You are ElevatePath, an AI academic advisor for Miami Dade College.
-
-    Your goal is to respond in JSON that follows this schema:
-
-    {{
-      "career_goal": "string",
-      "pathway_data": {{
-        "mdc_phase": {{
-          "degree_name": "string",
-          "courses": [{{"code": "string", "name": "string", "credits": number}}],
-          "duration_semesters": number,
-          "total_cost": number,
-          "total_credits": number
-        }},
-        "fiu_phase": {{
-          "degree_name": "string",
-          "transfer_credits": number,
-          "required_courses": [{{"code": "string", "name": "string", "credits": number}}],
-          "duration_semesters": number,
-          "total_cost": number,
-          "remaining_credits": number
-        }},
-        "advanced_phase": {{
-          "masters": {{
-            "degree_name": "string",
-            "duration_years": number,
-            "total_cost": number,
-            "total_credits": number
-          }},
-          "phd": {{
-            "degree_name": "string",
-            "duration_years": number,
-            "funding_available": boolean
-          }}
-        }},
-        "total_summary": {{
-          "total_years": number,
-          "total_cost": number,
-          "career_outlook": "string"
-        }}
-      }}
-    }}
-
-    Generate realistic data using these examples:
-    - Career Goals: {[g['name'] for g in goals[:8]]}
-    - Programs: {[p['name'] for p in sample_programs]}
-    - Transfer Options: {list(transfer_pathways.get("by_program", {}).keys())[:5]}
-    - Average Cost: {cost_model.get('average_tuition', 'N/A')}
-
-    User input: "{prompt}"
-    """
+    # Same prompt against the same seed data -> same answer
+    seed = template.seed
+    # the cache may hit SQLite: keep it off the event loop
+    cached = await asyncio.to_thread(LLM_CACHE.get, "invoke_llm", prompt, seed)
+    if cached is not None:
+        return cached
 
-    gemini_url = (
-        "https://generativelanguage.googleapis.com/v1beta/models/"
-        "gemini-2.5-flash:generateContent"
-        f"?key={GEMINI_API_KEY}"
-    )
-
-    payload = {
-        "contents": [{"role": "user", "parts": [{"text": context}]}],
-        "generationConfig": {"responseMimeType": "application/json"}
-    }
+    context = template.render(prompt)
+    payload = _llm_payload(context)
 
     try:
-        print("\n🚀 Sending structured request to Gemini...")
-        r = requests.post(gemini_url, json=payload, headers={"Content-Type": "application/json"})
-        print("Gemini status code:", r.status_code)
-
-        if r.status_code != 200:
-            return {"error": f"Gemini API error: {r.text}"}
+        log_payload(log, "gemini request", payload)
+        with span("gemini.generate"):
+            data = await gemini_client().generate(payload)
 
-        data = r.json()
         output_text = (
             data.get("candidates", [{}])[0]
             .get("content", {})
@@ -140,16 +120,43 @@ async def invoke_llm(request: Request):
 
         try:
             structured_output = json.loads(output_text)
+            await asyncio.to_thread(LLM_CACHE.set, "invoke_llm", prompt, seed, structured_output)
             return structured_output
         except Exception as e:
-            print("⚠️ Could not parse JSON:", e)
+            log.warning("could not parse gemini output as JSON", extra={"error": str(e)})
+            log_payload(log, "gemini response", output_text)
             return {"output": output_text}
 
+    except GeminiError as e:
+        log.warning("gemini api error", extra={"status_code": e.status_code})
+        return {"error": f"Gemini API error: {e.text}"}
     except Exception as e:
-        print("❌ Gemini request failed:", e)
+        log.exception("gemini request failed")
         return {"error": f"Gemini request failed: {e}"}
 
-    from backend.src.app.util.files import load_json, load_csv
+def _prompt_heuristic(prompt: str) -> dict:
+    """POST /recommendations for the career goal the prompt names (most name words matched), if any."""
+    words = set(tokenize(prompt))
+    best, goal = (0, 0.0), None
+    for g in goal_repo().list():
+        name = set(tokenize(g["name"]))
+        hits = len(words & name)
+        if hits and (hits, hits / len(name)) > best:
+            best, goal = (hits, hits / len(name)), g
+    if goal is None:
+        return {"goalId": None, "recommendations": []}
+    rec = recommendations.recommend(recommendations.RecRequest(priorEducation="hs", goalId=goal["id"]))
+    return {"goalId": goal["id"], "goal": goal["name"], **rec}
+
+@app.post("/api/invoke_llm/stream")
+async def invoke_llm_stream(request: Request):
+    """
+    Same answer as /api/invoke_llm, as Server-Sent Events: "start" right away,
+    "heuristic" with the top-3 programs for the career goal the prompt names, one
+    "field" event per top-level pathway section as soon as Gemini has finished
+    writing it, then "done" with the full answer (or "error").
+    """
+    import json
 
     body = await request.json()
     prompt = body.get("prompt", "").strip()
@@ -157,72 +164,76 @@ async def invoke_llm(request: Request):
         return {"error": "Empty prompt"}
 
     try:
-        goals = load_json(str(DATA_DIR / "career_goals.json"))
-        programs = load_csv(str(DATA_DIR / "programs_mdc.csv"))
-        mappings = load_json(str(DATA_DIR / "goal_program_map_mdc.json"))
-        transfer_pathways = load_json(str(DATA_DIR / "transfer_pathways.json"))
-        print("✅ Data files loaded successfully")
+        template = invoke_llm_prompt(os.path.abspath("data/seed"))
     except Exception as e:
-        print("❌ Error loading data files:", e)
         return {"error": f"Error loading data files: {e}"}
 
-    # Use smaller subset for prompt size
-    sample_programs = programs[:8]
-
-    # Build AI prompt context
-    context = f"""
-    You are ElevatePath, an AI academic advisor for Miami Dade College.
-
-    Based on the following institutional data, recommend suitable academic or career paths
-    that align with what the user describes. Be concise and practical.
-
-    Career Goals (examples): {[g['name'] for g in goals[:8]]}
-    Example Programs: {[p['name'] for p in sample_programs]}
-    Transfer Pathways Examples: {list(transfer_pathways.get("by_program", {}).keys())[:5]}
-
-    The user says: "{prompt}"
-    """
-
-    # Gemini endpoint
-    gemini_url = (
-        "https://generativelanguage.googleapis.com/v1beta/models/"  # Changed from /v1/ to /v1beta/
-        "gemini-2.5-flash:generateContent"  # Changed model from gemini-1.5-flash to gemini-2.5-flash
-        f"?key={GEMINI_API_KEY}"
-    )
-
-
-    payload = {"contents": [{"role": "user", "parts": [{"text": context}]}]}
-
-    try:
-        print("\n🚀 Sending request to Gemini...")
-        print("Payload preview:", payload["contents"][0]["parts"][0]["text"][:250], "...\n")
-
-        r = requests.post(gemini_url, json=payload, headers={"Content-Type": "application/json"})
-        print("Gemini status code:", r.status_code)
-        print("Gemini response text:", r.text[:800], "\n")
-
-        if r.status_code != 200:
-            return {"error": f"Gemini API error: {r.text}"}
-
-        data = r.json()
-        output = (
-            data.get("candidates", [{}])[0]
-            .get("content", {})
-            .get("parts", [{}])[0]
-            .get("text", "")
-        )
-
-        if not output:
-            return {"error": "Gemini returned an empty response"}
-
-        print("✅ Gemini output preview:", output[:300])
-        return {"output": output.strip()}
+    async def events():
+        cached = await asyncio.to_thread(LLM_CACHE.get, "invoke_llm", prompt, template.seed)
+        yield sse("start", {"cached": cached is not None})
+        yield sse("heuristic", await asyncio.to_thread(_prompt_heuristic, prompt))
+        if cached is not None:
+            for path, value in fields_of(cached):
+                yield sse("field", {"path": path, "value": value})
+            yield sse("done", cached)
+            return
+
+        fields = JsonFieldStream()
+        chunks = []
+        try:
+            with span("gemini.stream"):
+                async for chunk in gemini_client().stream(_llm_payload(template.render(prompt))):
+                    chunks.append(chunk)
+                    for path, value in fields.feed(chunk):
+                        yield sse("field", {"path": path, "value": value})
+        except GeminiError as e:
+            yield sse("error", {"error": f"Gemini API error: {e.text}"})
+            return
+        except Exception as e:
+            yield sse("error", {"error": f"Gemini request failed: {e}"})
+            return
 
-    except Exception as e:
-        print("❌ Gemini request failed:", e)
-        return {"error": f"Gemini request failed: {e}"}
+        output_text = "".join(chunks)
+        try:
+            data = json.loads(output_text)
+            await asyncio.to_thread(LLM_CACHE.set, "invoke_llm", prompt, template.seed, data)
+        except Exception:
+            data = {"output": output_text}
+        yield sse("done", data)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/api/seeds")
+def seed_stats():
+    from backend.src.app.util.files import STORE
+    return STORE.stats()
+
+@app.get("/api/llm_cache")
+def llm_cache_stats():
+    return LLM_CACHE.stats()
+
+@app.get("/api/prompts")
+def prompt_stats():
+    return registry.stats()
+
+@app.get("/api/logging")
+def logging_stats():
+    return app_logging.stats()
+
+@app.get("/metrics")
+def metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/readyz")
+def readyz():
+    # 503 until the lifespan warm-up has finished without errors
+    return JSONResponse(STARTUP.snapshot(), status_code=200 if STARTUP.ready else 503)
 
 # Include your backend’s existing routes
 app.include_router(goals.router)
 app.include_router(programs.router)
 app.include_router(recommendations.router)
+
+STARTUP.imported(_t0)
@@ -0,0 +1,98 @@
+import os, time
+from urllib.parse import parse_qs
+
+from .util.metrics import REQUEST_SECONDS, TRACE
+from .util.profiling import SamplingProfiler
+
+# Per-request profiling has to be allowed for the deployment first
+PROFILING_ENABLED = os.getenv("PROFILING", "0") == "1"
+PROFILE_INTERVAL_S = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+
+
+def _server_timing(trace) -> bytes:
+    totals = {}
+    for name, dt in trace:
+        totals[name] = totals.get(name, 0.0) + dt
+    return ", ".join(f"{name};dur={dt * 1000:.1f}" for name, dt in totals.items()).encode("latin-1")
+
+
+class TimingMiddleware:
+    """
+    Records http_request_duration_seconds per (method, route template, status) and
+    collects the spans of the request. Spans that finish before the response starts
+    are sent back in a Server-Timing header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        trace = []
+        token = TRACE.set(trace)
+        status = 500
+        t0 = time.perf_counter()
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trace:
+                    message = dict(message, headers=list(message.get("headers", [])) +
+                                   [(b"server-timing", _server_timing(trace))])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            TRACE.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_SECONDS.observe((scope["method"], route, str(status)), time.perf_counter() - t0)
+
+
+class ProfilerMiddleware:
+    """
+    With PROFILING=1, a request carrying ?profile=1 or "X-Profile: 1" runs under
+    the sampling profiler. Its response is replaced by the collapsed stacks
+    (text/plain). The original status is kept in X-Profile-Status.
+    """
+
+    def __init__(self, app, enabled: bool = PROFILING_ENABLED, interval: float = PROFILE_INTERVAL_S):
+        self.app = app
+        self.enabled = enabled
+        self.interval = interval
+
+    @staticmethod
+    def _wants_profile(scope) -> bool:
+        if parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile") == ["1"]:
+            return True
+        return dict(scope.get("headers", [])).get(b"x-profile") == b"1"
+
+    async def __call__(self, scope, receive, send):
+        if not (self.enabled and scope["type"] == "http" and self._wants_profile(scope)):
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def swallow(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler = SamplingProfiler(self.interval).start()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, swallow)
+        finally:
+            stacks = profiler.stop()
+        body = stacks.encode("utf-8")
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+            (b"x-profile-status", str(status).encode()),
+            (b"x-profile-samples", str(profiler.samples).encode()),
+            (b"x-profile-ms", f"{(time.perf_counter() - t0) * 1000:.1f}".encode()),
+        ]})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,63 @@
+import sys
+from typing import Any, Dict, Iterator, List
+import numpy as np
+
+
+class GoalProgramMapping:
+    """One goal_program_map_mdc.json entry. Rationales repeat per goal, so they are interned."""
+    __slots__ = ("goal_id", "program_id", "fit_strength", "rationale")
+
+    def __init__(self, goal_id: int, program_id: int, fit_strength: int, rationale: str):
+        self.goal_id = goal_id
+        self.program_id = program_id
+        self.fit_strength = fit_strength
+        self.rationale = sys.intern(rationale)
+
+    @classmethod
+    def from_dict(cls, m: Dict[str, Any]) -> "GoalProgramMapping":
+        return cls(int(m.get("goal_id", -1)), int(m["program_id"]), int(m.get("fit_strength", 3)),
+                   m.get("rationale") or "")
+
+    def __repr__(self):
+        return f"GoalProgramMapping(goal_id={self.goal_id}, program_id={self.program_id}, fit_strength={self.fit_strength})"
+
+
+class MappingTable:
+    """
+    The goal->program mappings as columns: goal_id, program_id and fit_strength
+    arrays plus an index into the (few) distinct rationale strings. The arrays
+    may be read-only memory maps of a seed snapshot. Iterating yields
+    GoalProgramMapping records.
+    """
+    __slots__ = ("goal_id", "program_id", "fit_strength", "rationale_idx", "rationales")
+
+    def __init__(self, goal_id: np.ndarray, program_id: np.ndarray, fit_strength: np.ndarray,
+                 rationale_idx: np.ndarray, rationales: List[str]):
+        self.goal_id = goal_id
+        self.program_id = program_id
+        self.fit_strength = fit_strength
+        self.rationale_idx = rationale_idx
+        self.rationales = rationales
+
+    @classmethod
+    def from_dicts(cls, mappings: List[Dict[str, Any]]) -> "MappingTable":
+        records = [GoalProgramMapping.from_dict(m) for m in mappings]
+        codes: Dict[str, int] = {}
+        n = len(records)
+        return cls(
+            np.fromiter((m.goal_id for m in records), dtype=np.int64, count=n),
+            np.fromiter((m.program_id for m in records), dtype=np.int64, count=n),
+            np.fromiter((m.fit_strength for m in records), dtype=np.int64, count=n),
+            np.fromiter((codes.setdefault(m.rationale, len(codes)) for m in records), dtype=np.int32, count=n),
+            list(codes),
+        )
+
+    def __len__(self):
+        return len(self.goal_id)
+
+    def __getitem__(self, i: int) -> GoalProgramMapping:
+        return GoalProgramMapping(int(self.goal_id[i]), int(self.program_id[i]), int(self.fit_strength[i]),
+                                  self.rationales[int(self.rationale_idx[i])])
+
+    def __iter__(self) -> Iterator[GoalProgramMapping]:
+        return (self[i] for i in range(len(self)))
@@ -0,0 +1,125 @@
+import sys
+from typing import Any, Dict, Iterator, List
+import numpy as np
+
+CSV_COLUMNS = ("id", "name", "award_level", "total_credits", "delivery_mode",
+               "campuses", "url", "tags", "description")
+
+_tag_sets: Dict[str, frozenset] = {}
+
+def _tag_set(tags: str) -> frozenset:
+    # Few distinct tag strings in the catalog, so rows share the same frozenset
+    ts = _tag_sets.get(tags)
+    if ts is None:
+        ts = _tag_sets[tags] = frozenset(tags.lower().split(";"))
+    return ts
+
+
+class Program:
+    """
+    One programs_mdc.csv row, parsed once at load time.
+
+    Repeated strings (award, delivery mode, campuses, url, tags) are interned and
+    tag_set is the pre-split, lowercased tag set used for preference matching
+    (same tokens as set(tags.lower().split(";"))).
+    """
+    __slots__ = ("id", "name", "award_level", "award", "total_credits", "delivery_mode",
+                 "delivery", "campuses", "url", "tags", "tag_set", "description")
+
+    def __init__(self, id: int, name: str, award_level: str, total_credits: int,
+                 delivery_mode: str, campuses: str, url: str, tags: str, description: str):
+        self.id = id
+        self.name = name
+        self.award_level = sys.intern(award_level)
+        self.award = sys.intern(award_level.upper())
+        self.total_credits = total_credits
+        self.delivery_mode = sys.intern(delivery_mode)
+        self.delivery = sys.intern(delivery_mode.lower())
+        self.campuses = sys.intern(campuses)
+        self.url = sys.intern(url)
+        self.tags = sys.intern(tags)
+        self.tag_set = _tag_set(tags)
+        self.description = description
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Program | None":
+        """None for rows without an integer id (they can't be looked up or recommended)."""
+        try:
+            pid = int(row.get("id"))
+        except Exception:
+            return None
+        try:
+            total = int(row.get("total_credits") or 0)
+        except Exception:
+            total = 0
+        return cls(pid, row.get("name") or "", row.get("award_level") or "", total,
+                   row.get("delivery_mode") or "", row.get("campuses") or "", row.get("url") or "",
+                   row.get("tags") or "", row.get("description") or "")
+
+    def as_row(self) -> Dict[str, str]:
+        """The CSV row shape served by /programs."""
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "award_level": self.award_level,
+            "total_credits": str(self.total_credits),
+            "delivery_mode": self.delivery_mode,
+            "campuses": self.campuses,
+            "url": self.url,
+            "tags": self.tags,
+            "description": self.description,
+        }
+
+    def __repr__(self):
+        return f"Program(id={self.id}, name={self.name!r}, award_level={self.award_level!r})"
+
+
+TEXT_COLUMNS = ("name", "award_level", "delivery_mode", "campuses", "url", "tags", "description")
+
+
+class ProgramTable:
+    """
+    The programs as columns: id and total_credits arrays plus, per text column, an
+    (n, 2) array of [start, end) byte spans into a UTF-8 string table. The arrays
+    may be read-only memory maps of a seed snapshot, so every worker shares them.
+    Indexing decodes one Program on demand; nothing is kept per row. pos, when
+    set, selects (and orders) the rows this table exposes.
+    """
+    __slots__ = ("ids", "total_credits", "strtab", "spans", "pos")
+
+    def __init__(self, ids: np.ndarray, total_credits: np.ndarray, strtab: np.ndarray,
+                 spans: Dict[str, np.ndarray], pos: np.ndarray | None = None):
+        self.ids = ids
+        self.total_credits = total_credits
+        self.strtab = strtab
+        self.spans = spans
+        self.pos = pos
+
+    def take(self, positions: np.ndarray) -> "ProgramTable":
+        """The rows at positions (of this table), over the same columns."""
+        positions = np.asarray(positions, dtype=np.intp)
+        return ProgramTable(self.ids, self.total_credits, self.strtab, self.spans,
+                            positions if self.pos is None else self.pos[positions])
+
+    def _text(self, col: str, row: int) -> str:
+        a, b = self.spans[col][row]
+        return bytes(self.strtab[a:b]).decode("utf-8")
+
+    def __len__(self):
+        return len(self.ids) if self.pos is None else len(self.pos)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        row = int(i if self.pos is None else self.pos[i])
+        name, award, delivery, campuses, url, tags, description = (self._text(c, row) for c in TEXT_COLUMNS)
+        return Program(int(self.ids[row]), name, award, int(self.total_credits[row]), delivery,
+                       campuses, url, tags, description)
+
+    def __iter__(self) -> Iterator[Program]:
+        return (self[i] for i in range(len(self)))
+
+    def row_ids(self) -> np.ndarray:
+        return self.ids if self.pos is None else self.ids[self.pos]
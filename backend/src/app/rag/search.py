@@ -0,0 +1,183 @@
+"""
+Keyword search over the program catalog (name, tags, description).
+
+The inverted index is built once per version of programs_mdc.csv (see
+search_index()) and answers a query with a few array additions:
+
+- BM25 ranking; a term in the name counts 3x, in the tags 2x
+- typos: a query word missing from the vocabulary is replaced by the closest
+  vocabulary words by trigram similarity ("nursng" -> "nursing")
+- autocomplete: the last query word also matches as a prefix ("cyb" -> "cybersecurity"),
+  unless the query ends with a space
+"""
+import math, re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+import numpy as np
+
+from ..models.program import Program
+from ..services.catalog import catalog, PROGRAMS_FILE
+from ..util.files import STORE
+
+FIELD_WEIGHTS = (("name", 3.0), ("tags", 2.0), ("description", 1.0))
+K1, B = 1.2, 0.75
+STOPWORDS = frozenset("a an and as at by for from in into of on or the to with".split())
+MAX_PREFIX_TERMS = 20   # autocomplete expansions per query (most frequent first)
+MAX_FUZZY_TERMS = 3     # typo corrections per query word
+MIN_SIMILARITY = 0.3    # trigram similarity (Jaccard), as pg_trgm's default
+FUZZY_WEIGHT = 0.8      # corrected and completed words count a bit less than exact ones
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+def trigrams(word: str) -> frozenset:
+    w = f"  {word} "
+    return frozenset(w[i:i + 3] for i in range(len(w) - 2))
+
+
+class Hit(NamedTuple):
+    program: Program
+    score: float
+    terms: List[str]  # vocabulary words of the query found in this program
+
+
+class ProgramSearchIndex:
+    """Inverted index over catalog rows. Shared by every request: read-only after build."""
+
+    def __init__(self, programs: Sequence[Program], valid: np.ndarray | None = None):
+        self.rows = programs
+        n = len(programs)
+        self.valid = np.ones(n, dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+        self.awards = np.array([p.award for p in programs], dtype=object)
+
+        # weighted term frequencies per document
+        doc_tf: List[Dict[str, float]] = []
+        lengths = np.zeros(n)
+        for i, p in enumerate(programs):
+            tf: Dict[str, float] = {}
+            for field, weight in FIELD_WEIGHTS:
+                text = p.tags.replace(";", " ") if field == "tags" else getattr(p, field)
+                for w in tokenize(text):
+                    tf[w] = tf.get(w, 0.0) + weight
+            doc_tf.append(tf)
+            lengths[i] = sum(tf.values())
+        self.doc_terms = [frozenset(tf) for tf in doc_tf]
+
+        postings: Dict[str, Tuple[List[int], List[float]]] = {}
+        for i, tf in enumerate(doc_tf):
+            for w, f in tf.items():
+                docs, freqs = postings.setdefault(w, ([], []))
+                docs.append(i)
+                freqs.append(f)
+
+        # BM25 contribution of each posting is fixed at build time
+        avgdl = float(lengths.mean()) if n and lengths.any() else 1.0
+        norm = K1 * (1 - B + B * lengths / avgdl)
+        self.vocab = sorted(postings)
+        self.term_id = {w: t for t, w in enumerate(self.vocab)}
+        self.df = np.array([len(postings[w][0]) for w in self.vocab], dtype=np.int64)
+        self.postings: List[Tuple[np.ndarray, np.ndarray]] = []
+        for w in self.vocab:
+            docs = np.array(postings[w][0], dtype=np.intp)
+            tf = np.array(postings[w][1])
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings.append((docs, idf * tf * (K1 + 1) / (tf + norm[docs])))
+
+        grams: Dict[str, List[int]] = {}
+        self.gram_count = np.zeros(len(self.vocab), dtype=np.int64)
+        for t, w in enumerate(self.vocab):
+            g = trigrams(w)
+            self.gram_count[t] = len(g)
+            for x in g:
+                grams.setdefault(x, []).append(t)
+        self.grams = {x: np.array(ts, dtype=np.intp) for x, ts in grams.items()}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def completions(self, prefix: str) -> List[int]:
+        """Ids of vocabulary words starting with prefix, most frequent first."""
+        lo = bisect_left(self.vocab, prefix)
+        hi = bisect_left(self.vocab, prefix + "\uffff", lo)
+        ids = range(lo, hi)
+        if len(ids) > MAX_PREFIX_TERMS:
+            ids = sorted(ids, key=lambda t: -self.df[t])[:MAX_PREFIX_TERMS]
+        return list(ids)
+
+    def similar(self, word: str) -> List[Tuple[int, float]]:
+        """Closest vocabulary words by trigram similarity, best first."""
+        g = trigrams(word)
+        shared = Counter()
+        for x in g:
+            ts = self.grams.get(x)
+            if ts is not None:
+                shared.update(ts.tolist())
+        out = []
+        for t, k in shared.items():
+            sim = k / (len(g) + self.gram_count[t] - k)
+            if sim >= MIN_SIMILARITY:
+                out.append((t, float(sim)))
+        out.sort(key=lambda x: (-x[1], -self.df[x[0]], x[0]))
+        return out[:MAX_FUZZY_TERMS]
+
+    def expand(self, query: str, prefix: bool = True) -> List[Tuple[int, float]]:
+        """(term id, weight) pairs for the words of query."""
+        words = tokenize(query)
+        if not words:
+            return []
+        complete_last = prefix and not query[-1:].isspace()
+        terms: Dict[int, float] = {}
+
+        def add(t, weight):
+            terms[t] = max(terms.get(t, 0.0), weight)
+
+        for i, w in enumerate(words):
+            t = self.term_id.get(w)
+            if t is not None:
+                add(t, 1.0)
+            if complete_last and i == len(words) - 1:
+                completed = [c for c in self.completions(w) if c != t]
+                for c in completed:
+                    add(c, FUZZY_WEIGHT)
+                if t is not None or completed:
+                    continue
+            if t is None and len(w) >= 3:
+                for c, sim in self.similar(w):
+                    add(c, FUZZY_WEIGHT * sim)
+        return list(terms.items())
+
+    def search(self, query: str, limit: int | None = 10, award: str | None = None,
+               valid_only: bool = False, prefix: bool = True) -> List[Hit]:
+        """Best matches for query, by score then catalog order; limit=None returns every match."""
+        terms = self.expand(query or "", prefix)
+        if not terms:
+            return []
+        scores = np.zeros(len(self.rows))
+        for t, weight in terms:
+            docs, contrib = self.postings[t]
+            scores[docs] += weight * contrib
+        keep = scores > 0
+        if valid_only:
+            keep &= self.valid
+        if award:
+            keep &= self.awards == award.strip().upper()
+        found = np.flatnonzero(keep)
+        order = found[np.lexsort((found, -scores[found]))]
+        if limit is not None:
+            order = order[:limit]
+        words = [self.vocab[t] for t, _ in terms]
+        return [Hit(self.rows[i], float(scores[i]), [w for w in words if w in self.doc_terms[i]])
+                for i in order]
+
+
+def search_index() -> ProgramSearchIndex:
+    # same rows (and validity) as catalog(), rebuilt when programs_mdc.csv changes
+    def build():
+        cat = catalog()
+        return ProgramSearchIndex(cat.rows, cat.valid)
+    return STORE.derived("program_search", [(PROGRAMS_FILE, "programs")], build)
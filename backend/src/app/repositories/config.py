@@ -0,0 +1,13 @@
+import os
+
+# file (default): seed files in data/seed indexed in memory; sql: DATABASE_URL
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "file").lower()
+DEFAULT_DATABASE_URL = "sqlite:///data/app.db"
+
+
+def use_sql() -> bool:
+    return STORAGE_BACKEND == "sql"
+
+
+def database_url() -> str:
+    return os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
@@ -0,0 +1,23 @@
+from ..util.files import load_json, STORE
+from ..services.typing import CostModel
+from .config import use_sql
+
+
+class FileCostRepository:
+    def cost_model(self) -> CostModel:
+        # validated once per version of cost_model.json instead of per request
+        return STORE.derived("cost_model", [("cost_model.json", "json")],
+                             lambda: CostModel(**load_json("cost_model.json")))
+
+
+_repo = None
+
+def cost_repo():
+    global _repo
+    if _repo is None:
+        if use_sql():
+            from .sql import SqlCostRepository
+            _repo = SqlCostRepository()
+        else:
+            _repo = FileCostRepository()
+    return _repo
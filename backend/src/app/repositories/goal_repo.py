@@ -0,0 +1,26 @@
+from typing import Any, Dict, List
+
+from ..util.files import load_json
+from ..services.matcher import _goal_prefs
+from .config import use_sql
+
+
+class FileGoalRepository:
+    def list(self) -> List[Dict[str, Any]]:
+        return load_json("career_goals.json")
+
+    def prefs(self, goal_id: int) -> Dict[str, set]:
+        return _goal_prefs(goal_id)
+
+
+_repo = None
+
+def goal_repo():
+    global _repo
+    if _repo is None:
+        if use_sql():
+            from .sql import SqlGoalRepository
+            _repo = SqlGoalRepository()
+        else:
+            _repo = FileGoalRepository()
+    return _repo
@@ -0,0 +1,74 @@
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from ..models.program import Program
+from ..rag.search import ProgramSearchIndex, search_index
+from ..services.catalog import catalog
+from ..services.matcher import goal_candidates, goal_index
+from ..services.scoring import scoring_engine
+from .config import use_sql
+
+# rank(earned_credits, prefer_online, cost_model, k) -> recommendations, best first
+Ranker = Callable[..., List[Dict[str, Any]]]
+
+
+class FileProgramRepository:
+    """Programs from programs_mdc.csv, served from the in-memory catalog and scoring engine."""
+
+    def count(self) -> int:
+        return len(catalog())
+
+    def get(self, program_id: int, valid_only: bool = False) -> Program | None:
+        cat = catalog()
+        return cat.get_valid(program_id) if valid_only else cat.get(program_id)
+
+    def get_many(self, program_ids: Iterable[int]) -> List[Program]:
+        return catalog().get_many(program_ids)
+
+    def list(self, award: str | None = None, tag: str | None = None,
+             limit: int | None = None, offset: int = 0) -> List[Program]:
+        rows = catalog().rows
+        if award:
+            a = award.strip().upper()
+            rows = [p for p in rows if p.award == a]
+        if tag:
+            t = tag.strip().lower()
+            rows = [p for p in rows if t in p.tag_set]
+        return rows[offset:None if limit is None else offset + limit]
+
+    def candidates(self, goal_id: int, valid_only: bool = True) -> List[Tuple[Program, int]]:
+        """(program, fit) for every row mapped to the goal, in catalog order."""
+        fit = goal_candidates(goal_id)
+        cat = catalog()
+        pos = cat.positions(fit)
+        if valid_only:
+            pos = pos[cat.valid[pos]]
+        return [(cat.rows[i], fit[int(cat.ids[i])]) for i in pos.tolist()]
+
+    def search_index(self, rebuild: bool = False) -> ProgramSearchIndex:
+        return search_index()  # rebuilt whenever programs_mdc.csv changes
+
+    def ranker(self, goal_id: int, prefs: Dict[str, set]) -> Ranker:
+        """The goal-dependent part of the ranking, computed once; call it per student."""
+        return self.rankers({goal_id: prefs})[goal_id]
+
+    def rankers(self, prefs_by_goal: Dict[int, Dict[str, set]]) -> Dict[int, Ranker]:
+        """ranker() for several goals, all from the same version of the seed files."""
+        engine = scoring_engine()  # valid programs only (avoid catalog noise)
+        index = goal_index()
+        return {g: partial(engine.rank, engine.goal_scores(g, dict(index.get(int(g), ())), prefs))
+                for g, prefs in prefs_by_goal.items()}
+
+
+_repo = None
+
+def program_repo():
+    """The configured program store (see repositories/db.py)."""
+    global _repo
+    if _repo is None:
+        if use_sql():
+            from .sql import SqlProgramRepository
+            _repo = SqlProgramRepository()
+        else:
+            _repo = FileProgramRepository()
+    return _repo
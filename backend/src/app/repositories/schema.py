@@ -0,0 +1,63 @@
+"""
+Tables of the SQL store (SQLite or Postgres). Alembic migrations in
+backend/alembic/versions create the same schema; metadata.create_all() is for
+tests and throwaway SQLite files.
+
+programs keep their CSV columns plus the normalised fields the ranking needs
+(award, delivery, valid). goal_candidates is the reduced goal -> program fit
+index (max fit_strength per pair), so recommendations are a single indexed query.
+"""
+from sqlalchemy import (
+    Boolean, Column, Index, Integer, MetaData, PrimaryKeyConstraint, String, Table, Text,
+)
+
+metadata = MetaData()
+
+programs = Table(
+    "programs", metadata,
+    Column("position", Integer, primary_key=True, autoincrement=False),  # catalog (CSV) order
+    Column("id", Integer, nullable=False),
+    Column("name", Text, nullable=False),
+    Column("award_level", String(32), nullable=False),
+    Column("award", String(32), nullable=False),
+    Column("total_credits", Integer, nullable=False),
+    Column("delivery_mode", String(64), nullable=False),
+    Column("delivery", String(64), nullable=False),
+    Column("campuses", Text, nullable=False),
+    Column("url", Text, nullable=False),
+    Column("tags", Text, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("valid", Boolean, nullable=False),
+    Index("ix_programs_id", "id"),
+    Index("ix_programs_award", "award", "position"),
+)
+
+program_tags = Table(
+    "program_tags", metadata,
+    Column("tag", String(64), nullable=False),
+    Column("position", Integer, nullable=False),
+    PrimaryKeyConstraint("tag", "position"),
+    Index("ix_program_tags_position", "position"),
+)
+
+goals = Table(
+    "goals", metadata,
+    Column("position", Integer, primary_key=True, autoincrement=False),
+    Column("id", Integer, nullable=False),
+    Column("data", Text, nullable=False),  # the career_goals.json entry as JSON
+    Index("ix_goals_id", "id"),
+)
+
+goal_candidates = Table(
+    "goal_candidates", metadata,
+    Column("goal_id", Integer, nullable=False),
+    Column("program_id", Integer, nullable=False),
+    Column("fit", Integer, nullable=False),
+    PrimaryKeyConstraint("goal_id", "program_id"),
+)
+
+cost_models = Table(
+    "cost_models", metadata,
+    Column("name", String(64), primary_key=True),
+    Column("data", Text, nullable=False),  # cost_model.json as JSON
+)
@@ -0,0 +1,159 @@
+"""
+SQL implementations of the repositories (SQLite or Postgres through SQLAlchemy
+Core). Filtering, ordering and the top-k of /recommendations run in the database,
+on the indexed tables of repositories/schema.py. Only the k returned rows
+come back to Python.
+"""
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, desc, func, select
+from sqlalchemy.engine import Engine
+
+from ..models.program import Program
+from ..rag.search import ProgramSearchIndex
+from ..services.cost_estimator import estimate_cost, estimate_terms
+from ..services.scoring import recommendation
+from ..services.typing import CostModel
+from ..util.metrics import span
+from .db import engine
+from .schema import programs, program_tags, goals, goal_candidates, cost_models
+
+_PROGRAM_COLUMNS = (programs.c.id, programs.c.name, programs.c.award_level, programs.c.total_credits,
+                    programs.c.delivery_mode, programs.c.campuses, programs.c.url, programs.c.tags,
+                    programs.c.description)
+ONLINE_DELIVERY = ("online", "hybrid")
+
+
+def _program(row) -> Program:
+    return Program(row.id, row.name, row.award_level, row.total_credits, row.delivery_mode,
+                   row.campuses, row.url, row.tags, row.description)
+
+
+class SqlProgramRepository:
+    def __init__(self, eng: Engine | None = None):
+        self.engine = eng or engine()
+        self._search: ProgramSearchIndex | None = None
+
+    def _all(self, query) -> List[Program]:
+        with self.engine.connect() as conn:
+            return [_program(r) for r in conn.execute(query)]
+
+    def count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(programs)).scalar_one()
+
+    def get(self, program_id: int, valid_only: bool = False) -> Program | None:
+        q = select(*_PROGRAM_COLUMNS).where(programs.c.id == int(program_id))
+        if valid_only:
+            q = q.where(programs.c.valid)
+        rows = self._all(q.order_by(programs.c.position).limit(1))
+        return rows[0] if rows else None
+
+    def get_many(self, program_ids: Iterable[int]) -> List[Program]:
+        ids = sorted({int(x) for x in program_ids})
+        if not ids:
+            return []
+        return self._all(select(*_PROGRAM_COLUMNS).where(programs.c.id.in_(ids)).order_by(programs.c.position))
+
+    def list(self, award: str | None = None, tag: str | None = None,
+             limit: int | None = None, offset: int = 0) -> List[Program]:
+        q = select(*_PROGRAM_COLUMNS)
+        if award:
+            q = q.where(programs.c.award == award.strip().upper())
+        if tag:
+            q = q.where(programs.c.position.in_(
+                select(program_tags.c.position).where(program_tags.c.tag == tag.strip().lower())))
+        q = q.order_by(programs.c.position).offset(offset)
+        if limit is not None:
+            q = q.limit(limit)
+        return self._all(q)
+
+    def candidates(self, goal_id: int, valid_only: bool = True) -> List[Tuple[Program, int]]:
+        q = (select(*_PROGRAM_COLUMNS, goal_candidates.c.fit)
+             .join_from(goal_candidates, programs, programs.c.id == goal_candidates.c.program_id)
+             .where(goal_candidates.c.goal_id == int(goal_id)))
+        if valid_only:
+            q = q.where(programs.c.valid)
+        with self.engine.connect() as conn:
+            return [(_program(r), r.fit) for r in conn.execute(q.order_by(programs.c.position))]
+
+    def search_index(self, rebuild: bool = False) -> ProgramSearchIndex:
+        # built from the stored rows at warm-up (startup.py, again on each serve.py reload)
+        if self._search is None or rebuild:
+            with self.engine.connect() as conn:
+                rows = conn.execute(select(*_PROGRAM_COLUMNS, programs.c.valid)
+                                    .order_by(programs.c.position)).all()
+            self._search = ProgramSearchIndex([_program(r) for r in rows], [bool(r.valid) for r in rows])
+        return self._search
+
+    def _ranking(self, goal_id: int, prefs: Dict[str, set], earned: int, prefer_online: bool, k: int):
+        # same score as ScoringEngine: fit, +/-2 award preference, +2 per preferred tag,
+        # +1 online/hybrid when preferred; ties by remaining credits, then catalog order
+        score = goal_candidates.c.fit
+        if prefs["preferred_awards"]:
+            score = score + case((programs.c.award.in_(sorted(prefs["preferred_awards"])), 2), else_=-2)
+        if prefs["preferred_tags"]:
+            overlap = (select(func.count()).select_from(program_tags)
+                       .where(program_tags.c.position == programs.c.position,
+                              program_tags.c.tag.in_(sorted(prefs["preferred_tags"])))
+                       .scalar_subquery())
+            score = score + 2 * overlap
+        online = programs.c.delivery.in_(ONLINE_DELIVERY)
+        if prefer_online:
+            score = score + case((online, 1), else_=0)
+        rem = case((programs.c.total_credits > earned, programs.c.total_credits - earned), else_=0)
+        return (select(*_PROGRAM_COLUMNS, goal_candidates.c.fit, score.label("score"), rem.label("rem"),
+                       online.label("online"))
+                .join_from(goal_candidates, programs, programs.c.id == goal_candidates.c.program_id)
+                .where(goal_candidates.c.goal_id == int(goal_id), programs.c.valid)
+                .order_by(desc("score"), "rem", programs.c.position)
+                .limit(k))
+
+    def ranker(self, goal_id: int, prefs: Dict[str, set]):
+        def rank(earned_credits: int, prefer_online: bool, cost_model: CostModel, k: int = 3):
+            earned = max(0, int(earned_credits or 0))
+            with self.engine.connect() as conn:
+                rows = conn.execute(self._ranking(goal_id, prefs, earned, prefer_online, k)).all()
+            out = []
+            with span("cost_estimate"):
+                for r in rows:
+                    terms = estimate_terms(r.rem)
+                    out.append(recommendation(int(goal_id), _program(r), int(r.score), r.fit, r.rem, terms,
+                                              bool(r.online), estimate_cost(r.rem, terms, cost_model, r.id)))
+            return out
+        return rank
+
+    def rankers(self, prefs_by_goal: Dict[int, Dict[str, set]]):
+        # rows are read per call, so there is nothing to share between goals
+        return {g: self.ranker(g, prefs) for g, prefs in prefs_by_goal.items()}
+
+
+class SqlGoalRepository:
+    def __init__(self, eng: Engine | None = None):
+        self.engine = eng or engine()
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            return [json.loads(d) for d in conn.execute(select(goals.c.data).order_by(goals.c.position)).scalars()]
+
+    def prefs(self, goal_id: int) -> Dict[str, set]:
+        with self.engine.connect() as conn:
+            data = conn.execute(select(goals.c.data).where(goals.c.id == int(goal_id))
+                                .order_by(goals.c.position).limit(1)).scalar()
+        g = json.loads(data) if data else {}
+        return {
+            "preferred_tags": set(g.get("preferred_tags") or []),
+            "preferred_awards": set(g.get("preferred_awards") or []),
+        }
+
+
+class SqlCostRepository:
+    def __init__(self, eng: Engine | None = None, name: str = "default"):
+        self.engine = eng or engine()
+        self.name = name
+
+    def cost_model(self) -> CostModel:
+        with self.engine.connect() as conn:
+            data = conn.execute(select(cost_models.c.data).where(cost_models.c.name == self.name)).scalar_one()
+        return CostModel(**json.loads(data))
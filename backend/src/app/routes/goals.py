@@ -1,9 +1,8 @@
 from fastapi import APIRouter
-from ..util.files import load_json
+from ..repositories.goal_repo import goal_repo
 
 router = APIRouter(prefix="/goals", tags=["goals"])
 
 @router.get("")
 def list_goals():
-    goals = load_json("career_goals.json")
-    return {"goals": goals}
+    return {"goals": goal_repo().list()}
@@ -1,23 +1,41 @@
 from fastapi import APIRouter, HTTPException, Query
-from ..util.files import load_csv
+from ..repositories.program_repo import program_repo
 
 router = APIRouter(prefix="/programs", tags=["programs"])
 
-def _all_programs():
-    return load_csv("programs_mdc.csv")
+def _parse_ids(ids: str) -> list[int]:
+    out = []
+    for x in ids.split(","):
+        try:
+            out.append(int(x.strip()))
+        except ValueError:
+            continue
+    return out
 
 @router.get("")
-def list_programs(ids: str | None = Query(default=None, description="comma-separated ids")):
-    progs = _all_programs()
-    if not ids:
-        return {"programs": progs}
-    want = {x.strip() for x in ids.split(",")}
-    return {"programs": [p for p in progs if str(p.get("id")) in want]}
+def list_programs(ids: str | None = Query(default=None, description="comma-separated ids"),
+                  award: str | None = Query(default=None, description="award level, e.g. AS"),
+                  tag: str | None = Query(default=None),
+                  limit: int | None = Query(default=None, ge=0),
+                  offset: int = Query(default=0, ge=0)):
+    # filtering and paging happen in the store
+    if ids:
+        return {"programs": [p.as_row() for p in program_repo().get_many(_parse_ids(ids))]}
+    return {"programs": [p.as_row() for p in program_repo().list(award=award, tag=tag, limit=limit, offset=offset)]}
+
+@router.get("/search")
+def search_programs(q: str = Query(min_length=1, max_length=200),
+                    limit: int = Query(default=10, ge=1, le=100),
+                    award: str | None = Query(default=None, description="award level, e.g. AS"),
+                    prefix: bool = Query(default=True, description="complete the last word (autocomplete)")):
+    # BM25 over name/tags/description with typo and prefix matching; see rag/search.py
+    hits = program_repo().search_index().search(q, limit=limit, award=award, prefix=prefix)
+    return {"query": q, "results": [{"program": h.program.as_row(), "score": round(h.score, 4), "matched": h.terms}
+                                    for h in hits]}
 
 @router.get("/{program_id}")
 def get_program(program_id: int):
-    progs = _all_programs()
-    for p in progs:
-        if str(p.get("id")) == str(program_id):
-            return {"program": p}
-    raise HTTPException(status_code=404, detail="Program not found")
+    p = program_repo().get(program_id)
+    if p is None:
+        raise HTTPException(status_code=404, detail="Program not found")
+    return {"program": p.as_row()}
@@ -1,20 +1,23 @@
-from math import ceil
+import asyncio, contextvars, json, os, time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import List
 from pydantic import BaseModel
 from fastapi import APIRouter
-from ..util.files import load_csv, load_json
-from ..services.matcher import score_candidates, boost_by_delivery, remaining_credits
-from ..services.cost_estimator import estimate_terms, estimate_cost
-from ..services.typing import CostModel
-from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from ..agents.orchestrator import recommend_with_gemini
-from ..util.validate import is_valid_program
-from ..services.matcher import (
-    score_candidates, boost_by_delivery, remaining_credits,
-    _goal_prefs, boost_by_goal_prefs
-)
-from ..util.validate import is_valid_program
+from ..agents.streaming import sse
+from ..util.metrics import LatencyTracker, span
+from ..repositories.program_repo import program_repo
+from ..repositories.goal_repo import goal_repo
+from ..repositories.cost_repo import cost_repo
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
 
+# /ai waits at most this long for the model before answering with the heuristic
+AI_DEADLINE_S = float(os.getenv("AI_DEADLINE_S", "8"))
+_ai_pool = ThreadPoolExecutor(max_workers=int(os.getenv("AI_WORKERS", "8")), thread_name_prefix="ai-path")
+LATENCY = LatencyTracker()
+
 class RecRequest(BaseModel):
     priorEducation: str           # "hs" | "some_college" | "aa" | "as" | "bs"
     goalId: int
@@ -23,72 +26,127 @@ class RecRequest(BaseModel):
 
 @router.post("")
 def recommend(req: RecRequest):
-    programs = load_csv("programs_mdc.csv")
-    mappings = load_json("goal_program_map_mdc.json")
-    cost_model = CostModel(**load_json("cost_model.json"))
-    prefs = _goal_prefs(req.goalId)
-    # Filter to real programs (avoid catalog noise)
-    programs = [p for p in programs if is_valid_program(p)]
+    cost_model = cost_repo().cost_model()
+    prefs = goal_repo().prefs(req.goalId)
 
-    base_scores = score_candidates(req.goalId, mappings)
+    # scoring and the top-k pick run in the configured store
+    with span("score"):
+        rank = program_repo().ranker(req.goalId, prefs)
 
-    cands = []
-    for p in programs:
-        try:
-            pid = int(p.get("id"))
-        except Exception:
-            continue
-        if pid not in base_scores:
-            continue
+    # Sorted by score desc, then remaining credits asc
+    with span("rank"):
+        return {"recommendations": rank(req.earnedCredits, req.preferOnline, cost_model, k=3)}
 
-        try:
-            total_cr = int(p.get("total_credits") or 0)
-        except Exception:
-            total_cr = 0
-
-        score = base_scores[pid]
-        score = boost_by_delivery(score, p.get("delivery_mode"), req.preferOnline)
-        score = boost_by_goal_prefs(score, p, prefs)
-
- 
-
-        rem = remaining_credits(total_cr, req.earnedCredits)
-        terms = estimate_terms(rem)
-        cost = estimate_cost(rem, terms, cost_model, pid)
-
-        cands.append({
-        "score": score,
-        "program": {
-            "id": pid,
-            "name": p.get("name"),
-            "award_level": p.get("award_level"),
-            "total_credits": total_cr,
-            "url": p.get("url"),
-        },
-        "remaining_credits": rem,
-        "estimated_terms": terms,
-        "estimated_cost": cost,
-        "why_this": (
-            f"Matched goal {req.goalId}; fit_strength={base_scores[pid]}; "
-            f"{'online-friendly' if (p.get('delivery_mode') or '').lower() in ('online','hybrid') else 'on-campus'}"
-        ),
-    })
-
-    # Sort by score desc, then remaining credits asc
-    cands.sort(key=lambda x: (-x["score"], x["remaining_credits"]))
-    return {"recommendations": cands[:3]}
+@router.post("/batch")
+def recommend_batch(reqs: List[RecRequest]):
+    """
+    Bulk recommend() for advisor cohort runs, streamed back as NDJSON (one line per
+    request, in input order). The goal part of the score is computed once per
+    distinct goalId; only remaining credits, cost and the top-k pick are done
+    per student.
+    """
+    # one snapshot of the store for the whole batch, taken before the first line is
+    # sent: a seed reload while the response streams can't mix versions
+    cost_model = cost_repo().cost_model()
+    goals = goal_repo()
+    with span("score"):
+        by_goal = program_repo().rankers({g: goals.prefs(g) for g in dict.fromkeys(r.goalId for r in reqs)})
+
+    def lines():
+        for i, req in enumerate(reqs):
+            recs = by_goal[req.goalId](req.earnedCredits, req.preferOnline, cost_model, k=3)
+            yield json.dumps({"index": i, "goalId": req.goalId, "recommendations": recs}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def _ai_payload(req: RecRequest) -> dict:
+    return {
+        "priorEducation": req.priorEducation,
+        "goalId": req.goalId,
+        "earnedCredits": req.earnedCredits,
+        "preferOnline": req.preferOnline
+    }
+
+def _timed_ai(payload: dict):
+    t0 = time.perf_counter()
+    try:
+        return recommend_with_gemini(payload)
+    finally:
+        # recorded even when the answer arrives after the deadline
+        LATENCY.observe("ai", (time.perf_counter() - t0) * 1000)
+
+def _hedged(heuristic: dict, ai: dict | None, reason: str | None) -> dict:
+    """The /ai answer: the agent's if it produced one, otherwise the heuristic and why."""
+    if ai is not None and (ai.get("debug") or {}).get("origin") != "ai":
+        # the agent answered with its own fallback (no key, unparseable or no valid ids):
+        # the heuristic answer is better, it honours the preferences and validity filter
+        ai, reason = None, "ai_fallback"
+    if ai is not None:
+        return dict(ai, debug={**(ai.get("debug") or {}), "winner": "ai"})
+    return dict(heuristic, debug={"origin": "heuristic", "winner": "heuristic", "reason": reason})
 
 @router.post("/ai")
 def recommend_ai(req: RecRequest):
+    """
+    Hedged AI recommendation: the agent runs in the background while the
+    heuristic answer is computed right away. The AI answer is used if it
+    arrives within AI_DEADLINE_S; otherwise (or if it fails) the heuristic
+    answer is returned, as it is when the agent only produced its fallback
+    answer. debug.winner records which path was used.
+    """
+    t0 = time.perf_counter()
+    # the agent's spans belong to this request's trace
+    fut = _ai_pool.submit(contextvars.copy_context().run, _timed_ai, _ai_payload(req))
+
+    heuristic = recommend(req)
+    LATENCY.observe("heuristic", (time.perf_counter() - t0) * 1000)
+
+    reason = None
     try:
-        payload = {
-            "priorEducation": req.priorEducation,
-            "goalId": req.goalId,
-            "earnedCredits": req.earnedCredits,
-            "preferOnline": req.preferOnline
-        }
-        return recommend_with_gemini(payload)
-    except Exception as e:
+        ai = fut.result(timeout=max(0.0, AI_DEADLINE_S - (time.perf_counter() - t0)))
+    except FutureTimeout:
+        # drop the call if it is still queued behind other requests; a running one finishes on its own
+        fut.cancel()
+        ai, reason = None, "deadline"
+    except Exception:
         # Hard fallback to heuristic if AI path fails
-        return recommend(req)
+        ai, reason = None, "error"
+
+    out = _hedged(heuristic, ai, reason)
+    LATENCY.observe(f"response_{out['debug']['winner']}", (time.perf_counter() - t0) * 1000)
+    return out
+
+@router.get("/ai/latency")
+def recommend_ai_latency():
+    return {"deadline_s": AI_DEADLINE_S, "paths": LATENCY.snapshot()}
+
+@router.post("/ai/stream")
+async def recommend_ai_stream(req: RecRequest):
+    """
+    /recommendations/ai as Server-Sent Events: the heuristic top-3 is sent first
+    ("heuristic"), then the answer /recommendations/ai would give ("ai": the agent's
+    within AI_DEADLINE_S, else the heuristic with debug.reason), then "done".
+    """
+    async def events():
+        t0 = time.perf_counter()
+        fut = _ai_pool.submit(contextvars.copy_context().run, _timed_ai, _ai_payload(req))
+        # the heuristic is CPU-bound: keep it off the event loop like the AI call
+        heuristic = await run_in_threadpool(recommend, req)
+        yield sse("heuristic", heuristic)
+
+        reason = None
+        try:
+            ai = await asyncio.wait_for(asyncio.wrap_future(fut),
+                                        max(0.0, AI_DEADLINE_S - (time.perf_counter() - t0)))
+        except asyncio.TimeoutError:
+            fut.cancel()
+            ai, reason = None, "deadline"
+        except Exception:
+            ai, reason = None, "error"
+        out = _hedged(heuristic, ai, reason)
+        LATENCY.observe(f"response_{out['debug']['winner']}", (time.perf_counter() - t0) * 1000)
+        yield sse("ai", out)
+        yield sse("done", {})
 
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
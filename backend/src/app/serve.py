@@ -0,0 +1,187 @@
+"""
+Production entry point: python -m backend.src.app.serve [--workers N]
+
+The parent imports the app and warms every seed index once, then forks the
+workers, so the catalog, scoring arrays and goal index live in pages shared
+copy-on-write instead of being rebuilt per worker. All workers accept on one
+listening socket created by the parent.
+
+Signals to the parent:
+    SIGHUP           re-read changed seeds in the parent, then replace the workers
+                     one at a time (new worker ready -> old worker drained)
+    SIGTERM/SIGINT   graceful shutdown of all workers
+A worker that dies unexpectedly is replaced.
+"""
+import argparse, gc, logging, os, select, signal, socket, sys, threading, time
+
+import uvicorn
+
+READY_TIMEOUT_S = 30.0
+
+log = logging.getLogger(__name__)
+
+
+def _worker(app, sock: socket.socket, ready_fd: int, args) -> None:
+    # runs in the forked child; uvicorn installs its own SIGTERM/SIGINT handlers
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    # log_config=None: uvicorn's loggers stay on the app's queued JSON handler
+    config = uvicorn.Config(app, log_level=args.log_level, log_config=None, lifespan="on",
+                            timeout_graceful_shutdown=args.graceful_timeout)
+    server = uvicorn.Server(config)
+
+    def notify_ready():
+        while not server.started and not server.should_exit:
+            time.sleep(0.05)
+        if server.started:
+            os.write(ready_fd, b"1")
+        os.close(ready_fd)
+
+    threading.Thread(target=notify_ready, daemon=True).start()
+    server.run(sockets=[sock])
+
+
+class Arbiter:
+    """Parent process: owns the socket and the warmed seed data, supervises the workers."""
+
+    def __init__(self, app, sock: socket.socket, args):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers: dict[int, float] = {}  # pid -> started at
+        self._reload = False
+        self._stop = False
+
+    def preload(self) -> bool:
+        from .startup import warm_up
+
+        # objects built before fork are frozen so the collector never writes to their pages
+        gc.unfreeze()
+        gc.collect()
+        state = warm_up()
+        gc.freeze()
+        if state["errors"]:
+            log.error("warm-up failed", extra={"errors": state["errors"]})
+            return False
+        log.info("warm-up done", extra={"warmup_ms": state["warmup_ms"], "steps_ms": state["steps_ms"]})
+        return True
+
+    def spawn(self) -> tuple[int, int]:
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            code = 0
+            try:
+                _worker(self.app, self.sock, w, self.args)
+            except BaseException:
+                log.exception("worker failed")
+                code = 1
+            finally:
+                from .util.logging import shutdown_logging
+                shutdown_logging()  # os._exit skips atexit
+                os._exit(code)
+        os.close(w)
+        self.workers[pid] = time.time()
+        return pid, r
+
+    def wait_ready(self, r: int) -> bool:
+        try:
+            ready, _, _ = select.select([r], [], [], READY_TIMEOUT_S)
+            return bool(ready) and os.read(r, 1) == b"1"
+        finally:
+            os.close(r)
+
+    def stop_worker(self, pid: int, timeout: float) -> None:
+        self.workers.pop(pid, None)
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                return
+            time.sleep(0.05)
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+    def reload(self) -> None:
+        log.info("reload: re-reading seeds")
+        if not self.preload():
+            log.error("reload aborted; keeping the current workers")
+            return
+        for old in list(self.workers):
+            pid, r = self.spawn()
+            if not self.wait_ready(r):
+                log.error("reload aborted: new worker did not become ready", extra={"worker": pid})
+                self.stop_worker(pid, 1.0)
+                return
+            self.stop_worker(old, self.args.graceful_timeout + 5)
+        log.info("reload done", extra={"workers": sorted(self.workers)})
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            if self.workers.pop(pid, None) is not None and not self._stop:
+                log.warning("worker exited; replacing it", extra={"worker": pid, "status": status})
+                self.spawn_ready()
+
+    def spawn_ready(self) -> None:
+        pid, r = self.spawn()
+        if not self.wait_ready(r):
+            log.error("worker did not become ready", extra={"worker": pid})
+
+    def run(self) -> int:
+        if not self.preload():
+            return 1
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, "_reload", True))
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "_stop", True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, "_stop", True))
+
+        for _ in range(self.args.workers):
+            self.spawn_ready()
+        host, port = self.sock.getsockname()[:2]
+        log.info("serving", extra={"url": f"http://{host}:{port}", "workers": len(self.workers)})
+
+        while not self._stop:
+            if self._reload:
+                self._reload = False
+                self.reload()
+            self.reap()
+            time.sleep(0.2)
+
+        log.info("shutting down")
+        for pid in list(self.workers):
+            self.stop_worker(pid, self.args.graceful_timeout + 5)
+        return 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m backend.src.app.serve")
+    ap.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    ap.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    ap.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    ap.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", "20")))
+    ap.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info").lower())
+    args = ap.parse_args(argv)
+
+    from backend.src.app.util.logging import setup_logging
+    setup_logging()
+    from backend.src.app.main import app
+
+    sock = socket.create_server((args.host, args.port), backlog=2048)
+    try:
+        return Arbiter(app, sock, args).run()
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+from functools import cached_property
+from typing import Dict, Iterable, List, Sequence
+import numpy as np
+
+from ..util.files import load_programs, STORE
+from ..util.validate import program_fields_valid
+from ..models.program import Program, ProgramTable
+
+PROGRAMS_FILE = "programs_mdc.csv"
+
+
+class ProgramCatalog:
+    """
+    Program records indexed by integer id. Built once per version of programs_mdc.csv
+    (see catalog()), so lookups no longer scan the CSV.
+
+    Only ids, positions and the validity bitmap are held here: rows are read from
+    the loaded sequence on access, so a snapshot-backed ProgramTable stays shared
+    (memory-mapped) instead of being copied into every worker.
+
+    Records are shared by every request: treat them as read-only.
+    """
+
+    def __init__(self, programs: Sequence[Program]):
+        self.rows = programs
+        if isinstance(programs, ProgramTable):
+            self.ids = programs.row_ids()
+        else:
+            self.ids = np.fromiter((p.id for p in programs), dtype=np.int64, count=len(programs))
+        # id -> position of its first row, like the old linear scan
+        pos_by_id: Dict[int, int] = {}
+        for i, pid in enumerate(self.ids.tolist()):
+            pos_by_id.setdefault(pid, i)
+        self.pos_by_id = pos_by_id
+        # Validity bitmap, computed once per seed version instead of per request
+        self.valid = np.fromiter(
+            (program_fields_valid(p.award.strip(), p.name.strip(), p.total_credits) for p in programs),
+            dtype=bool, count=len(programs))
+        self.valid_ids = frozenset(int(x) for x in self.ids[self.valid])
+        valid_pos_by_id: Dict[int, int] = {}
+        for i in np.flatnonzero(self.valid).tolist():
+            valid_pos_by_id.setdefault(int(self.ids[i]), i)  # first valid row wins
+        self.valid_pos_by_id = valid_pos_by_id
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, program_id: int) -> Program | None:
+        i = self.pos_by_id.get(int(program_id))
+        return None if i is None else self.rows[i]
+
+    def get_valid(self, program_id: int) -> Program | None:
+        # a duplicate id may have an invalid row before the valid one
+        i = self.valid_pos_by_id.get(int(program_id))
+        return None if i is None else self.rows[i]
+
+    def is_valid(self, program_id: int) -> bool:
+        return int(program_id) in self.valid_ids
+
+    def positions(self, program_ids: Iterable[int]) -> np.ndarray:
+        # Row positions (catalog order) of every row whose id is in program_ids
+        want = np.fromiter((int(x) for x in program_ids), dtype=np.int64)
+        if not len(want):
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(np.isin(self.ids, want))
+
+    def get_many(self, program_ids: Iterable[int]) -> List[Program]:
+        return [self.rows[i] for i in self.positions(program_ids)]
+
+    @cached_property
+    def valid_rows(self) -> Sequence[Program]:
+        positions = np.flatnonzero(self.valid)
+        if isinstance(self.rows, ProgramTable):
+            return self.rows.take(positions)
+        return [self.rows[i] for i in positions]
+
+
+def catalog() -> ProgramCatalog:
+    return STORE.derived("program_catalog", [(PROGRAMS_FILE, "programs")],
+                         lambda: ProgramCatalog(load_programs(PROGRAMS_FILE)))
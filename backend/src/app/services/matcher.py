@@ -1,5 +1,8 @@
-from typing import Any, Dict, List
-from ..util.files import load_json
+from typing import Any, Dict, List, Tuple
+import numpy as np
+from ..util.files import load_json, load_mappings, STORE
+
+MAPPINGS_FILE = "goal_program_map_mdc.json"
 
 def _goal_prefs(goal_id: int):
     goals = load_json("career_goals.json")
@@ -20,6 +23,31 @@ def score_candidates(goal_id: int, mappings: List[Dict[str, Any]]) -> Dict[int,
             out[pid] = max(out.get(pid, 0), fit)
     return out
 
+def _build_goal_index() -> Dict[int, List[Tuple[int, int]]]:
+    # goal_id -> [(program_id, max fit_strength)], same reduction as score_candidates
+    t = load_mappings(MAPPINGS_FILE)
+    if not len(t):
+        return {}
+    order = np.lexsort((t.fit_strength, t.program_id, t.goal_id))
+    g, p, f = t.goal_id[order], t.program_id[order], t.fit_strength[order]
+    # after sorting, the last row of each (goal, program) run has the max fit
+    last = np.ones(len(g), dtype=bool)
+    last[:-1] = (g[1:] != g[:-1]) | (p[1:] != p[:-1])
+    g, p, f = g[last], p[last], np.maximum(f[last], 0)
+    bounds = np.flatnonzero(np.diff(g)) + 1
+    return {
+        int(gs[0]): list(zip(ps.tolist(), fs.tolist()))
+        for gs, ps, fs in zip(np.split(g, bounds), np.split(p, bounds), np.split(f, bounds))
+    }
+
+def goal_index() -> Dict[int, List[Tuple[int, int]]]:
+    # Built once per version of the mapping file
+    return STORE.derived("goal_index", [(MAPPINGS_FILE, "mappings")], _build_goal_index)
+
+def goal_candidates(goal_id: int) -> Dict[int, int]:
+    # O(k) equivalent of score_candidates(goal_id, load_json(MAPPINGS_FILE))
+    return dict(goal_index().get(int(goal_id), ()))
+
 def boost_by_goal_prefs(score, program, prefs):
     # award preference
     award = (program.get("award_level") or "").upper()
@@ -35,6 +63,12 @@ def boost_by_goal_prefs(score, program, prefs):
     score += 2 * len(overlap)
     return score
 
+def boost_program_by_goal_prefs(score, program, prefs):
+    # boost_by_goal_prefs for a Program record (award and tag set already parsed)
+    if prefs["preferred_awards"]:
+        score += 2 if program.award in prefs["preferred_awards"] else -2
+    return score + 2 * len(prefs["preferred_tags"] & program.tag_set)
+
 def boost_by_delivery(base_score: int, delivery_mode: str | None, prefer_online: bool) -> int:
     if not prefer_online: 
         return base_score
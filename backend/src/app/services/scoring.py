@@ -0,0 +1,151 @@
+from typing import Any, Dict, List
+import numpy as np
+
+from ..util.files import STORE
+from ..util.metrics import span
+from .catalog import ProgramCatalog, catalog, PROGRAMS_FILE
+from .cost_estimator import estimate_cost
+from .typing import CostModel
+from ..models.program import Program
+
+DELIVERY_OTHER, DELIVERY_ONLINE, DELIVERY_HYBRID = 0, 1, 2
+DELIVERY_CODES = {"online": DELIVERY_ONLINE, "hybrid": DELIVERY_HYBRID}
+CREDIT_LOAD_PER_TERM = 15  # estimate_terms default
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    # (n, W) uint64 -> (n,) number of set bits
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(words.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+
+class GoalScores:
+    """Per-goal part of the ranking: which programs match and their score before delivery boost."""
+    __slots__ = ("goal_id", "rows", "fit", "score")
+
+    def __init__(self, goal_id: int, rows: np.ndarray, fit: np.ndarray, score: np.ndarray):
+        self.goal_id = goal_id
+        self.rows = rows      # indices into the engine arrays
+        self.fit = fit        # mapping fit_strength
+        self.score = score    # fit + award/tag preference boosts
+
+
+class ScoringEngine:
+    """
+    Columnar version of the recommend() loop over the valid programs of a catalog.
+
+    Programs are held as arrays (id, total credits, award code, delivery enum and a
+    tag bitmask), so a request scores every candidate with a few vector ops and
+    takes the top k with argpartition. Output matches the per-program loop built on
+    boost_by_delivery / boost_by_goal_prefs / remaining_credits / estimate_terms.
+    """
+
+    def __init__(self, cat: ProgramCatalog):
+        self.rows = cat.valid_rows  # read on access: top-k rows only
+        rows = list(self.rows)      # decoded once for the build, then dropped
+        n = len(rows)
+
+        self.ids = cat.ids[cat.valid]
+        self.total_credits = np.fromiter((p.total_credits for p in rows), dtype=np.int64, count=n)
+
+        awards = [p.award for p in rows]
+        self.award_vocab = sorted(set(awards))
+        award_code = {a: i for i, a in enumerate(self.award_vocab)}
+        self.award = np.fromiter((award_code[a] for a in awards), dtype=np.int16, count=n)
+
+        self.delivery = np.fromiter(
+            (DELIVERY_CODES.get(p.delivery, DELIVERY_OTHER) for p in rows),
+            dtype=np.int8, count=n)
+
+        # Program.tag_set is the same tokenisation as boost_by_goal_prefs
+        tag_sets = [p.tag_set for p in rows]
+        self.tag_vocab = {t: i for i, t in enumerate(sorted(set().union(*tag_sets)))}
+        words = max(1, (len(self.tag_vocab) + 63) // 64)
+        mask = np.zeros((n, words), dtype=np.uint64)
+        for i, ts in enumerate(tag_sets):
+            for t in ts:
+                b = self.tag_vocab[t]
+                mask[i, b // 64] |= np.uint64(1) << np.uint64(b % 64)
+        self.tags = mask
+
+    def _tag_mask(self, tags) -> np.ndarray:
+        m = np.zeros(self.tags.shape[1], dtype=np.uint64)
+        for t in tags:
+            b = self.tag_vocab.get(t)
+            if b is not None:
+                m[b // 64] |= np.uint64(1) << np.uint64(b % 64)
+        return m
+
+    def goal_scores(self, goal_id: int, base_scores: Dict[int, int], prefs: Dict[str, set]) -> GoalScores:
+        if base_scores:
+            want = np.fromiter(base_scores.keys(), dtype=np.int64, count=len(base_scores))
+            rows = np.flatnonzero(np.isin(self.ids, want))
+        else:
+            rows = np.empty(0, dtype=np.intp)
+        fit = np.fromiter((base_scores[int(pid)] for pid in self.ids[rows]), dtype=np.int64, count=len(rows))
+
+        score = fit.copy()
+        if prefs["preferred_awards"]:
+            liked = np.array([a in prefs["preferred_awards"] for a in self.award_vocab], dtype=bool)
+            score += np.where(liked[self.award[rows]], 2, -2)
+        if prefs["preferred_tags"]:
+            overlap = self.tags[rows] & self._tag_mask(prefs["preferred_tags"])
+            score += 2 * _popcount(overlap)
+        return GoalScores(int(goal_id), rows, fit, score)
+
+    def rank(self, gs: GoalScores, earned_credits: int, prefer_online: bool, cost_model: CostModel,
+             k: int = 3) -> List[Dict[str, Any]]:
+        rows = gs.rows
+        if not len(rows):
+            return []
+        online = self.delivery[rows] != DELIVERY_OTHER
+        score = gs.score + (online if prefer_online else 0)
+        rem = np.maximum(0, self.total_credits[rows] - max(0, int(earned_credits or 0)))
+        terms = np.where(rem > 0, -(-rem // CREDIT_LOAD_PER_TERM), 0)
+
+        # Unique composite key = (-score, remaining, catalog order): argpartition on it
+        # gives exactly the prefix of the old stable sort.
+        n = len(rows)
+        key = ((score.max() - score) * (int(rem.max()) + 1) + rem) * n + np.arange(n)
+        if k < n:
+            top = np.argpartition(key, k - 1)[:k]
+            top = top[np.argsort(key[top])]
+        else:
+            top = np.argsort(key)
+
+        # only the k returned rows are priced; cost never affects the ranking
+        with span("cost_estimate"):
+            costs = [estimate_cost(int(rem[j]), int(terms[j]), cost_model, int(self.ids[rows[j]])) for j in top]
+
+        return [
+            recommendation(gs.goal_id, self.rows[rows[j]], int(score[j]), int(gs.fit[j]),
+                           int(rem[j]), int(terms[j]), bool(online[j]), cost)
+            for j, cost in zip(top, costs)
+        ]
+
+
+def recommendation(goal_id: int, p: Program, score: int, fit: int, rem: int, terms: int, online: bool,
+                   cost: Dict[str, float]) -> Dict[str, Any]:
+    """One /recommendations entry (shared by the in-memory engine and the SQL store)."""
+    return {
+        "score": score,
+        "program": {
+            "id": p.id,
+            "name": p.name,
+            "award_level": p.award_level,
+            "total_credits": p.total_credits,
+            "url": p.url,
+        },
+        "remaining_credits": rem,
+        "estimated_terms": terms,
+        "estimated_cost": cost,
+        "why_this": (
+            f"Matched goal {goal_id}; fit_strength={fit}; "
+            f"{'online-friendly' if online else 'on-campus'}"
+        ),
+    }
+
+
+def scoring_engine() -> ScoringEngine:
+    return STORE.derived("scoring_engine", [(PROGRAMS_FILE, "programs")], lambda: ScoringEngine(catalog()))
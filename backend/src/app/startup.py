@@ -0,0 +1,93 @@
+import os, time
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class Startup:
+    """Import and warm-up timings of this process, served by /readyz."""
+
+    def __init__(self):
+        self.import_ms: float | None = None
+        self.warmup_ms: float | None = None
+        self.steps: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.ready = False
+
+    def imported(self, t0: float):
+        self.import_ms = round((time.perf_counter() - t0) * 1000, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "pid": os.getpid(),
+            "import_ms": self.import_ms,
+            "warmup_ms": self.warmup_ms,
+            "steps_ms": dict(self.steps),
+            "errors": dict(self.errors),
+        }
+
+
+STARTUP = Startup()
+
+
+def _check_database():
+    # routes read the database: open the pool and make sure the seeds were loaded
+    from .repositories.program_repo import program_repo
+
+    if not program_repo().count():
+        raise RuntimeError("no programs in the database; load them with python -m backend.src.app.repositories.db")
+
+
+def _steps(data_dir: str) -> List[Tuple[str, Callable[[], Any]]]:
+    from .util.files import load_json
+    from .services.catalog import catalog
+    from .services.scoring import scoring_engine
+    from .services.matcher import goal_index
+    from .rag.search import search_index
+    from .agents.registry import invoke_llm_prompt, function_declarations, system_prompt
+    from .repositories.config import use_sql
+    from .repositories.program_repo import program_repo
+
+    steps = [
+        ("seeds", lambda: [load_json(n) for n in ("career_goals.json", "cost_model.json", "transfer_pathways.json")]),
+    ]
+    if use_sql():
+        # programs, goals and costs come from the database only: don't index the seed files
+        steps += [
+            ("database", _check_database),
+            ("search_index", lambda: program_repo().search_index(rebuild=True)),
+        ]
+    else:
+        steps += [
+            ("catalog", catalog),
+            ("scoring_engine", scoring_engine),
+            ("goal_index", goal_index),
+            ("search_index", search_index),
+        ]
+    steps += [
+        ("invoke_llm_prompt", lambda: invoke_llm_prompt(data_dir)),
+        ("agent_prompt", lambda: (function_declarations(), system_prompt())),
+    ]
+    return steps
+
+
+def warm_up(data_dir: str | None = None) -> Dict[str, Any]:
+    """
+    Load and index every seed file before the first request. A failing step is
+    recorded and the process is reported not ready, but the app still serves.
+    """
+    data_dir = data_dir or os.path.abspath("data/seed")
+    # each warm-up (startup, or a SIGHUP reload in serve.py) reports on this run only
+    STARTUP.steps.clear()
+    STARTUP.errors.clear()
+    STARTUP.ready = False
+    t0 = time.perf_counter()
+    for name, step in _steps(data_dir):
+        ts = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            STARTUP.errors[name] = f"{type(e).__name__}: {e}"
+        STARTUP.steps[name] = round((time.perf_counter() - ts) * 1000, 1)
+    STARTUP.warmup_ms = round((time.perf_counter() - t0) * 1000, 1)
+    STARTUP.ready = not STARTUP.errors
+    return STARTUP.snapshot()
@@ -1,5 +1,7 @@
 from pathlib import Path
-import json, csv
+import json, csv, hashlib, io, os, threading, time
+
+from .metrics import span
 
 # Resolve repo root from backend/src/app/util/files.py
 # files.py -> util (0), app (1), src (2), backend (3), mdc-pathways (4)
@@ -8,20 +10,177 @@ ROOT = Path(__file__).resolve().parents[4]
 def seed_path(*parts) -> Path:
     return ROOT.joinpath("data", "seed", *parts)
 
+def _parse_json(raw: bytes):
+    return json.loads(raw.decode("utf-8"))
+
+def _parse_csv(raw: bytes):
+    with io.StringIO(raw.decode("utf-8"), newline="") as f:
+        return list(csv.DictReader(f))
+
+def _parse_programs(raw: bytes):
+    from ..models.program import Program
+    return [p for p in map(Program.from_row, _parse_csv(raw)) if p is not None]
+
+def _parse_mappings(raw: bytes):
+    from ..models.mappings import MappingTable
+    return MappingTable.from_dicts(_parse_json(raw))
+
+# kind -> parser; "programs" parses into Program records, "mappings" into a MappingTable
+PARSERS = {"json": _parse_json, "csv": _parse_csv,
+           "programs": _parse_programs, "mappings": _parse_mappings}
+
+def _snapshot_programs(path: Path, digest: str):
+    from .snapshot import load_programs
+    return load_programs(path, digest)
+
+def _snapshot_mappings(path: Path, digest: str):
+    from .snapshot import load_mappings
+    return load_mappings(path, digest)
+
+# kind -> loader for the memory-mapped binary snapshot (see util/snapshot.py);
+# a loader returns None when no snapshot matches the file's current digest
+SNAPSHOT_LOADERS = {"programs": _snapshot_programs, "mappings": _snapshot_mappings}
+USE_SNAPSHOT = os.getenv("SEED_SNAPSHOT", "1") != "0"
+
+
+class SeedEntry:
+    """One parsed seed file plus the file state it was parsed from."""
+    __slots__ = ("path", "kind", "data", "digest", "mtime_ns", "size", "load_ms", "loaded_at", "source")
+
+    def __init__(self, path, kind, data, digest, mtime_ns, size, load_ms, source="parse"):
+        self.path = path
+        self.source = source
+        self.kind = kind
+        self.data = data
+        self.digest = digest
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.load_ms = load_ms
+        self.loaded_at = time.time()
+
+
+class SeedStore:
+    """
+    Process-wide cache of parsed seed files.
+
+    Each file is parsed once and served from memory. On every access we stat the
+    file; if mtime/size changed we hash the bytes and only re-parse when the
+    content hash differs. The new entry is swapped in under a lock, so readers
+    always see either the old or the new parse, never a partial one.
+
+    Callers share the cached objects: treat them as read-only.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, SeedEntry] = {}
+        self._derived: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _key(self, name: str) -> Path:
+        return seed_path(name)
+
+    def entry(self, name: str, kind: str) -> SeedEntry:
+        p = self._key(name)
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Seed file not found: {p}")
+
+        key = f"{p}|{kind}"
+        cur = self._entries.get(key)
+        if cur is not None and cur.mtime_ns == st.st_mtime_ns and cur.size == st.st_size:
+            self.hits += 1
+            return cur
+
+        with self._lock:
+            cur = self._entries.get(key)
+            if cur is not None and cur.mtime_ns == st.st_mtime_ns and cur.size == st.st_size:
+                self.hits += 1
+                return cur
+
+            with span("seed_load"):
+                t0 = time.perf_counter()
+                raw = p.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()
+                if cur is not None and cur.digest == digest:
+                    # touched but unchanged: keep the parsed data, remember the new stat
+                    cur.mtime_ns, cur.size = st.st_mtime_ns, st.st_size
+                    self.hits += 1
+                    return cur
+
+                data, source = None, "parse"
+                if USE_SNAPSHOT and kind in SNAPSHOT_LOADERS:
+                    data = SNAPSHOT_LOADERS[kind](p, digest)
+                    source = "snapshot"
+                if data is None:
+                    data, source = PARSERS[kind](raw), "parse"
+                new = SeedEntry(str(p), kind, data, digest, st.st_mtime_ns, st.st_size,
+                                round((time.perf_counter() - t0) * 1000, 3), source)
+            self._entries[key] = new
+            self.misses += 1
+            if cur is not None:
+                self.reloads += 1
+            return new
+
+    def get(self, name: str, kind: str):
+        return self.entry(name, kind).data
+
+    def digest(self, name: str, kind: str) -> str:
+        return self.entry(name, kind).digest
+
+    def derived(self, key: str, deps, build):
+        """
+        Memoize build() against the current version of the seed files it reads.
+        deps is a list of (name, kind); the value is rebuilt when any digest changes.
+        """
+        version = tuple(self.digest(name, kind) for name, kind in deps)
+        cached = self._derived.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = build()
+        self._derived[key] = (version, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._derived.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "files": {
+                f"{Path(e.path).name}:{e.kind}": {
+                    "digest": e.digest[:12],
+                    "size": e.size,
+                    "load_ms": e.load_ms,
+                    "source": e.source,
+                    "loaded_at": e.loaded_at,
+                }
+                for e in list(self._entries.values())
+            },
+        }
+
+
+STORE = SeedStore()
+
 def load_json(name: str):
-    p = seed_path(name)
-    if not p.exists():
-        raise FileNotFoundError(f"Seed file not found: {p}")
-    with open(p, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return STORE.get(name, "json")
 
 def load_csv(name: str):
-    p = seed_path(name)
-    if not p.exists():
-        raise FileNotFoundError(f"Seed file not found: {p}")
-    rows = []
-    with open(p, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            rows.append(r)
-    return rows
+    return STORE.get(name, "csv")
+
+def load_programs(name: str = "programs_mdc.csv"):
+    """programs_mdc.csv as Program records (a list, or a ProgramTable over the seed snapshot)"""
+    return STORE.get(name, "programs")
+
+def load_mappings(name: str = "goal_program_map_mdc.json"):
+    """goal_program_map_mdc.json as a MappingTable"""
+    return STORE.get(name, "mappings")
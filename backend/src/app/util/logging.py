@@ -0,0 +1,152 @@
+"""
+Structured JSON logging off the request path.
+
+setup_logging() puts a QueueHandler on the root logger. Callers only pay for
+building the record and one put_nowait(). A QueueListener thread formats each
+record as one JSON line and writes it to stdout. When the queue is full, records
+are dropped and counted; callers never block.
+
+Environment:
+    LOG_LEVEL            root level (default INFO)
+    LOG_LEVELS           per-logger levels, e.g.
+                         "backend.src.app.agents=DEBUG,uvicorn.access=WARNING"
+    LOG_QUEUE_SIZE       max records waiting for the writer thread (default 10000)
+    LOG_PAYLOAD_SAMPLE   fraction of log_payload() calls that are logged (default 0.01)
+    LOG_PAYLOAD_CHARS    payload preview length (default 800)
+"""
+import atexit, copy, json, logging, os, queue, random, sys, threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict
+
+PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE", "0.01"))
+PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_CHARS", "800"))
+
+# attributes every LogRecord has; anything else came in through extra={...}
+# (color_message is uvicorn's ANSI copy of msg)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName",
+                                                                            "color_message"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+            "msg": record.getMessage(),
+        }
+        for k, v in record.__dict__.items():
+            if k not in _RECORD_ATTRS:
+                out[k] = v
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+_TRACEBACKS = logging.Formatter()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking or erroring on a full queue."""
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # resolve the message now (args may change later) but keep the traceback as its own field
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = _TRACEBACKS.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_handler: DroppingQueueHandler | None = None
+_listener: QueueListener | None = None
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _start_listener():
+    global _listener
+    q = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    out = logging.StreamHandler(sys.stdout)
+    out.setFormatter(JsonFormatter())
+    _handler.queue = q
+    _listener = QueueListener(q, out, respect_handler_level=False)
+    _listener.start()
+
+
+def _after_fork():
+    # the writer thread does not survive fork(); prefork workers start their own
+    if _handler is not None:
+        _start_listener()
+
+
+def setup_logging() -> None:
+    """Route all logging through the queue. Safe to call more than once."""
+    global _handler
+    with _lock:
+        if _handler is not None:
+            return
+        _handler = DroppingQueueHandler(queue.Queue())
+        _start_listener()
+
+        root = logging.getLogger()
+        root.handlers[:] = [_handler]
+        root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        # uvicorn installs its own synchronous stdout handlers; send its records here too
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            lg = logging.getLogger(name)
+            lg.handlers[:] = []
+            lg.propagate = True
+        for name, level in _parse_levels(os.getenv("LOG_LEVELS", "")).items():
+            logging.getLogger(name).setLevel(level)
+
+        os.register_at_fork(after_in_child=_after_fork)
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Write out whatever is still queued and stop the writer thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def log_payload(log: logging.Logger, msg: str, payload: Any, **fields) -> None:
+    """
+    DEBUG log of a (large) request/response body, for a sampled fraction of
+    calls and truncated to LOG_PAYLOAD_CHARS. Cheap no-op otherwise.
+    """
+    if not log.isEnabledFor(logging.DEBUG) or random.random() >= PAYLOAD_SAMPLE_RATE:
+        return
+    text = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False, default=str)
+    log.debug(msg, extra={**fields, "payload": text[:PAYLOAD_MAX_CHARS], "payload_chars": len(text),
+                          "sample_rate": PAYLOAD_SAMPLE_RATE})
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "queued": _handler.queue.qsize() if _handler else 0,
+        "dropped": _handler.dropped if _handler else 0,
+    }
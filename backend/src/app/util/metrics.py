@@ -0,0 +1,113 @@
+import threading, time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+
+class LatencyTracker:
+    """Keeps the last `window` latencies (ms) per key and reports percentiles."""
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: str, ms: float):
+        with self._lock:
+            q = self._samples.get(key)
+            if q is None:
+                q = self._samples[key] = deque(maxlen=self.window)
+            q.append(ms)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    @staticmethod
+    def _pct(sorted_ms, p: float) -> float:
+        i = min(len(sorted_ms) - 1, int(round(p / 100 * (len(sorted_ms) - 1))))
+        return round(sorted_ms[i], 2)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            items = {k: sorted(q) for k, q in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            k: {"count": counts[k], "p50_ms": self._pct(v, 50), "p99_ms": self._pct(v, 99)}
+            for k, v in items.items() if v
+        }
+
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_value(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Prometheus-style histogram (seconds) with a fixed set of label names."""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...], buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}  # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, labels: tuple, seconds: float):
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][i] += 1
+            s[1] += seconds
+            s[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = {k: (list(v[0]), v[1], v[2]) for k, v in self._series.items()}
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, n) in sorted(series.items()):
+            base = ",".join(f'{k}="{_label_value(v)}"' for k, v in zip(self.labelnames, labels))
+            sep = "," if base else ""
+            cum = 0
+            for le, c in zip(self.buckets + ("+Inf",), counts):
+                cum += c
+                out.append(f'{self.name}_bucket{{{base}{sep}le="{le}"}} {cum}')
+            out.append(f"{self.name}_sum{{{base}}} {total:.6f}")
+            out.append(f"{self.name}_count{{{base}}} {n}")
+        return out
+
+
+REGISTRY: List[Histogram] = []
+
+
+def render_metrics() -> str:
+    """Every registered histogram in the Prometheus text exposition format."""
+    return "\n".join(line for h in REGISTRY for line in h.render()) + "\n"
+
+
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "HTTP request latency by route.",
+                            ("method", "route", "status"))
+SPAN_SECONDS = Histogram("span_duration_seconds", "Time spent in instrumented code paths.", ("span",))
+
+# spans finished during the current request, for the Server-Timing header
+TRACE: ContextVar[Optional[list]] = ContextVar("trace", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """Time a block into span_duration_seconds{span=name} and the current request's trace."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        SPAN_SECONDS.observe((name,), dt)
+        trace = TRACE.get()
+        if trace is not None:
+            trace.append((name, dt))
@@ -0,0 +1,72 @@
+"""
+Reader for the binary seed snapshot written by etl/transform/snapshot.py.
+
+Layout of data/seed/snapshot/:
+    manifest.json   {"version": 1, "<source file name>": {"sha256", "rows", "files": {column: file}}}
+    *.npy           one array per column; string columns are (n, 2) int64 [start, end)
+                    byte ranges into a uint8 string table of the same source
+
+Arrays are opened with np.load(mmap_mode="r"), so every worker maps the same
+page-cache pages instead of parsing its own copy. A section is only used when
+its sha256 matches the current bytes of the source file.
+"""
+import json
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_dir(source: Path) -> Path:
+    return source.parent / "snapshot"
+
+
+def _section(source: Path, digest: str) -> Dict | None:
+    d = snapshot_dir(source)
+    try:
+        manifest = json.loads((d / "manifest.json").read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        return None
+    sec = manifest.get(source.name)
+    if not sec or sec.get("sha256") != digest:
+        return None
+    try:
+        return {col: np.load(d / name, mmap_mode="r") for col, name in sec["files"].items()}
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _strings(strtab: np.ndarray, spans: np.ndarray) -> List[str]:
+    # the writer stores each distinct string once, so equal spans decode to one object
+    cache: Dict[tuple, str] = {}
+    out = []
+    for a, b in spans.tolist():
+        s = cache.get((a, b))
+        if s is None:
+            s = cache[(a, b)] = bytes(strtab[a:b]).decode("utf-8")
+        out.append(s)
+    return out
+
+
+def load_programs(source: Path, digest: str):
+    """ProgramTable over the memory-mapped columns, or None if there is no snapshot for this digest."""
+    from ..models.program import ProgramTable, TEXT_COLUMNS
+
+    cols = _section(source, digest)
+    if cols is None:
+        return None
+    return ProgramTable(cols["id"], cols["total_credits"], cols["strtab"], {c: cols[c] for c in TEXT_COLUMNS})
+
+
+def load_mappings(source: Path, digest: str):
+    """MappingTable over the memory-mapped columns, or None if there is no snapshot for this digest."""
+    from ..models.mappings import MappingTable
+
+    cols = _section(source, digest)
+    if cols is None:
+        return None
+    return MappingTable(cols["goal_id"], cols["program_id"], cols["fit_strength"],
+                        cols["rationale_idx"], _strings(cols["strtab"], cols["rationales"]))
@@ -0,0 +1,116 @@
+"""
+Keyword matching with one precompiled regex, shared by the ETL tagger
+(etl/transform/map_tags.py) and the program-name validator (util/validate.py).
+
+Both matchers scan the text once, however many keywords they hold. The
+alternatives are emitted as a trie, so at each position the regex engine
+only follows the branches that share the next character.
+"""
+import re
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    # "net", "network", "nurs" -> n(?:et(?:work)?|urs); longest alternative first
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            # optional tail: greedy, so the longest word at this position is tried first
+            return body + "?" if len(branches) == 1 and len(body) == 1 else f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+def keyword_pattern(words: Iterable[str], bounded: bool = False, flags: int = 0) -> re.Pattern:
+    """
+    One regex matching any of words (literals). bounded=True only matches a word
+    with a space or the end of the text on both sides, like f" {w} " in f" {text} ".
+    """
+    body = _trie_regex(words)
+    if bounded:
+        body = rf"(?<![^ ])(?:{body})(?![^ ])"
+    return re.compile(body, flags)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _at_boundary(text: str, i: int) -> bool:
+    # re's \b: a word character on exactly one side of position i
+    return (i > 0 and _is_word(text[i - 1])) != (i < len(text) and _is_word(text[i]))
+
+
+class KeywordTagger:
+    """
+    Tags whose keywords (literal substrings) occur in a text: the same set as one
+    re.search per tag, from a single scan.
+
+    The scan is a zero-width lookahead, so every start position is tried and the
+    longest keyword starting there is matched. Any shorter keyword matching at the
+    same position is a prefix of that one, so each keyword also carries the tags of
+    its prefixes that are keywords.
+
+    Keywords listed in bounded only count as whole words (r"\bword\b"); their
+    boundaries are checked on the matched position, so they share the same scan.
+    first() returns the tag of the first rule that matches, for rule sets where
+    the earliest rule wins.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[Sequence[str], str]], flags: int = 0,
+                 bounded: Iterable[str] = ()):
+        bounded = frozenset(bounded)
+        plain: Dict[str, Set[str]] = {}
+        whole: Dict[str, Set[str]] = {}
+        self.order: List[str] = []
+        for words, tag in rules:
+            for w in words:
+                (whole if w in bounded else plain).setdefault(w, set()).add(tag)
+            if tag not in self.order:
+                self.order.append(tag)
+        words = plain.keys() | whole.keys()
+        prefixes = {w: [w[:i] for i in range(1, len(w) + 1)] for w in words}
+        self.tags_of = {
+            w: frozenset().union(*(plain[k] for k in prefixes[w] if k in plain))
+            for w in words
+        }
+        # whole-word prefixes of each keyword: (length, tags), checked per match
+        self.bounded_of = {
+            w: tuple((len(k), frozenset(whole[k])) for k in prefixes[w] if k in whole)
+            for w in words
+        }
+        self.has_bounded = bool(whole)
+        self.case_fold = bool(flags & re.I)
+        self.pattern = re.compile(f"(?=({_trie_regex(words)}))", flags)
+
+    def tags(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        if not self.has_bounded:
+            for w in set(self.pattern.findall(text)):
+                found |= self.tags_of[w.lower() if self.case_fold else w]
+            return found
+        for m in self.pattern.finditer(text):
+            w = m.group(1)
+            w = w.lower() if self.case_fold else w
+            found |= self.tags_of[w]
+            start = m.start()
+            for n, tags in self.bounded_of[w]:
+                if _at_boundary(text, start) and _at_boundary(text, start + n):
+                    found |= tags
+        return found
+
+    def first(self, text: str) -> str | None:
+        found = self.tags(text)
+        return next((t for t in self.order if t in found), None)
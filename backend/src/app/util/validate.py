@@ -1,5 +1,7 @@
 import re
 
+from .tagging import keyword_pattern
+
 # Program-ish patterns: must look like a real offering
 NAME_MUST = re.compile(
     r"""(?ix)
@@ -32,6 +34,8 @@ PROGRAM_HINTS = {
     "paralegal","photographic","physical therapist","pilot","radiation","radiography","respiratory","sign language",
     "surgical","translation","transportation","veterinary","web"
 }
+# any hint as a whole space-delimited phrase, in one scan (was a loop over PROGRAM_HINTS)
+PROGRAM_HINTS_PATTERN = keyword_pattern(sorted(PROGRAM_HINTS), bounded=True)
 CODE_PATTERN = re.compile(r"\bCode:\s*\d{3,6}\b", re.I)
 def looks_like_program_name(name: str) -> bool:
     if not name or len(name) < 8:
@@ -47,8 +51,7 @@ def looks_like_program_name(name: str) -> bool:
     if CODE_PATTERN.search(name):
         return True
     # Contains a known program hint
-    nm = " " + deg + " "
-    if any(f" {kw} " in nm for kw in PROGRAM_HINTS):
+    if PROGRAM_HINTS_PATTERN.search(deg):
         return True
     return False
 
@@ -75,7 +78,10 @@ def is_valid_program(row: dict) -> bool:
         total = int(row.get("total_credits") or 0)
     except Exception:
         return False
+    return program_fields_valid(award, name, total)
 
+def program_fields_valid(award: str, name: str, total: int) -> bool:
+    """is_valid_program on already-parsed fields (award upper/stripped, name stripped)."""
     if award not in AWARDS:
         return False
 
@@ -95,4 +101,4 @@ def is_valid_program(row: dict) -> bool:
     if name and name[0].islower():
         return False
 
-    return True
\ No newline at end of file
+    return True
@@ -0,0 +1,114 @@
+import json, time
+from types import SimpleNamespace as NS
+
+from backend.src.app.agents import orchestrator, registry, tools
+from backend.src.app.agents.llm_cache import LLMCache
+from backend.src.app.models.program import Program
+from backend.src.app.repositories import program_repo
+from backend.src.app.services.catalog import ProgramCatalog, catalog
+
+
+def test_program_details_use_the_first_valid_row(monkeypatch):
+    rows = [Program(10001, "Associate in Science in Nursing", "AS", 500, "", "", "", "", "typo in credits"),
+            Program(10001, "Associate in Science in Nursing", "AS", 72, "", "", "", "nursing", "valid row"),
+            Program(10002, "Broken", "XYZ", 60, "", "", "", "", "")]
+    cat = ProgramCatalog(rows)
+    monkeypatch.setattr(program_repo, "catalog", lambda: cat)
+    assert tools.tool_get_program_details(10001)["description"] == "valid row"
+    assert tools.tool_get_program_details(10002) is None
+    assert tools.tool_get_program_details(1) is None
+
+
+class _Chat:
+    """Scripted stand-in for a Gemini chat: one response per send_message, messages recorded."""
+
+    def __init__(self, turns):
+        self.turns, self.sent = list(turns), []
+
+    def send_message(self, message):
+        self.sent.append(message)
+        return self.turns.pop(0)
+
+
+class _Response:
+    """Gemini response with the given function calls; .text raises unless there are none."""
+
+    def __init__(self, *calls, text=None):
+        parts = [NS(function_call=NS(name=name, args=args)) for name, args in calls]
+        self.candidates = [NS(content=NS(parts=parts))]
+        self._text = text
+
+    @property
+    def text(self):
+        if self._text is None:
+            raise ValueError("the response has no text part")
+        return self._text
+
+
+def _agent(monkeypatch, turns):
+    chat = _Chat(turns)
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    monkeypatch.setattr(orchestrator, "LLM_CACHE", LLMCache())
+    monkeypatch.setattr(orchestrator, "gemini_model", lambda key: NS(start_chat=lambda history: chat))
+    ran = []
+
+    def tool(name, delay):
+        def run(args):
+            time.sleep(delay)  # the first call finishes last
+            ran.append(name)
+            return {"tool": name, "args": args}
+        return run
+
+    monkeypatch.setitem(orchestrator.TOOLS, "getProgramDetails", tool("getProgramDetails", 0.05))
+    monkeypatch.setitem(orchestrator.TOOLS, "estimateCost", tool("estimateCost", 0))
+    return chat, ran
+
+
+REQ = {"goalId": 1, "priorEducation": "hs", "earnedCredits": 0, "preferOnline": False}
+
+
+def test_agent_answers_a_turn_of_tool_calls_in_one_message(monkeypatch):
+    pid = min(catalog().valid_ids)
+    answer = {"recommendations": [{"program": {"id": pid}}]}
+    chat, ran = _agent(monkeypatch, [
+        _Response(("getProgramDetails", {"program_id": pid}), ("estimateCost", {"program_id": pid})),
+        _Response(text=json.dumps(answer)),
+    ])
+    out = orchestrator.recommend_with_gemini(REQ)
+
+    assert out["debug"]["origin"] == "ai" and out["recommendations"] == answer["recommendations"]
+    assert ran == ["estimateCost", "getProgramDetails"]  # ran concurrently
+    assert len(chat.sent) == 2
+    replies = [p.function_response for p in chat.sent[1]]
+    assert [r.name for r in replies] == ["getProgramDetails", "estimateCost"]  # call order
+    assert [r.response["tool"] for r in replies] == ["getProgramDetails", "estimateCost"]
+    first, last = out["debug"]["steps"]
+    assert first["tools"] == ["getProgramDetails", "estimateCost"]
+    assert first["tool_ms"] >= 50 and first["model_ms"] >= 0
+    assert last["tools"] == [] and "tool_ms" not in last
+
+
+def test_agent_stops_on_an_unknown_tool(monkeypatch):
+    chat, ran = _agent(monkeypatch, [
+        _Response(("estimateCost", {"program_id": 1}), ("dropTables", {})),
+        _Response(text="{}"),
+    ])
+    out = orchestrator.recommend_with_gemini(REQ)
+
+    assert len(chat.sent) == 1 and ran == []
+    assert out["debug"]["origin"] == "fallback"
+
+
+def test_gemini_model_follows_the_configured_key(monkeypatch):
+    import google.generativeai as genai
+
+    configured = []
+    monkeypatch.setattr(genai, "configure", lambda api_key: configured.append(api_key))
+    monkeypatch.setattr(genai, "GenerativeModel", lambda **kw: object())
+    monkeypatch.setattr(registry, "_model", None)
+
+    a = registry.gemini_model("k1")
+    assert registry.gemini_model("k1") is a
+    b = registry.gemini_model("k2")
+    assert b is not a and registry.gemini_model("k1") is not a  # rebuilt for the key now configured
+    assert configured == ["k1", "k2", "k1"]
@@ -0,0 +1,33 @@
+import subprocess, sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parents[3]
+
+
+@pytest.mark.parametrize("module", ["etl.transform.emit_seeds", "etl.transform.normalize_programs",
+                                    "etl.transform.bench_tags"])
+def test_transform_stages_run_as_modules_and_scripts(module, tmp_path):
+    script = REPO / (module.replace(".", "/") + ".py")
+    for cmd, cwd in (([sys.executable, "-m", module, "--help"], REPO),
+                     ([sys.executable, str(script), "--help"], tmp_path)):
+        r = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=60)
+        assert r.returncode == 0, r.stderr
+
+
+def test_diff_rows_are_only_reused_from_the_csv_it_is_relative_to(tmp_path):
+    from etl.transform.normalize_programs import load_unchanged_rows, write_stamp
+
+    out = tmp_path / "programs_mdc.csv"
+    out.write_text("id,name\n1,Nursing\n2,Cybersecurity\n", encoding="utf-8")
+    diff = tmp_path / "catalog_diff.json"
+    diff.write_text('{"base_export": "a", "export": "b", "added": [], "changed": [2], "removed": []}',
+                    encoding="utf-8")
+
+    assert load_unchanged_rows(str(out), str(diff), "b") == {}  # no stamp: built from an unknown export
+    write_stamp(str(out), "a")
+    assert list(load_unchanged_rows(str(out), str(diff), "b")) == ["1"]
+    assert load_unchanged_rows(str(out), str(diff), "c") == {}  # the diff is about another export
+    write_stamp(str(out), "z")
+    assert load_unchanged_rows(str(out), str(diff), "b") == {}
@@ -0,0 +1,62 @@
+import json, os
+
+import numpy as np
+
+from backend.src.app.util.files import SeedStore
+
+
+def test_seed_store_caches_and_reloads_on_change(tmp_path):
+    f = tmp_path / "goals.json"
+    f.write_text(json.dumps([{"id": 1}]), encoding="utf-8")
+    store = SeedStore()
+
+    first = store.get(str(f), "json")
+    assert store.get(str(f), "json") is first
+    assert (store.hits, store.misses) == (1, 1)
+
+    # touched but identical content: no re-parse
+    st = f.stat()
+    os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+    assert store.get(str(f), "json") is first
+    assert store.reloads == 0
+
+    f.write_text(json.dumps([{"id": 1}, {"id": 2}]), encoding="utf-8")
+    os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 20_000_000))
+    assert len(store.get(str(f), "json")) == 2
+    assert store.reloads == 1
+
+
+def test_snapshot_matches_parsed_seed(tmp_path):
+    from etl.transform.snapshot import write_programs_snapshot, write_mappings_snapshot
+
+    programs = tmp_path / "programs_mdc.csv"
+    programs.write_text(
+        "id,name,award_level,total_credits,delivery_mode,campuses,url,tags,description\n"
+        "1,Cyber Security,AS,60,Online,North,http://x,cybersecurity;network,Défense\n"
+        "x,Broken,AS,60,,,,,\n"
+        "2,Accounting,AA,,Hybrid,,,accounting,\n", encoding="utf-8")
+    mappings = tmp_path / "goal_program_map_mdc.json"
+    mappings.write_text(json.dumps([{"goal_id": 11, "program_id": 1, "fit_strength": 4, "rationale": "r"},
+                                    {"goal_id": 12, "program_id": 2, "rationale": "r"}]), encoding="utf-8")
+
+    parsed = SeedStore()
+    expected = ([p.as_row() for p in parsed.get(str(programs), "programs")],
+                list(map(repr, parsed.get(str(mappings), "mappings"))))
+    write_programs_snapshot(programs)
+    write_mappings_snapshot(mappings)
+
+    store = SeedStore()
+    got = ([p.as_row() for p in store.get(str(programs), "programs")],
+           list(map(repr, store.get(str(mappings), "mappings"))))
+    assert got == expected
+    assert {e["source"] for e in store.stats()["files"].values()} == {"snapshot"}
+
+    # the catalog reads rows from the mapped columns instead of copying them
+    from backend.src.app.models.program import ProgramTable
+    from backend.src.app.services.catalog import ProgramCatalog
+    table = store.get(str(programs), "programs")
+    cat = ProgramCatalog(table)
+    assert isinstance(table, ProgramTable) and isinstance(table.ids, np.memmap)
+    assert isinstance(cat.valid_rows, ProgramTable)
+    assert [p.as_row() for p in cat.valid_rows] == [expected[0][0]]
+    assert cat.get(2).award_level == "AA" and cat.get_valid(2) is None
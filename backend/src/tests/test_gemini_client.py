@@ -0,0 +1,118 @@
+import asyncio, json, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.src.app.agents.gemini_client import GeminiClient, GeminiError
+
+
+def _stub(statuses):
+    """Local Gemini stand-in: answers with the given status codes in order, then 200."""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            seen.append((self.path, body))
+            status = statuses.pop(0) if statuses else 200
+            if status == 200 and "streamGenerateContent" in self.path:
+                out = "".join(
+                    "data: " + json.dumps({"candidates": [{"content": {"parts": [{"text": t}]}}]}) + "\r\n\r\n"
+                    for t in ('{"career_goal": ', '"Nurse"}')).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+                return
+            out = json.dumps({"candidates": [{"content": {"parts": [{"text": "ok"}]}}]} if status == 200
+                             else {"error": status}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, seen
+
+
+def _client(server, **kw):
+    return GeminiClient(api_key="k", base_url=f"http://127.0.0.1:{server.server_port}",
+                        model="m", backoff=0.01, **kw)
+
+
+def test_generate_retries_then_succeeds():
+    server, seen = _stub([503, 429])
+    client = _client(server)
+
+    async def go():
+        try:
+            return await client.generate({"contents": []})
+        finally:
+            await client.aclose()
+
+    data = asyncio.run(go())
+    server.shutdown()
+    assert data["candidates"][0]["content"]["parts"][0]["text"] == "ok"
+    assert len(seen) == 3
+    assert seen[0][0] == "/models/m:generateContent?key=k"
+
+
+def test_generate_does_not_retry_client_errors():
+    server, seen = _stub([400])
+    client = _client(server)
+
+    async def go():
+        try:
+            return await client.generate({"contents": []})
+        finally:
+            await client.aclose()
+
+    with pytest.raises(GeminiError) as e:
+        asyncio.run(go())
+    server.shutdown()
+    assert e.value.status_code == 400
+    assert len(seen) == 1
+
+
+def test_stream_yields_text_chunks_after_retry():
+    server, seen = _stub([502])
+    client = _client(server)
+
+    async def go():
+        try:
+            return [chunk async for chunk in client.stream({"contents": []})]
+        finally:
+            await client.aclose()
+
+    chunks = asyncio.run(go())
+    server.shutdown()
+    assert chunks == ['{"career_goal": ', '"Nurse"}']
+    assert len(seen) == 2
+    assert seen[1][0] == "/models/m:streamGenerateContent?alt=sse&key=k"
+
+
+def test_one_client_per_event_loop():
+    server, _ = _stub([])
+    client = _client(server)
+
+    async def call():
+        await client.generate({"contents": []})
+        return client._ensure()[0]
+
+    first = asyncio.run(call())  # the loop ends without aclose()
+
+    async def go():
+        second = await call()
+        assert second is not first and await call() is second
+        assert list(client._per_loop.values()) == [client._ensure()]  # the closed loop's client is gone
+        await client.aclose()
+        assert not client._per_loop
+
+    asyncio.run(go())
+    server.shutdown()
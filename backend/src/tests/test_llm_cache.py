@@ -0,0 +1,42 @@
+from backend.src.app.agents.llm_cache import LLMCache
+
+
+def test_cache_normalizes_prompt_and_evicts_lru():
+    cache = LLMCache(max_entries=2, ttl=60)
+    cache.set("ns", "I want to be a nurse!", "s1", {"a": 1})
+    assert cache.get("ns", "  i want to be a   NURSE ", "s1") == {"a": 1}
+    cache.set("ns", "b", "s1", 2)
+    cache.set("ns", "c", "s1", 3)
+    assert cache.get("ns", "b", "s1") == 2
+    assert cache.get("ns", "i want to be a nurse", "s1") is None  # evicted (least recently used)
+    assert cache.evictions == 1
+
+
+def test_cache_expires_and_keys_entries_by_seed(tmp_path):
+    cache = LLMCache(ttl=0, db_path=str(tmp_path / "c.db"))
+    cache.set("ns", "p", "s1", 1)
+    assert cache.get("ns", "p", "s1") is None
+
+    cache = LLMCache(ttl=60, db_path=str(tmp_path / "c.db"))
+    cache.set("ns", "p", "s1", 1)
+    assert LLMCache(db_path=str(tmp_path / "c.db")).get("ns", "p", "s1") == 1  # disk tier
+    assert cache.get("ns", "p", "s2") is None
+    cache.set("ns", "p", "s2", 2)
+    assert {v[1] for v in cache._mem.values()} == {"s2"}  # old seeds leave this worker's memory
+    # but a worker still on the old seeds (rolling reload) keeps its rows
+    assert LLMCache(db_path=str(tmp_path / "c.db")).get("ns", "p", "s1") == 1
+    assert cache.get("ns", "p", "s2") == 2
+
+
+def test_cache_purges_expired_rows_at_most_once_per_interval(tmp_path):
+    cache = LLMCache(ttl=0, db_path=str(tmp_path / "c.db"), purge_interval=3600)
+    rows = lambda: cache._db.execute("SELECT count(*) FROM llm_cache").fetchone()[0]
+    cache.set("ns", "a", "s1", 1)
+    assert rows() == 0  # first write purges
+    cache.set("ns", "b", "s1", 2)
+    cache.set("ns", "c", "s1", 3)
+    assert rows() == 2  # expired, but kept until the next purge
+    assert cache.get("ns", "b", "s1") is None
+    cache._next_purge = 0
+    cache.set("ns", "d", "s1", 4)
+    assert rows() == 0
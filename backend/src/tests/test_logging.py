@@ -0,0 +1,55 @@
+import json, logging, queue
+
+import pytest
+
+from backend.src.app.util.logging import DroppingQueueHandler, JsonFormatter
+from backend.src.app.util import logging as app_logging
+
+
+def _record_through(handler, log_call):
+    log = logging.getLogger("test.structured")
+    log.handlers[:] = [handler]
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    log_call(log)
+    return handler.queue.get_nowait()
+
+
+def test_json_lines_keep_extra_fields_and_traceback():
+    handler = DroppingQueueHandler(queue.Queue())
+
+    rec = _record_through(handler, lambda log: log.info("hello %s", "world", extra={"goal_id": 3}))
+    line = json.loads(JsonFormatter().format(rec))
+    assert (line["msg"], line["level"], line["goal_id"]) == ("hello world", "INFO", 3)
+
+    def fail(log):
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            log.exception("boom")
+    line = json.loads(JsonFormatter().format(_record_through(handler, fail)))
+    assert line["msg"] == "boom" and "ZeroDivisionError" in line["exc"]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    log = logging.getLogger("test.dropping")
+    log.handlers[:] = [handler]
+    log.propagate = False
+    for i in range(5):
+        log.warning("record %d", i)
+    assert handler.queue.qsize() == 1 and handler.dropped == 4
+
+
+def test_payload_logs_are_sampled_and_truncated(monkeypatch):
+    handler = DroppingQueueHandler(queue.Queue())
+    monkeypatch.setattr(app_logging, "PAYLOAD_MAX_CHARS", 10)
+
+    monkeypatch.setattr(app_logging, "PAYLOAD_SAMPLE_RATE", 0.0)
+    _record = lambda: _record_through(handler, lambda log: app_logging.log_payload(log, "req", "x" * 50))
+    with pytest.raises(queue.Empty):
+        _record()
+
+    monkeypatch.setattr(app_logging, "PAYLOAD_SAMPLE_RATE", 1.0)
+    rec = _record()
+    assert (rec.payload, rec.payload_chars) == ("x" * 10, 50)
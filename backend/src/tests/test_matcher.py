@@ -0,0 +1,8 @@
+from backend.src.app.util.files import load_json
+from backend.src.app.services.matcher import score_candidates, goal_candidates
+
+
+def test_goal_candidates_match_full_scan():
+    mappings = load_json("goal_program_map_mdc.json")
+    for goal_id in range(0, 25):
+        assert goal_candidates(goal_id) == score_candidates(goal_id, mappings)
@@ -0,0 +1,46 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.src.app.middleware import ProfilerMiddleware, TimingMiddleware
+from backend.src.app.util.metrics import span
+
+
+def _app(profiling: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        with span("lookup"):
+            time.sleep(0.02)
+            return {"id": item_id}
+
+    app.add_middleware(ProfilerMiddleware, enabled=profiling, interval=0.001)
+    app.add_middleware(TimingMiddleware)
+    return app
+
+
+def test_route_histogram_and_server_timing():
+    from backend.src.app.util.metrics import render_metrics
+
+    client = TestClient(_app(profiling=False))
+    r = client.get("/items/7?profile=1")
+    assert r.json() == {"id": 7}  # profiling not enabled: normal response
+    assert r.headers["server-timing"].startswith("lookup;dur=")
+
+    text = render_metrics()
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"}' in text
+    assert 'span_duration_seconds_bucket{span="lookup",le="+Inf"}' in text
+
+
+def test_profile_returns_collapsed_stacks():
+    client = TestClient(_app(profiling=True))
+    r = client.get("/items/7", headers={"X-Profile": "1"})
+    assert r.status_code == 200 and r.headers["x-profile-status"] == "200"
+    assert r.headers["content-type"].startswith("text/plain")
+    assert int(r.headers["x-profile-samples"]) > 0
+    assert "item (test_middleware.py" in r.text
+    for line in r.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from backend.src.app.repositories.db import create_schema, load_seeds, make_engine
+from backend.src.app.repositories.program_repo import FileProgramRepository
+from backend.src.app.repositories.goal_repo import FileGoalRepository
+from backend.src.app.repositories.cost_repo import FileCostRepository
+
+
+def _sql_repos(url):
+    from backend.src.app.repositories.sql import SqlProgramRepository, SqlGoalRepository, SqlCostRepository
+
+    eng = make_engine(url)
+    create_schema(eng)
+    load_seeds(eng)
+    return SqlProgramRepository(eng), SqlGoalRepository(eng), SqlCostRepository(eng)
+
+
+def _assert_same_as_files(programs, goals, costs):
+    files_p, files_g, files_c = FileProgramRepository(), FileGoalRepository(), FileCostRepository()
+    rows = lambda ps: [p.as_row() for p in ps]
+
+    assert goals.list() == files_g.list()
+    assert costs.cost_model() == files_c.cost_model()
+    assert programs.count() == files_p.count()
+    assert rows(programs.list()) == rows(files_p.list())
+    for kw in ({"award": "as"}, {"tag": "CS"}, {"award": "AA", "limit": 5, "offset": 2}, {"tag": "nope"}):
+        assert rows(programs.list(**kw)) == rows(files_p.list(**kw))
+
+    ids = [p.id for p in files_p.list(limit=12)]
+    assert rows(programs.get_many(ids[::-1] + [1])) == rows(files_p.get_many(ids[::-1] + [1]))
+    assert programs.get(ids[3]).as_row() == files_p.get(ids[3]).as_row()
+    assert programs.get(1) is None
+    row = lambda p: p and p.as_row()
+    for pid in ids + [1]:
+        assert row(programs.get(pid, valid_only=True)) == row(files_p.get(pid, valid_only=True))
+
+    cm = files_c.cost_model()
+    for goal_id in range(0, 25):
+        prefs = files_g.prefs(goal_id)
+        assert goals.prefs(goal_id) == prefs
+        sql_rank, file_rank = programs.ranker(goal_id, prefs), files_p.ranker(goal_id, prefs)
+        for earned in (0, 45):
+            for online in (False, True):
+                assert sql_rank(earned, online, cm, k=3) == file_rank(earned, online, cm, k=3)
+        assert sql_rank(0, False, cm, k=1000) == file_rank(0, False, cm, k=1000)
+        for valid_only in (True, False):
+            assert ([(p.as_row(), fit) for p, fit in programs.candidates(goal_id, valid_only)]
+                    == [(p.as_row(), fit) for p, fit in files_p.candidates(goal_id, valid_only)])
+
+    for q in ("nursing", "cyber sec", "nursng", "business a"):
+        hits = lambda repo: [(h.program.as_row(), round(h.score, 9), h.terms)
+                             for h in repo.search_index().search(q, limit=None, valid_only=True)]
+        assert hits(programs) == hits(files_p)
+
+
+def test_sqlite_store_matches_file_store(tmp_path):
+    _assert_same_as_files(*_sql_repos(f"sqlite:///{tmp_path / 'app.db'}"))
+
+
+def test_in_memory_sqlite_store():
+    programs, _, _ = _sql_repos("sqlite:///:memory:")
+    assert programs.count() == FileProgramRepository().count()
+
+
+def test_agent_tools_read_the_configured_store(tmp_path, monkeypatch):
+    from backend.src.app.agents import orchestrator, tools
+    from backend.src.app.repositories import program_repo, goal_repo, cost_repo
+
+    calls = [lambda: tools.tool_search_programs(4, "hs", 0, True),
+             lambda: tools.tool_search_programs(4, "hs", 0, True, query="technology"),
+             lambda: tools.tool_search_programs(None, "hs", 0, False, query="cyber"),
+             lambda: tools.tool_get_program_details(tools.tool_search_programs(4, "hs", 0, False)[0]["program_id"]),
+             lambda: tools.tool_estimate_cost(1, 30),
+             lambda: orchestrator._fallback({"goalId": 4, "earnedCredits": 12})]
+    expected = [call() for call in calls]
+
+    sql = _sql_repos(f"sqlite:///{tmp_path / 'app.db'}")
+    for module, repo in zip((program_repo, goal_repo, cost_repo), sql):
+        monkeypatch.setattr(module, "_repo", repo)
+    assert [call() for call in calls] == expected
+    assert program_repo.program_repo() is sql[0]
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="set TEST_DATABASE_URL to a scratch Postgres database")
+def test_postgres_store_matches_file_store():
+    _assert_same_as_files(*_sql_repos(os.environ["TEST_DATABASE_URL"]))
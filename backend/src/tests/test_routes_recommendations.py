@@ -0,0 +1,161 @@
+import random
+
+from backend.src.app.models.program import Program
+from backend.src.app.services.catalog import ProgramCatalog
+from backend.src.app.services.scoring import ScoringEngine
+from backend.src.app.services.matcher import boost_by_delivery, boost_by_goal_prefs, remaining_credits
+from backend.src.app.services.cost_estimator import estimate_terms, estimate_cost
+from backend.src.app.services.typing import CostModel
+
+COST = CostModel(institution="MDC", in_state_per_credit=118.22, out_state_per_credit=403.64,
+                 tech_fee_per_credit=3.0, term_fee_flat=50.0, book_allowance_per_term=300.0,
+                 program_overrides={"10007": 999.0})
+
+
+def _loop_rank(rows, base_scores, prefs, earned, online, goal_id):
+    # the original per-program loop from routes/recommendations.recommend
+    cands = []
+    for p in rows:
+        pid = int(p["id"])
+        if pid not in base_scores:
+            continue
+        total_cr = int(p.get("total_credits") or 0)
+        score = boost_by_delivery(base_scores[pid], p.get("delivery_mode"), online)
+        score = boost_by_goal_prefs(score, p, prefs)
+        rem = remaining_credits(total_cr, earned)
+        terms = estimate_terms(rem)
+        cands.append({
+            "score": score,
+            "program": {"id": pid, "name": p.get("name"), "award_level": p.get("award_level"),
+                        "total_credits": total_cr, "url": p.get("url")},
+            "remaining_credits": rem,
+            "estimated_terms": terms,
+            "estimated_cost": estimate_cost(rem, terms, COST, pid),
+            "why_this": (
+                f"Matched goal {goal_id}; fit_strength={base_scores[pid]}; "
+                f"{'online-friendly' if (p.get('delivery_mode') or '').lower() in ('online','hybrid') else 'on-campus'}"
+            ),
+        })
+    cands.sort(key=lambda x: (-x["score"], x["remaining_credits"]))
+    return cands[:3]
+
+
+def test_scoring_engine_matches_loop():
+    rnd = random.Random(7)
+    tags = ["cs", "data", "ai", "business", "nursing", "design"]
+    rows = []
+    for i in range(300):
+        award = rnd.choice(["AA", "AS", "BS", "BAS", "CERTIFICATE"])
+        credits = {"AA": 60, "AS": rnd.choice([60, 64, 72]), "BS": 120, "BAS": 120, "CERTIFICATE": 24}[award]
+        rows.append({
+            "id": str(10000 + i), "name": f"Associate in Science Program {i}", "award_level": award,
+            "total_credits": str(credits), "delivery_mode": rnd.choice(["TBD", "Online", "hybrid", ""]),
+            "url": "TBD", "tags": ";".join(rnd.sample(tags, rnd.randint(0, 3))),
+        })
+    engine = ScoringEngine(ProgramCatalog([Program.from_row(r) for r in rows]))
+    valid_ids = {p.id for p in engine.rows}
+    valid = [r for r in rows if int(r["id"]) in valid_ids]
+    for goal_id in range(20):
+        base = {10000 + i: rnd.randint(1, 5) for i in rnd.sample(range(300), rnd.randint(0, 80))}
+        prefs = {"preferred_tags": set(rnd.sample(tags, rnd.randint(0, 3))),
+                 "preferred_awards": set(rnd.sample(["AA", "AS", "BS"], rnd.randint(0, 2)))}
+        gs = engine.goal_scores(goal_id, base, prefs)
+        for earned in (0, 15, 61, 500):
+            for online in (False, True):
+                assert engine.rank(gs, earned, online, COST) == _loop_rank(valid, base, prefs, earned, online, goal_id)
+
+
+def test_batch_endpoint_matches_single_requests():
+    import json
+    from fastapi.testclient import TestClient
+    from backend.src.app.main import app
+
+    client = TestClient(app)
+    reqs = [{"priorEducation": "hs", "goalId": g, "earnedCredits": e, "preferOnline": o}
+            for g in (1, 3, 1, 99) for e in (0, 70) for o in (False, True)]
+    r = client.post("/recommendations/batch", json=reqs)
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [l["index"] for l in lines] == list(range(len(reqs)))
+    for line, req in zip(lines, reqs):
+        assert line["recommendations"] == client.post("/recommendations", json=req).json()["recommendations"]
+
+
+def test_batch_reads_the_store_once_before_streaming(monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend.src.app.main import app
+    from backend.src.app.repositories import program_repo
+    from backend.src.app.services.scoring import scoring_engine
+
+    engines = []
+    monkeypatch.setattr(program_repo, "scoring_engine", lambda: engines.append(1) or scoring_engine())
+    reqs = [{"priorEducation": "hs", "goalId": g} for g in (1, 3, 1, 5, 3)]
+    r = TestClient(app).post("/recommendations/batch", json=reqs)
+    assert len(r.text.splitlines()) == len(reqs)
+    assert engines == [1]  # one engine for every goal of the batch
+
+
+def test_ai_route_falls_back_to_heuristic_after_deadline(monkeypatch):
+    import time
+    from fastapi.testclient import TestClient
+    from backend.src.app.main import app
+    import backend.src.app.routes.recommendations as rec
+
+    def slow_ai(payload):
+        time.sleep(0.3)
+        return {"recommendations": [], "debug": {"origin": "ai"}}
+
+    monkeypatch.setattr(rec, "recommend_with_gemini", slow_ai)
+    monkeypatch.setattr(rec, "AI_DEADLINE_S", 0.05)
+    client = TestClient(app)
+    req = {"priorEducation": "hs", "goalId": 1}
+    out = client.post("/recommendations/ai", json=req).json()
+    assert out["debug"] == {"origin": "heuristic", "winner": "heuristic", "reason": "deadline"}
+    assert out["recommendations"] == client.post("/recommendations", json=req).json()["recommendations"]
+
+    monkeypatch.setattr(rec, "AI_DEADLINE_S", 5)
+    assert client.post("/recommendations/ai", json=req).json()["debug"] == {"origin": "ai", "winner": "ai"}
+
+
+def test_ai_route_prefers_heuristic_over_agent_fallback(monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend.src.app.main import app
+    import backend.src.app.routes.recommendations as rec
+
+    monkeypatch.setattr(rec, "recommend_with_gemini",
+                        lambda payload: {"recommendations": [], "debug": {"origin": "fallback"}})
+    client = TestClient(app)
+    req = {"priorEducation": "hs", "goalId": 1}
+    out = client.post("/recommendations/ai", json=req).json()
+    assert out["debug"] == {"origin": "heuristic", "winner": "heuristic", "reason": "ai_fallback"}
+    assert out["recommendations"] == client.post("/recommendations", json=req).json()["recommendations"]
+
+
+def test_ai_stream_sends_heuristic_first_and_honours_the_deadline(monkeypatch):
+    import json, time
+    from fastapi.testclient import TestClient
+    from backend.src.app.main import app
+    import backend.src.app.routes.recommendations as rec
+
+    def slow_ai(payload):
+        time.sleep(0.3)
+        return {"recommendations": [], "debug": {"origin": "ai"}}
+
+    def events(body):
+        frames = [f.split("\n") for f in body.strip().split("\n\n")]
+        return [(e[len("event: "):], json.loads(d[len("data: "):])) for e, d in frames]
+
+    monkeypatch.setattr(rec, "recommend_with_gemini", slow_ai)
+    monkeypatch.setattr(rec, "AI_DEADLINE_S", 0.05)
+    client = TestClient(app)
+    req = {"priorEducation": "hs", "goalId": 1}
+    heuristic = client.post("/recommendations", json=req).json()
+    got = events(client.post("/recommendations/ai/stream", json=req).text)
+    assert [e for e, _ in got] == ["heuristic", "ai", "done"]
+    assert got[0][1] == heuristic
+    assert got[1][1] == dict(heuristic, debug={"origin": "heuristic", "winner": "heuristic", "reason": "deadline"})
+
+    monkeypatch.setattr(rec, "recommend_with_gemini",
+                        lambda payload: {"recommendations": [], "debug": {"origin": "fallback"}})
+    got = events(client.post("/recommendations/ai/stream", json=req).text)
+    assert got[1][1]["debug"]["reason"] == "ai_fallback"
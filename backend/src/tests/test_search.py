@@ -0,0 +1,49 @@
+from fastapi.testclient import TestClient
+
+from backend.src.app.main import app
+from backend.src.app.models.program import Program
+from backend.src.app.rag.search import ProgramSearchIndex
+
+ROWS = [
+    Program(1, "Associate in Science in Nursing", "AS", 72, "Classroom", "Medical", "", "nursing;health", "Registered nurse."),
+    Program(2, "Bachelor of Science in Cybersecurity", "BS", 120, "Online", "North", "", "cyber;computer",
+            "Network defense and security operations."),
+    Program(3, "Certificate in Network Security", "CERTIFICATE", 24, "Hybrid", "North", "", "cyber",
+            "Firewalls, network security and cybersecurity basics."),
+    Program(4, "Associate in Arts in Business", "AA", 60, "Classroom", "Kendall", "", "business",
+            "Accounting and management."),
+]
+
+
+def _ids(hits):
+    return [h.program.id for h in hits]
+
+
+def test_bm25_ranks_name_and_tag_matches_first():
+    ix = ProgramSearchIndex(ROWS)
+    assert _ids(ix.search("nursing")) == [1]
+    assert _ids(ix.search("network security ")) == [3, 2]
+    assert _ids(ix.search("cybersecurity ", award="bs")) == [2]
+
+
+def test_typos_and_prefixes():
+    ix = ProgramSearchIndex(ROWS)
+    assert _ids(ix.search("nursng")) == [1]
+    assert _ids(ix.search("busines administration")) == [4]
+    hits = ix.search("cyber")
+    assert set(_ids(hits)) == {2, 3} and "cybersecurity" in hits[0].terms
+    # a finished word (trailing space) is not completed
+    assert _ids(ix.search("ma")) == [4]
+    assert _ids(ix.search("ma ")) == []
+    assert ix.search("xqzv") == []
+    assert ix.search("the of ") == []
+
+
+def test_search_route():
+    client = TestClient(app)
+    r = client.get("/programs/search", params={"q": "nursing", "limit": 3})
+    assert r.status_code == 200
+    body = r.json()
+    assert 0 < len(body["results"]) <= 3
+    assert all("nursing" in x["matched"] for x in body["results"])
+    assert client.get("/programs/search").status_code == 422
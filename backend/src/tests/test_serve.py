@@ -0,0 +1,27 @@
+import argparse, gc
+
+from backend.src.app.serve import Arbiter
+from backend.src.app.startup import STARTUP, warm_up
+
+
+def test_warm_up_recovers_after_a_failed_run():
+    state = warm_up("/nonexistent")
+    assert not state["ready"] and "invoke_llm_prompt" in state["errors"]
+
+    state = warm_up()
+    assert state["ready"] and not state["errors"]
+    assert STARTUP.ready
+
+
+def test_preload_fails_then_recovers(monkeypatch):
+    arbiter = Arbiter(app=None, sock=None, args=argparse.Namespace())
+    import backend.src.app.startup as startup
+
+    good = startup.warm_up
+    monkeypatch.setattr(startup, "warm_up", lambda: good("/nonexistent"))
+    assert arbiter.preload() is False  # a bad seed publish: the reload is aborted
+
+    monkeypatch.setattr(startup, "warm_up", good)
+    assert arbiter.preload() is True   # seeds fixed: the next SIGHUP goes through
+    assert STARTUP.snapshot()["ready"]
+    gc.unfreeze()  # preload freezes the heap for forking
@@ -0,0 +1,13 @@
+from fastapi.testclient import TestClient
+
+from backend.src.app.main import app
+
+
+def test_readyz_after_warm_up():
+    with TestClient(app) as client:
+        r = client.get("/readyz")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["ready"] and not body["errors"]
+    assert {"catalog", "scoring_engine", "goal_index", "invoke_llm_prompt"} <= set(body["steps_ms"])
+    assert body["import_ms"] is not None and body["warmup_ms"] is not None
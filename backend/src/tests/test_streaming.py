@@ -0,0 +1,50 @@
+import json
+
+from backend.src.app.agents.streaming import JsonFieldStream, PATHWAY_FIELDS
+
+
+def test_fields_are_emitted_as_soon_as_complete():
+    doc = {
+        "career_goal": "Registered \"RN\" Nurse",
+        "pathway_data": {
+            "mdc_phase": {"degree_name": "ASN", "courses": [{"code": "NUR1023", "credits": 3}],
+                          "total_cost": 1.5e3, "online": True, "notes": None},
+            "fiu_phase": {"required_courses": [1, 2, {"name": "}{"}]},
+            "advanced_phase": {"masters": {"total_credits": 36}},
+            "total_summary": {"total_years": 6},
+        },
+    }
+    text = json.dumps(doc, indent=2)
+    stream = JsonFieldStream()
+    got = []
+    for i in range(0, len(text), 7):
+        for path, value in stream.feed(text[i:i + 7]):
+            got.append((path, value, i))
+
+    assert [g[0] for g in got] == list(PATHWAY_FIELDS)
+    assert got[0][1] == doc["career_goal"]
+    assert got[1][1] == doc["pathway_data"]["mdc_phase"]
+    # mdc_phase is available well before the document is complete
+    assert got[1][2] < text.index('"fiu_phase"')
+
+
+def test_invoke_llm_stream_sends_the_goal_heuristic_before_the_answer(monkeypatch):
+    import os
+    from fastapi.testclient import TestClient
+    from backend.src.app import main
+    from backend.src.app.agents.llm_cache import LLMCache
+    from backend.src.app.agents.registry import invoke_llm_prompt
+
+    prompt = "I want to be a software engineer"
+    answer = {"career_goal": "Software Engineer", "pathway_data": {"mdc_phase": {"degree_name": "AS"}}}
+    cache = LLMCache()
+    cache.set("invoke_llm", prompt, invoke_llm_prompt(os.path.abspath("data/seed")).seed, answer)
+    monkeypatch.setattr(main, "LLM_CACHE", cache)
+
+    body = TestClient(main.app).post("/api/invoke_llm/stream", json={"prompt": prompt}).text
+    frames = [f.split("\n") for f in body.strip().split("\n\n")]
+    events = [(e[len("event: "):], json.loads(d[len("data: "):])) for e, d in frames]
+    assert [e for e, _ in events] == ["start", "heuristic", "field", "field", "done"]
+    heuristic = events[1][1]
+    assert heuristic["goal"] == "Software Engineer" and len(heuristic["recommendations"]) == 3
+    assert events[-1][1] == answer
@@ -0,0 +1,39 @@
+import re
+
+from backend.src.app.util.files import load_programs
+from backend.src.app.util.tagging import KeywordTagger, keyword_pattern
+from backend.src.app.util.validate import PROGRAM_HINTS, PROGRAM_HINTS_PATTERN
+
+
+def test_tagger_finds_overlapping_keywords():
+    rules = [(["bi"], "data"), (["biolog", "biotech"], "biotech"), (["cyber", "security"], "cyber"),
+             (["net", "network"], "net"), (["work"], "work")]
+    tagger = KeywordTagger(rules)
+    texts = ["biology and networks", "cybersecurity", "bio", "teamwork", "", "b i o"]
+    for text in texts:
+        expected = {tag for words, tag in rules if re.search("|".join(words), text)}
+        assert tagger.tags(text) == expected
+
+
+def test_program_hints_pattern_matches_the_loop():
+    names = [p.name.lower() for p in load_programs("programs_mdc.csv")]
+    names += ["early childhood education", "web", "webinar", "human  services", "fire science"]
+    for name in names:
+        expected = any(f" {kw} " in f" {name} " for kw in PROGRAM_HINTS)
+        assert (PROGRAM_HINTS_PATTERN.search(name) is not None) == expected
+
+
+def test_bounded_keyword_pattern():
+    p = keyword_pattern(["art", "art history"], bounded=True)
+    assert p.search("the art history of")
+    assert p.search("art")
+    assert not p.search("smart arts")
+
+
+def test_first_rule_wins_and_bounded_words_need_word_edges():
+    tagger = KeywordTagger([(["as"], "AS"), (["bas"], "BAS"), (["cert"], "CERT")], bounded=["as"])
+    assert tagger.first("basic cert") == "BAS"
+    assert tagger.first("as in nursing, bas") == "AS"
+    assert tagger.first("such as cert") == "AS"
+    assert tagger.first("assume") is None
+    assert tagger.tags("as-cert") == {"AS", "CERT"}
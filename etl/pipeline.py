@@ -0,0 +1,118 @@
+# etl/pipeline.py
+"""
+End-to-end ETL in one streaming pass:
+
+    catalog PDF(s) → blocks → records → CSV rows → goal mappings
+    (parse_catalog)          (normalize_programs)  (emit_seeds)
+
+Every stage is a generator, so blocks, records and rows are handled one at a
+time. Only the dedup keys, the goal keyword index (ids and positions) and the
+mappings are held in memory. The outputs are identical to running
+parse_catalog, normalize_programs and emit_seeds one after another.
+
+    python etl/pipeline.py data/raw/mdc_catalog_2025.pdf [more.pdf|exports.jsonl ...] \\
+        --goals data/seed/career_goals.json --workers 0
+"""
+import argparse, json, os, sys
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# the stage scripts import their siblings as top-level modules
+ETL_DIR = Path(__file__).resolve().parent
+for sub in ("scraper", "transform"):
+    if str(ETL_DIR / sub) not in sys.path:
+        sys.path.insert(0, str(ETL_DIR / sub))
+
+from normalize_programs import normalize_records, dedupe_rows, tee_csv, export_digest, write_stamp
+from emit_seeds import load_goals, build_mappings, write_mappings
+from snapshot import write_programs_snapshot, write_mappings_snapshot
+
+
+def pdf_records(pdf_path: str, workers: int = 1) -> Iterator[dict]:
+    import fitz  # PyMuPDF, only needed for PDF inputs
+    from parse_catalog import iter_pages, iter_blocks, iter_records
+
+    with fitz.open(pdf_path) as doc:
+        yield from iter_records(iter_blocks(iter_pages(doc, pdf_path, workers)))
+
+
+def jsonl_records(path: str) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def catalog_records(inputs: Iterable[str], workers: int = 1) -> Iterator[dict]:
+    """Records of each input in turn: catalog PDFs are parsed, .jsonl exports are read as is."""
+    for path in inputs:
+        if path.endswith(".jsonl"):
+            yield from jsonl_records(path)
+        else:
+            yield from pdf_records(path, workers)
+
+
+def tee_jsonl(records: Iterable[dict], path: str) -> Iterator[dict]:
+    # the catalog_programs.jsonl export, written as the records stream past
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            yield rec
+
+
+def counted(items: Iterable[dict], counts: dict, key: str) -> Iterator[dict]:
+    for item in items:
+        counts[key] += 1
+        yield item
+
+
+def run(inputs, goals_path, programs_out, map_out, jsonl_out=None, workers=1, snapshot_out=None,
+        top_n=None) -> dict:
+    counts = {"records": 0, "kept": 0, "dropped": 0, "programs": 0}
+    goals = load_goals(Path(goals_path))
+
+    records = counted(catalog_records(inputs, workers), counts, "records")
+    if jsonl_out:
+        records = tee_jsonl(records, jsonl_out)
+    rows = dedupe_rows(normalize_records(records, counts))
+
+    # the CSV is written while the same rows feed the mapping stage; both files
+    # replace the previous ones only after the whole stream went through
+    csv_tmp = f"{programs_out}.tmp"
+    mappings = build_mappings(counted(tee_csv(rows, csv_tmp), counts, "programs"), goals, top_n)
+    # same stamp as normalize_programs, so a later normalize_programs --diff can trust the CSV
+    write_stamp(programs_out, None)
+    os.replace(csv_tmp, programs_out)
+    write_stamp(programs_out, export_digest(jsonl_out) if jsonl_out else None)
+    write_mappings(mappings, map_out)
+    counts["mappings"] = len(mappings)
+
+    if snapshot_out:
+        write_programs_snapshot(programs_out, snapshot_out)
+        write_mappings_snapshot(map_out, snapshot_out)
+    return counts
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="parse → normalize → tag → emit in one streaming pass")
+    ap.add_argument("inputs", nargs="+", help="catalog PDFs and/or catalog_programs.jsonl exports, in order")
+    ap.add_argument("--goals", default="data/seed/career_goals.json")
+    ap.add_argument("--programs-out", default="data/seed/programs_mdc.csv")
+    ap.add_argument("--map-out", default="data/seed/goal_program_map_mdc.json")
+    ap.add_argument("--jsonl-out", default=None, help="also write the parsed records (catalog_programs.jsonl)")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="processes for PDF page extraction (0 = one per CPU)")
+    ap.add_argument("--snapshot-out", default=None,
+                    help="also write the binary seed snapshot here (e.g. data/seed/snapshot)")
+    ap.add_argument("--top-n", type=int, default=None, help="keep only the N best-fitting programs per goal")
+    args = ap.parse_args(argv)
+
+    counts = run(args.inputs, args.goals, args.programs_out, args.map_out, args.jsonl_out,
+                 args.workers or os.cpu_count() or 1, args.snapshot_out, args.top_n)
+    print(f"{counts['records']} records (kept={counts['kept']}, dropped={counts['dropped']}) → "
+          f"{counts['programs']} programs → {args.programs_out}; "
+          f"{counts['mappings']} mappings → {args.map_out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 # etl/scraper/parse_catalog.py
-import json, re, sys, argparse, hashlib
+import json, os, re, sys, argparse, hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Collection, Iterable, Iterator, Tuple
 from unidecode import unidecode
 import fitz  # PyMuPDF
 from tqdm import tqdm
@@ -27,25 +28,66 @@ def is_likely_program_title(line: str) -> bool:
     # Many MDC program titles contain the award nearby; we also allow strong-cased lines.
     return bool(AWARD_PAT.search(line)) and len(line) <= 140
 
-def extract_blocks(doc) -> List[Dict[str, Any]]:
+def clean_lines(raw: str) -> List[str]:
+    # Order the text lines top→bottom; blank lines never matter to the block scan
+    lines = (clean_text(b) for b in raw.split('\n'))
+    return [line for line in lines if line]
+
+def page_lines(page) -> List[str]:
+    return clean_lines(page.get_text("text"))
+
+def read_page(page, known: Collection[str] = ()) -> Tuple[str, List[str] | None]:
+    """(text hash, cleaned lines); lines is None when the hash is in known (cached)."""
+    raw = page.get_text("text")
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return digest, None if digest in known else clean_lines(raw)
+
+def _extract_page_range(job) -> List[Tuple[int, str, List[str] | None]]:
+    # Pool worker: its own document handle, pages [start, stop)
+    pdf_path, start, stop, known = job
+    with fitz.open(pdf_path) as doc:
+        return [(i, *read_page(doc.load_page(i), known)) for i in range(start, stop)]
+
+def page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    # A few contiguous chunks per worker so a slow chunk doesn't idle the others
+    size = max(1, -(-page_count // (workers * 4)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+def _read_pages(doc, pdf_path: str | None, workers: int, known: Collection[str]):
+    if workers <= 1 or not pdf_path or len(doc) < 2:
+        for page_index in range(len(doc)):
+            yield (page_index, *read_page(doc.load_page(page_index), known))
+        return
+    jobs = [(pdf_path, start, stop, known) for start, stop in page_ranges(len(doc), workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields chunks in submission order, so the stitching below sees the same sequence
+        for chunk in pool.map(_extract_page_range, jobs):
+            yield from chunk
+
+def iter_pages(doc, pdf_path: str | None = None, workers: int = 1,
+               cache: "ParseCache | None" = None) -> Iterator[Tuple[int, List[str]]]:
+    """
+    (page_index, lines) in page order; with workers > 1 pages are extracted by a process pool.
+    With a cache, pages whose text hash is known reuse the cleaned lines of the last run.
+    """
+    known = frozenset(cache.pages) if cache else frozenset()
+    for page_index, digest, lines in _read_pages(doc, pdf_path, workers, known):
+        yield page_index, cache.page(digest, lines) if cache else lines
+
+def iter_blocks(pages: Iterable[Tuple[int, List[str]]]) -> Iterator[Dict[str, Any]]:
     """
     Very simple block extractor:
     - Scan sequentially; when we hit a line that looks like a program title, start a new block.
     - Append lines until next title; capture page span.
+    Each block is yielded as soon as the next title closes it.
     """
-    blocks = []
     current = None
-    for page_index in tqdm(range(len(doc)), desc="Scanning pages"):
-        page = doc.load_page(page_index)
-        # Order the text lines top→bottom
-        lines = [clean_text(b) for b in page.get_text("text").split('\n')]
+    for page_index, lines in pages:
         for line in lines:
-            if not line:
-                continue
             if is_likely_program_title(line):
                 # Start a new block
                 if current:
-                    blocks.append(current)
+                    yield current
                 current = {
                     "title": line,
                     "pages": [page_index + 1],  # 1-based
@@ -57,22 +99,35 @@ def extract_blocks(doc) -> List[Dict[str, Any]]:
                     current["pages"].append(page_index + 1)
 
     if current:
-        blocks.append(current)
-    return blocks
+        yield current
 
-def parse_program_block(block: Dict[str, Any]) -> Dict[str, Any]:
-    text = "\n".join(block["text"])
-    title = block["title"]
+def stitch_blocks(pages: Iterable[Tuple[int, List[str]]]) -> List[Dict[str, Any]]:
+    return list(iter_blocks(pages))
 
-    # Name + award_level
+def extract_blocks(doc, pdf_path: str | None = None, workers: int = 1,
+                   cache: "ParseCache | None" = None) -> List[Dict[str, Any]]:
+    pages = iter_pages(doc, pdf_path, workers, cache)
+    return stitch_blocks(tqdm(pages, total=len(doc), desc="Scanning pages"))
+
+def name_and_award(title: str, text: str) -> Tuple[str, str]:
+    """Program name and normalised award of a block, as parse_program_block derives them."""
     award_match = AWARD_PAT.search(title) or AWARD_PAT.search(text)
     award_level = award_match.group(1) if award_match else "TBD"
 
     # Program name: remove trailing award terms if inside title
-    name = title
-    name = re.sub(r'\s*(Associate in Science|Associate in Arts|Bachelor|BAS|BS|AAS|Certificate)\s*$', '', name, flags=re.I)
+    name = re.sub(r'\s*(Associate in Science|Associate in Arts|Bachelor|BAS|BS|AAS|Certificate)\s*$', '', title, flags=re.I)
     name = clean_text(name)
 
+    award_norm = award_level.upper()
+    # Normalize common long forms
+    if award_norm == "ASSOCIATE IN SCIENCE": award_norm = "AS"
+    if award_norm == "ASSOCIATE IN ARTS": award_norm = "AA"
+    return name, award_norm
+
+def parse_program_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    text = "\n".join(block["text"])
+    name, award_norm = name_and_award(block["title"], text)
+
     # Credits / tuition / time
     total_credits = None
     m = CREDITS_PAT.search(text)
@@ -126,11 +181,6 @@ def parse_program_block(block: Dict[str, Any]) -> Dict[str, Any]:
             if len(key_courses) >= 20:
                 break
 
-    award_norm = award_level.upper()
-    # Normalize common long forms
-    if award_norm == "ASSOCIATE IN SCIENCE": award_norm = "AS"
-    if award_norm == "ASSOCIATE IN ARTS": award_norm = "AA"
-
     pid = stable_program_id(name, award_norm)
 
     return {
@@ -145,33 +195,145 @@ def parse_program_block(block: Dict[str, Any]) -> Dict[str, Any]:
         "page_spans": block["pages"]
     }
 
+def iter_records(blocks: Iterable[Dict[str, Any]], cache: "ParseCache | None" = None) -> Iterator[Dict[str, Any]]:
+    """Parsed records of the blocks that pass the basic sanity check."""
+    for b in blocks:
+        try:
+            record = cache.parse(b) if cache else parse_program_block(b)
+        except Exception as e:
+            # Skip malformed blocks but continue
+            sys.stderr.write(f"[warn] block skipped: {e}\n")
+            continue
+        if record["name"] and record["award_level"]:
+            yield record
+
+CACHE_VERSION = 1
+
+def block_hash(block: Dict[str, Any]) -> str:
+    h = hashlib.sha1(block["title"].encode("utf-8"))
+    for line in block["text"]:
+        h.update(b"\n" + line.encode("utf-8"))
+    return h.hexdigest()
+
+class ParseCache:
+    """
+    State kept between incremental runs: cleaned page lines by page text hash, and
+    parsed records by stable_program_id (one entry per block with that id, by content hash).
+    Only what the current run used is saved, so entries of removed pages/blocks expire.
+    export is the sha256 of the catalog_programs.jsonl the last run wrote: the diff is
+    relative to that file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.pages: Dict[str, List[str]] = {}
+        self.blocks: Dict[str, List[Dict[str, Any]]] = {}
+        self.export: str | None = None
+        if path.exists():
+            state = json.loads(path.read_text(encoding="utf-8"))
+            if state.get("version") == CACHE_VERSION:
+                self.pages, self.blocks = state["pages"], state["blocks"]
+                self.export = state.get("export")
+        self.seen_pages: Dict[str, List[str]] = {}
+        self.seen_blocks: Dict[str, List[Dict[str, Any]]] = {}
+        self.pages_reused = self.blocks_reused = self.blocks_parsed = 0
+
+    def page(self, digest: str, lines: List[str] | None) -> List[str]:
+        if lines is None:
+            lines = self.pages[digest]
+            self.pages_reused += 1
+        self.seen_pages[digest] = lines
+        return lines
+
+    def parse(self, block: Dict[str, Any]) -> Dict[str, Any]:
+        """parse_program_block(block), reused from the last run when the block text is unchanged."""
+        name, award = name_and_award(block["title"], "\n".join(block["text"]))
+        key = str(stable_program_id(name, award))
+        digest = block_hash(block)
+        record = next((e["record"] for e in self.blocks.get(key, ()) if e["hash"] == digest), None)
+        if record is None:
+            record = parse_program_block(block)
+            self.blocks_parsed += 1
+        else:
+            # the text is the same but earlier pages may have moved it
+            record = dict(record, page_spans=block["pages"])
+            self.blocks_reused += 1
+        self.seen_blocks.setdefault(key, []).append({"hash": digest, "record": record})
+        return record
+
+    def diff(self) -> Dict[str, Any]:
+        """Program ids added, removed and changed since the last run."""
+        old = {k: [e["hash"] for e in v] for k, v in self.blocks.items()}
+        new = {k: [e["hash"] for e in v] for k, v in self.seen_blocks.items()}
+        both = new.keys() & old.keys()
+        return {
+            "added": sorted(int(k) for k in new.keys() - old.keys()),
+            "removed": sorted(int(k) for k in old.keys() - new.keys()),
+            "changed": sorted(int(k) for k in both if new[k] != old[k]),
+            "unchanged": sum(1 for k in both if new[k] == old[k]),
+        }
+
+    def save(self, export: str):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "pages": self.seen_pages,
+                                   "blocks": self.seen_blocks, "export": export},
+                                  ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
 def main(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("pdf_path", help="Path to catalog PDF (e.g., data/raw/mdc_catalog_2025.pdf)")
     ap.add_argument("--out", default="data/exports", help="Output directory")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="processes for page text extraction (0 = one per CPU)")
+    ap.add_argument("--incremental", action="store_true",
+                    help="reuse pages and blocks unchanged since the last incremental run, "
+                         "and write catalog_diff.json")
+    ap.add_argument("--cache", default=None, help="incremental cache file (default: <out>/parse_cache.json)")
     args = ap.parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
 
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
     out_jsonl = out_dir / "catalog_programs.jsonl"
 
+    cache = ParseCache(Path(args.cache or out_dir / "parse_cache.json")) if args.incremental else None
+
     doc = fitz.open(args.pdf_path)
-    blocks = extract_blocks(doc)
+    blocks = extract_blocks(doc, args.pdf_path, workers, cache)
 
     count = 0
+    export = hashlib.sha256()
     with open(out_jsonl, "w", encoding="utf-8") as f:
-        for b in tqdm(blocks, desc="Parsing program blocks"):
-            try:
-                record = parse_program_block(b)
-                # basic sanity
-                if record["name"] and record["award_level"]:
-                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
-                    count += 1
-            except Exception as e:
-                # Skip malformed blocks but continue
-                sys.stderr.write(f"[warn] block skipped: {e}\n")
+        for record in iter_records(tqdm(blocks, desc="Parsing program blocks"), cache):
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            f.write(line)
+            export.update(line.encode("utf-8"))
+            count += 1
 
     print(f"Wrote {count} program records → {out_jsonl}")
 
+    if cache:
+        base_export = cache.export
+        cache.save(export.hexdigest())
+        manifest = {
+            "pdf": args.pdf_path,
+            # the diff turns the export hashed base_export into the one hashed export
+            "base_export": base_export,
+            "export": export.hexdigest(),
+            "pages": len(doc),
+            "pages_reused": cache.pages_reused,
+            "blocks": len(blocks),
+            "blocks_parsed": cache.blocks_parsed,
+            "blocks_reused": cache.blocks_reused,
+            **cache.diff(),
+        }
+        diff_path = out_dir / "catalog_diff.json"
+        diff_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        print(f"Reused {cache.pages_reused}/{len(doc)} pages, {cache.blocks_reused}/{len(blocks)} blocks; "
+              f"{len(manifest['added'])} added, {len(manifest['changed'])} changed, "
+              f"{len(manifest['removed'])} removed → {diff_path}")
+
 if __name__ == "__main__":
     main()
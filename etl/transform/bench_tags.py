@@ -0,0 +1,106 @@
+# etl/transform/bench_tags.py
+"""
+Checks the single-scan matchers against the per-pattern loops they replaced,
+then times both on real catalog text.
+
+    python etl/transform/bench_tags.py [--programs data/seed/programs_mdc.csv]
+                                       [--jsonl data/exports/catalog_programs.jsonl] [--repeat 20]
+"""
+import argparse, csv, json, re, sys, time
+from pathlib import Path
+
+# sibling modules are imported top-level, both as a script and under python -m etl.transform.*;
+# the backend package resolves from the repo root
+TRANSFORM_DIR = Path(__file__).resolve().parent
+for path in (TRANSFORM_DIR, TRANSFORM_DIR.parents[1]):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from map_tags import guess_tags, guess_award
+from backend.src.app.util.validate import PROGRAM_HINTS, PROGRAM_HINTS_PATTERN
+
+LEGACY_TAG_PAIRS = [
+    (r'cyber|security', 'cybersecurity'),
+    (r'account', 'accounting'),
+    (r'biolog|biotech', 'biotech'),
+    (r'chem', 'chemistry'),
+    (r'animat|game', 'animation'),
+    (r'archit', 'architecture'),
+    (r'construc', 'construction'),
+    (r'engineer', 'engineering'),
+    (r'data|analytics|sql|bi', 'data'),
+    (r'computer science|cs', 'cs'),
+    (r'ai|machine learning|nlp|vision', 'ai'),
+    (r'network', 'network'),
+    (r'business', 'business'),
+    (r'nurs', 'nursing'),
+    (r'aviation', 'aviation')
+]
+
+def legacy_guess_tags(name: str, overview: str) -> str:
+    txt = f"{name} {overview}".lower()
+    tags = set()
+    for pat, tg in LEGACY_TAG_PAIRS:
+        if re.search(pat, txt): tags.add(tg)
+    return ";".join(sorted(tags)) if tags else ""
+
+def legacy_guess_award(name: str, award_level: str | None) -> str:
+    s = f"{name} {award_level or ''}".lower()
+    if "associate in science" in s or re.search(r"\bA\.?S\.?\b", s, re.I): return "AS"
+    if "associate in arts"   in s or re.search(r"\bA\.?A\.?\b", s, re.I): return "AA"
+    if "bachelor of applied" in s or "bas" in s: return "BAS"
+    if re.search(r"\bbachelor\b|\bB\.?S\.?\b|\bB\.?A\.?\b", s, re.I): return "BS"
+    if "certificate" in s: return "CERTIFICATE"
+    return (award_level or "TBD").upper()
+
+def legacy_has_hint(name: str) -> bool:
+    nm = " " + name.lower() + " "
+    return any(f" {kw} " in nm for kw in PROGRAM_HINTS)
+
+def has_hint(name: str) -> bool:
+    return PROGRAM_HINTS_PATTERN.search(name.lower()) is not None
+
+def load_samples(programs_csv: str, jsonl: str | None):
+    """(name, overview, award level) triples: the seed CSV plus the raw parser export if given."""
+    out = []
+    with open(programs_csv, newline="", encoding="utf-8") as f:
+        out += [(r["name"], r["description"], r["award_level"]) for r in csv.DictReader(f)]
+    if jsonl and Path(jsonl).exists():
+        with open(jsonl, encoding="utf-8") as f:
+            for line in f:
+                rec = json.loads(line)
+                out.append((rec.get("name") or "", rec.get("overview") or "", rec.get("award_level")))
+    return out
+
+def timed(fn, args_list, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for args in args_list:
+            fn(*args)
+    return (time.perf_counter() - t0) / (repeat * len(args_list)) * 1e6
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--programs", default="data/seed/programs_mdc.csv")
+    ap.add_argument("--jsonl", default="data/exports/catalog_programs.jsonl")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    samples = load_samples(args.programs, args.jsonl)
+    cases = [
+        ("guess_tags", legacy_guess_tags, guess_tags, [(n, o) for n, o, _ in samples]),
+        ("guess_award", legacy_guess_award, guess_award, [(n, a) for n, _, a in samples]),
+        ("program hints", legacy_has_hint, has_hint, [(n,) for n, _, _ in samples]),
+    ]
+
+    print(f"{len(samples)} catalog programs, {args.repeat} rounds")
+    for label, old, new, args_list in cases:
+        mismatches = [a for a in args_list if old(*a) != new(*a)]
+        if mismatches:
+            sys.exit(f"{label}: {len(mismatches)} results differ, e.g. {mismatches[0]!r}")
+        t_old = timed(old, args_list, args.repeat)
+        t_new = timed(new, args_list, args.repeat)
+        print(f"{label:14s} loop {t_old:7.2f} us   single scan {t_new:7.2f} us   x{t_old / t_new:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 # etl/transform/emit_seeds.py
-import json, argparse, csv, re
+import json, argparse, csv, re, sys
 from pathlib import Path
 from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List
+
+# sibling modules are imported top-level, both as a script and under python -m etl.transform.*
+TRANSFORM_DIR = Path(__file__).resolve().parent
+if str(TRANSFORM_DIR) not in sys.path:
+    sys.path.insert(0, str(TRANSFORM_DIR))
+
+from snapshot import write_programs_snapshot, write_mappings_snapshot
 
 GOAL_TAG_MAP = {
     1:  ["cs","software","programming","web","frontend"],  # Software Engineer
@@ -33,60 +41,101 @@ def load_goals(path: Path):
     with open(path, "r", encoding="utf-8") as f:
         return {g["id"]: g["name"] for g in json.load(f)}
 
-def main(argv=None):
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--programs", required=True, help="data/seed/programs_mdc.csv")
-    ap.add_argument("--goals", required=True, help="data/seed/career_goals.json")
-    ap.add_argument("--map-out", default="data/seed/goal_program_map_mdc.json")
-    args = ap.parse_args(argv)
+def read_programs(path) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
 
-    goals = load_goals(Path(args.goals))
+# small boost: award alignment (AA for transfer-y, AS for applied)
+AA_GOALS = (1,17,19,20,21,22)
+APPLIED_GOALS = (2,6,7,8,9,10,11,12)
+APPLIED_AWARDS = ("AS","AAS","BAS")
+
+class ProgramIndex:
+    """
+    Program positions by goal keyword and by award level. A keyword matches a program
+    when it is a substring of its lowercased tags string (as the old per-program test);
+    each distinct tags string is tested once per keyword.
+    """
 
-    # Load programs
-    programs = []
-    with open(args.programs, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            row["tags"] = (row.get("tags") or "").lower()
-            row["name"] = (row.get("name") or "")
-            row["award_level"] = (row.get("award_level") or "")
-            programs.append(row)
+    def __init__(self, programs: Iterable[dict], keywords: Iterable[str]):
+        self.ids: List[int] = []
+        by_tags: Dict[str, List[int]] = defaultdict(list)
+        self.by_award: Dict[str, List[int]] = defaultdict(list)
+        for pos, p in enumerate(programs):
+            self.ids.append(int(p["id"]))
+            by_tags[(p.get("tags") or "").lower()].append(pos)
+            self.by_award[p.get("award_level") or ""].append(pos)
+        self.by_keyword: Dict[str, List[int]] = {
+            t: [pos for tags, ps in by_tags.items() if t in tags for pos in ps]
+            for t in set(keywords) if t
+        }
 
-    # First-pass mapping by tag match
-    mappings = []
+    def goal_scores(self, goal_id: int) -> Dict[int, int]:
+        """Tag-match + award score by program position, for the programs scoring above 0."""
+        scores: Dict[int, int] = defaultdict(int)
+        for t in GOAL_TAG_MAP.get(goal_id, []):
+            for pos in self.by_keyword.get(t, ()):
+                scores[pos] += 1
+        boosted = ("AA",) if goal_id in AA_GOALS else ()
+        boosted += APPLIED_AWARDS if goal_id in APPLIED_GOALS else ()
+        for award in boosted:
+            for pos in self.by_award.get(award, ()):
+                scores[pos] += 1
+        return scores
+
+def build_mappings(programs: Iterable[dict], goals: Dict[int, str], top_n: int | None = None) -> List[dict]:
+    """
+    Mappings goal by goal, programs in catalog order, driven by the keyword index.
+    Deduplicated inline by (goal_id, program_id), keeping the highest fit at the first
+    position. With top_n, only the top_n best-fitting programs of each goal are kept.
+    """
+    index = ProgramIndex(programs, (t for tags in GOAL_TAG_MAP.values() for t in tags))
+    out = []
     for goal_id, goal_name in goals.items():
         tag_list = GOAL_TAG_MAP.get(goal_id, [])
-        for p in programs:
-            score = 0
-            for t in tag_list:
-                if t and t in p["tags"]:
-                    score += 1
-            # small boost: award alignment (AA for transfer-y, AS for applied)
-            if goal_id in (1,17,19,20,21,22) and p["award_level"] == "AA":
-                score += 1
-            if goal_id in (2,6,7,8,9,10,11,12) and p["award_level"] in ("AS","AAS","BAS"):
-                score += 1
+        rationale = f"Tag match for goal '{goal_name}' ({', '.join(tag_list)}) and award alignment."
+        best: Dict[int, dict] = {}
+        scores = index.goal_scores(goal_id)
+        for pos in sorted(scores):
+            pid = index.ids[pos]
+            fit = min(5, 2 + scores[pos])  # default scaling
+            cur = best.get(pid)
+            if cur is None:
+                best[pid] = {"goal_id": goal_id, "program_id": pid, "fit_strength": fit, "rationale": rationale}
+            elif fit > cur["fit_strength"]:
+                cur["fit_strength"] = fit
+        mappings = list(best.values())
+        if top_n is not None and len(mappings) > top_n:
+            keep = {m["program_id"] for m in sorted(mappings, key=lambda m: -m["fit_strength"])[:top_n]}
+            mappings = [m for m in mappings if m["program_id"] in keep]
+        out.extend(mappings)
+    return out
 
-            if score > 0:
-                mappings.append({
-                    "goal_id": goal_id,
-                    "program_id": int(p["id"]),
-                    "fit_strength": min(5, 2 + score),  # default scaling
-                    "rationale": f"Tag match for goal '{goal_name}' ({', '.join(tag_list)}) and award alignment."
-                })
+def write_mappings(mappings: List[dict], path) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(mappings, f, ensure_ascii=False, indent=2)
 
-    # Deduplicate by (goal_id, program_id) keeping highest fit
-    best = {}
-    for m in mappings:
-        k = (m["goal_id"], m["program_id"])
-        if k not in best or m["fit_strength"] > best[k]["fit_strength"]:
-            best[k] = m
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--programs", required=True, help="data/seed/programs_mdc.csv")
+    ap.add_argument("--goals", required=True, help="data/seed/career_goals.json")
+    ap.add_argument("--map-out", default="data/seed/goal_program_map_mdc.json")
+    ap.add_argument("--snapshot-out", default=None,
+                    help="also write the binary seed snapshot here (e.g. data/seed/snapshot)")
+    ap.add_argument("--top-n", type=int, default=None,
+                    help="keep only the N best-fitting programs per goal (ties: catalog order)")
+    args = ap.parse_args(argv)
 
-    out = list(best.values())
-    Path(args.map_out).parent.mkdir(parents=True, exist_ok=True)
-    with open(args.map_out, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
+    goals = load_goals(Path(args.goals))
+    out = build_mappings(read_programs(args.programs), goals, args.top_n)
+    write_mappings(out, args.map_out)
     print(f"Wrote {len(out)} mappings → {args.map_out}")
 
+    if args.snapshot_out:
+        write_programs_snapshot(args.programs, args.snapshot_out)
+        write_mappings_snapshot(args.map_out, args.snapshot_out)
+        print(f"Wrote snapshot → {args.snapshot_out}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,62 @@
+# etl/transform/map_tags.py
+"""
+Tag rules of the ETL, compiled once into a single-scan matcher
+(backend/src/app/util/tagging.py, also used by the backend validator).
+
+guess_tags and guess_award return exactly what the per-pattern re.search
+chains returned; bench_tags.py checks that on the catalog and times both.
+"""
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.src.app.util.tagging import KeywordTagger
+
+# (keywords, tag): a tag applies when any keyword occurs in name + overview (lowercased)
+TAG_RULES = [
+    (["cyber", "security"], "cybersecurity"),
+    (["account"], "accounting"),
+    (["biolog", "biotech"], "biotech"),
+    (["chem"], "chemistry"),
+    (["animat", "game"], "animation"),
+    (["archit"], "architecture"),
+    (["construc"], "construction"),
+    (["engineer"], "engineering"),
+    (["data", "analytics", "sql", "bi"], "data"),
+    (["computer science", "cs"], "cs"),
+    (["ai", "machine learning", "nlp", "vision"], "ai"),
+    (["network"], "network"),
+    (["business"], "business"),
+    (["nurs"], "nursing"),
+    (["aviation"], "aviation"),
+]
+
+TAGGER = KeywordTagger(TAG_RULES)
+
+
+def guess_tags(name: str, overview: str) -> str:
+    tags = TAGGER.tags(f"{name} {overview}".lower())
+    return ";".join(sorted(tags)) if tags else ""
+
+
+# (keywords, award) in priority order: the first rule with a keyword in name + award wins.
+# r"\bA\.?S\.?\b" and friends are the whole words "as"/"a.s" etc. (a trailing dot never
+# changes whether they match), so every rule is a set of literals.
+AWARD_RULES = [
+    (["associate in science", "as", "a.s"], "AS"),
+    (["associate in arts", "aa", "a.a"], "AA"),
+    (["bachelor of applied", "bas"], "BAS"),
+    (["bachelor", "bs", "b.s", "ba", "b.a"], "BS"),
+    (["certificate"], "CERTIFICATE"),
+]
+AWARD_WHOLE_WORDS = ["as", "a.s", "aa", "a.a", "bachelor", "bs", "b.s", "ba", "b.a"]
+
+AWARD_TAGGER = KeywordTagger(AWARD_RULES, bounded=AWARD_WHOLE_WORDS)
+
+
+def guess_award(name: str, award_level: str | None) -> str:
+    award = AWARD_TAGGER.first(f"{name} {award_level or ''}".lower())
+    return award or (award_level or "TBD").upper()
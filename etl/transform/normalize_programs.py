@@ -1,23 +1,22 @@
-import json, sys, argparse, re, hashlib
+import csv, json, os, sys, argparse, re, hashlib
 from pathlib import Path
-import pandas as pd
+from typing import Iterable, Iterator
 from unidecode import unidecode
 
+# sibling modules are imported top-level, both as a script and under python -m etl.transform.*
+TRANSFORM_DIR = Path(__file__).resolve().parent
+if str(TRANSFORM_DIR) not in sys.path:
+    sys.path.insert(0, str(TRANSFORM_DIR))
+
+from snapshot import write_programs_snapshot
+from map_tags import guess_tags, guess_award
+
 STOP_PHRASES = re.compile(
     r"(prior to the award|prior to receipt|students entering a florida college system|"
     r"general education|graduation requirements|admission requirements|academic policies|"
     r"rights? and responsibilities|tuition and fees|financial aid)", re.I
 )
 
-def guess_award(name: str, award_level: str | None) -> str:
-    s = f"{name} {award_level or ''}".lower()
-    if "associate in science" in s or re.search(r"\bA\.?S\.?\b", s, re.I): return "AS"
-    if "associate in arts"   in s or re.search(r"\bA\.?A\.?\b", s, re.I): return "AA"
-    if "bachelor of applied" in s or "bas" in s: return "BAS"
-    if re.search(r"\bbachelor\b|\bB\.?S\.?\b|\bB\.?A\.?\b", s, re.I): return "BS"
-    if "certificate" in s: return "CERTIFICATE"
-    return (award_level or "TBD").upper()
-
 def default_credits_for_award(award: str) -> int:
     if award in {"AA","AS"}: return 60
     if award in {"BAS","BS"}: return 120
@@ -35,96 +34,172 @@ def looks_like_program_title(name: str) -> bool:
     # require at least one word >= 3 letters
     return bool(re.search(r"[A-Za-z]{3,}", n))
 
-def guess_tags(name: str, overview: str) -> str:
-    txt = f"{name} {overview}".lower()
-    tags = set()
-    pairs = [
-        (r'cyber|security', 'cybersecurity'),
-        (r'account', 'accounting'),
-        (r'biolog|biotech', 'biotech'),
-        (r'chem', 'chemistry'),
-        (r'animat|game', 'animation'),
-        (r'archit', 'architecture'),
-        (r'construc', 'construction'),
-        (r'engineer', 'engineering'),
-        (r'data|analytics|sql|bi', 'data'),
-        (r'computer science|cs', 'cs'),
-        (r'ai|machine learning|nlp|vision', 'ai'),
-        (r'network', 'network'),
-        (r'business', 'business'),
-        (r'nurs', 'nursing'),
-        (r'aviation', 'aviation')
-    ]
-    for pat, tg in pairs:
-        if re.search(pat, txt): tags.add(tg)
-    return ";".join(sorted(tags)) if tags else ""
-
 def stable_program_id(name: str, award: str) -> int:
     base = f"{name}|{award}".lower().strip()
     h = hashlib.md5(base.encode("utf-8")).hexdigest()
     return int(h[:7], 16) % 900000 + 10000
 
+CSV_COLUMNS = ["id","name","award_level","total_credits","delivery_mode","campuses","url","tags","description"]
+
+def normalize_record(rec: dict) -> dict | None:
+    """One catalog_programs.jsonl record as a programs_mdc.csv row, or None to drop it."""
+    name = clean_text(rec.get("name", ""))
+    if not looks_like_program_title(name):
+        return None
+
+    award_raw = rec.get("award_level")
+    award = guess_award(name, award_raw)
+
+    # normalize credits with defaults if missing/zero
+    total_credits = rec.get("total_credits")
+    try:
+        cr = int(total_credits) if total_credits is not None else 0
+    except Exception:
+        cr = 0
+    if cr <= 0:
+        cr = default_credits_for_award(award)
+
+    overview = clean_text(rec.get("overview", ""))
+
+    # keep only known awards to avoid policy blurbs
+    if award not in {"AA","AS","AAS","BAS","BS","CERTIFICATE"}:
+        return None
+
+    pid = rec.get("program_id")
+    if not isinstance(pid, int):
+        pid = stable_program_id(name, award)
+
+    return {
+        "id": pid,
+        "name": name,
+        "award_level": award,
+        "total_credits": cr,
+        "delivery_mode": "TBD",
+        "campuses": "TBD",
+        "url": "TBD",
+        "tags": guess_tags(name, overview),
+        "description": overview[:500]
+    }
+
+def export_digest(jsonl_path: str) -> str:
+    """sha256 of a catalog_programs.jsonl export, as parse_catalog records it in catalog_diff.json."""
+    h = hashlib.sha256()
+    with open(jsonl_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def stamp_path(csv_path: str) -> Path:
+    # programs_mdc.csv.export holds the export_digest of the JSONL the CSV was normalised from
+    return Path(f"{csv_path}.export")
+
+def read_stamp(csv_path: str) -> str | None:
+    p = stamp_path(csv_path)
+    return p.read_text(encoding="utf-8").strip() if p.exists() else None
+
+def write_stamp(csv_path: str, export: str | None):
+    """Record which export csv_path was built from; None (unknown) removes the stamp."""
+    p = stamp_path(csv_path)
+    if export is None:
+        p.unlink(missing_ok=True)
+    else:
+        p.write_text(export + "\n", encoding="utf-8")
+
+def load_unchanged_rows(csv_path: str, diff_path: str, export: str) -> dict:
+    """
+    Rows of the existing CSV whose program id parse_catalog --incremental reported as
+    unchanged (catalog_diff.json). Every record with one program id shares the name and
+    award, so reusing the row is the same as normalising the record again.
+
+    The diff is relative to the previous parse run, so rows are only reused when the CSV
+    was normalised from that run's export (its stamp) and export, the digest of the JSONL
+    being normalised, is the one the diff describes. Otherwise nothing is reused.
+    """
+    if not Path(csv_path).exists():
+        return {}
+    with open(diff_path, "r", encoding="utf-8") as f:
+        diff = json.load(f)
+    if diff.get("export") != export:
+        print(f"{diff_path} does not describe this export; normalising every record", file=sys.stderr)
+        return {}
+    if diff.get("base_export") is None or read_stamp(csv_path) != diff["base_export"]:
+        print(f"{csv_path} was not normalised from the export {diff_path} is relative to; "
+              f"normalising every record", file=sys.stderr)
+        return {}
+    stale = {str(pid) for pid in diff["added"] + diff["changed"]}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        return {row["id"]: row for row in csv.DictReader(f) if row["id"] not in stale}
+
+def normalize_records(records: Iterable[dict], counts: dict | None = None,
+                      unchanged: dict | None = None) -> Iterator[dict]:
+    """Rows of the records that are kept; unchanged rows (see load_unchanged_rows) are reused as is."""
+    for rec in records:
+        pid = rec.get("program_id")
+        row = unchanged.get(str(pid)) if unchanged and isinstance(pid, int) else None
+        if row is not None:
+            if counts is not None:
+                counts["reused"] += 1
+        else:
+            row = normalize_record(rec)
+        if counts is not None:
+            counts["kept" if row is not None else "dropped"] += 1
+        if row is not None:
+            yield row
+
+def dedupe_rows(rows: Iterable[dict]) -> Iterator[dict]:
+    # first row per id wins (as DataFrame.drop_duplicates(subset=["id"]))
+    seen = set()
+    for row in rows:
+        key = str(row["id"])
+        if key not in seen:
+            seen.add(key)
+            yield row
+
+def tee_csv(rows: Iterable[dict], path: str) -> Iterator[dict]:
+    """Write rows to path in the programs_mdc.csv layout while passing them on."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=CSV_COLUMNS, lineterminator="\n")
+        w.writeheader()
+        for row in rows:
+            w.writerow(row)
+            yield row
+
+def write_csv(rows: Iterable[dict], path: str) -> int:
+    """Stream rows to path; returns the row count."""
+    return sum(1 for _ in tee_csv(rows, path))
+
 def main(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("jsonl_path", help="data/exports/catalog_programs.jsonl")
     ap.add_argument("--out", default="data/seed/programs_mdc.csv")
+    ap.add_argument("--snapshot-out", default=None,
+                    help="also write the programs part of the binary seed snapshot here")
+    ap.add_argument("--diff", default=None,
+                    help="catalog_diff.json from parse_catalog --incremental: keep the rows of --out "
+                         "for unchanged programs and only normalise the rest (when --out was built "
+                         "from the export the diff is relative to)")
     args = ap.parse_args(argv)
 
-    rows = []
-    kept = 0
-    dropped = 0
+    export = export_digest(args.jsonl_path)
+    unchanged = load_unchanged_rows(args.out, args.diff, export) if args.diff else {}
+    counts = {"kept": 0, "dropped": 0, "reused": 0}
 
+    # written to a temporary file: with --diff the rows are read from --out
+    tmp = f"{args.out}.tmp"
     with open(args.jsonl_path, "r", encoding="utf-8") as f:
-        for line in f:
-            rec = json.loads(line)
-            name = clean_text(rec.get("name", ""))
-            if not looks_like_program_title(name):
-                dropped += 1
-                continue
-
-            award_raw = rec.get("award_level")
-            award = guess_award(name, award_raw)
-
-            # normalize credits with defaults if missing/zero
-            total_credits = rec.get("total_credits")
-            try:
-                cr = int(total_credits) if total_credits is not None else 0
-            except Exception:
-                cr = 0
-            if cr <= 0:
-                cr = default_credits_for_award(award)
-
-            overview = clean_text(rec.get("overview", ""))
-
-            # keep only known awards to avoid policy blurbs
-            if award not in {"AA","AS","AAS","BAS","BS","CERTIFICATE"}:
-                dropped += 1
-                continue
-
-            pid = rec.get("program_id")
-            if not isinstance(pid, int):
-                pid = stable_program_id(name, award)
-
-            rows.append({
-                "id": pid,
-                "name": name,
-                "award_level": award,
-                "total_credits": cr,
-                "delivery_mode": "TBD",
-                "campuses": "TBD",
-                "url": "TBD",
-                "tags": guess_tags(name, overview),
-                "description": overview[:500]
-            })
-            kept += 1
-
-    df = pd.DataFrame(rows, columns=[
-        "id","name","award_level","total_credits","delivery_mode","campuses","url","tags","description"
-    ]).drop_duplicates(subset=["id"])
-
-    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(args.out, index=False)
-    print(f"Wrote {len(df)} rows → {args.out} (kept={kept}, dropped={dropped})")
+        records = (json.loads(line) for line in f)
+        written = write_csv(dedupe_rows(normalize_records(records, counts, unchanged)), tmp)
+    # the stamp goes first so a crash in between never pairs it with the wrong CSV
+    write_stamp(args.out, None)
+    os.replace(tmp, args.out)
+    write_stamp(args.out, export)
+    print(f"Wrote {written} rows → {args.out} (kept={counts['kept']}, dropped={counts['dropped']}, "
+          f"reused={counts['reused']})")
+
+    if args.snapshot_out:
+        write_programs_snapshot(args.out, args.snapshot_out)
+        print(f"Wrote snapshot → {args.snapshot_out}")
 
 if __name__ == "__main__":
     main()
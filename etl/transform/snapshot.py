@@ -0,0 +1,116 @@
+# etl/transform/snapshot.py
+"""
+Binary seed snapshot: numpy .npy columns + a string table per seed file, which
+the backend memory-maps instead of parsing the CSV/JSON (reader and layout:
+backend/src/app/util/snapshot.py).
+
+Each write uses new file names (source stem + digest prefix) and swaps
+manifest.json last, so running workers that still map the previous generation
+are never overwritten underneath.
+"""
+import csv, hashlib, io, json, os
+from pathlib import Path
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+PROGRAM_TEXT_COLUMNS = ("name", "award_level", "delivery_mode", "campuses", "url", "tags", "description")
+
+
+class StringTable:
+    """utf-8 blob + [start, end) spans; each distinct string is stored once."""
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.spans = {}
+
+    def add(self, s: str):
+        span = self.spans.get(s)
+        if span is None:
+            b = s.encode("utf-8")
+            span = self.spans[s] = (len(self.buf), len(self.buf) + len(b))
+            self.buf += b
+        return span
+
+    def spans_of(self, values) -> np.ndarray:
+        return np.array([self.add(v) for v in values], dtype=np.int64).reshape(-1, 2)
+
+    def array(self) -> np.ndarray:
+        return np.frombuffer(bytes(self.buf), dtype=np.uint8)
+
+
+def _write_section(source: Path, raw: bytes, columns, rows: int, out_dir: Path | None):
+    out_dir = Path(out_dir) if out_dir else source.parent / "snapshot"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256(raw).hexdigest()
+    prefix = f"{source.stem}-{digest[:12]}"
+
+    files = {}
+    for col, arr in columns.items():
+        name = f"{prefix}.{col}.npy"
+        np.save(out_dir / name, arr)
+        files[col] = name
+
+    manifest_path = out_dir / "manifest.json"
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    manifest["version"] = SNAPSHOT_VERSION
+    old = manifest.get(source.name)
+    manifest[source.name] = {"sha256": digest, "rows": rows, "files": files}
+    tmp = manifest_path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, manifest_path)
+
+    # Drop the previous generation (processes that still map it keep their pages)
+    if old:
+        for name in set(old.get("files", {}).values()) - set(files.values()):
+            (out_dir / name).unlink(missing_ok=True)
+    return out_dir
+
+
+def write_programs_snapshot(csv_path, out_dir=None) -> Path:
+    """Snapshot of programs_mdc.csv; same parsing rules as the backend's Program.from_row."""
+    source = Path(csv_path)
+    raw = source.read_bytes()
+    ids, credits, text = [], [], {c: [] for c in PROGRAM_TEXT_COLUMNS}
+    with io.StringIO(raw.decode("utf-8"), newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                pid = int(row.get("id"))
+            except Exception:
+                continue
+            try:
+                total = int(row.get("total_credits") or 0)
+            except Exception:
+                total = 0
+            ids.append(pid)
+            credits.append(total)
+            for c in PROGRAM_TEXT_COLUMNS:
+                text[c].append(row.get(c) or "")
+
+    strtab = StringTable()
+    columns = {"id": np.array(ids, dtype=np.int64), "total_credits": np.array(credits, dtype=np.int64)}
+    for c in PROGRAM_TEXT_COLUMNS:
+        columns[c] = strtab.spans_of(text[c])
+    columns["strtab"] = strtab.array()
+    return _write_section(source, raw, columns, len(ids), out_dir)
+
+
+def write_mappings_snapshot(json_path, out_dir=None) -> Path:
+    """Snapshot of goal_program_map_mdc.json as goal/program/fit columns + rationale codes."""
+    source = Path(json_path)
+    raw = source.read_bytes()
+    mappings = json.loads(raw.decode("utf-8"))
+    codes = {}
+    columns = {
+        "goal_id": np.array([int(m.get("goal_id", -1)) for m in mappings], dtype=np.int64),
+        "program_id": np.array([int(m["program_id"]) for m in mappings], dtype=np.int64),
+        "fit_strength": np.array([int(m.get("fit_strength", 3)) for m in mappings], dtype=np.int64),
+        "rationale_idx": np.array([codes.setdefault(m.get("rationale") or "", len(codes)) for m in mappings],
+                                  dtype=np.int32),
+    }
+    strtab = StringTable()
+    columns["rationales"] = strtab.spans_of(list(codes))
+    columns["strtab"] = strtab.array()
+    return _write_section(source, raw, columns, len(mappings), out_dir)
@@ -9,3 +9,41 @@ export async function invokeLLM({ prompt }) {
   console.log("AI response:", data);
   return data;
 }
+
+// Streaming variant of invokeLLM: calls onHeuristic(top3) with the catalog
+// programs for the career goal the prompt names, then onField(path, value) as
+// each pathway section arrives over SSE, and resolves with the full answer.
+export async function streamLLM({ prompt, onHeuristic, onField }) {
+  const res = await fetch("http://localhost:8000/api/invoke_llm/stream", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ prompt }),
+  });
+  if (!res.headers.get("content-type")?.startsWith("text/event-stream")) {
+    return res.json();
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let result = null;
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let sep;
+    while ((sep = buffer.indexOf("\n\n")) !== -1) {
+      const frame = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      const event = frame.match(/^event: (.*)$/m)?.[1];
+      const data = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] ?? "null");
+      if (event === "heuristic" && onHeuristic) onHeuristic(data);
+      else if (event === "field" && onField) onField(data.path, data.value);
+      else if (event === "done") result = data;
+      else if (event === "error") result = data;
+    }
+  }
+  return result;
+}
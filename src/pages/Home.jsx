@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from "react";
-import { invokeLLM } from "@/api/geminiClient";
+import { streamLLM } from "@/api/geminiClient";
 import { Card, CardContent } from "@/components/ui/card";
 import { Sparkles, TrendingUp, Download } from "lucide-react";
 import { motion } from "framer-motion";
@@ -22,6 +22,8 @@ export default function Home() {
   const [isProcessing, setIsProcessing] = useState(false);
   const [exporting, setExporting] = useState(false);
   const [pathway, setPathway] = useState(null);
+  // heuristic top-3 for the goal the prompt names, shown while the pathway streams in
+  const [matches, setMatches] = useState(null);
   const messagesEndRef = useRef(null);
   const pathwayRef = useRef(null);
 
@@ -39,9 +41,22 @@ export default function Home() {
     ];
     setConversation(newConv);
     setIsProcessing(true);
+    setMatches(null);
 
     try {
-      const response = await invokeLLM({ prompt: message });
+      let streamed = null;
+      const response = await streamLLM({
+        prompt: message,
+        onHeuristic: (top) => setMatches(top.recommendations?.length ? top : null),
+        onField: (path, value) => {
+          // "pathway_data.mdc_phase" etc. render as soon as Gemini has written them
+          const [root, key] = path.split(".");
+          if (root === "pathway_data" && key) {
+            streamed = { ...(streamed || {}), [key]: value };
+            setPathway(streamed);
+          }
+        },
+      });
       console.log("AI response:", response);
 
       let parsedData = null;
@@ -302,6 +317,27 @@ const exportJSONToPDF = () => {
           </Card>
         </motion.div>
 
+        {/* --- HEURISTIC MATCHES (first streamed event) --- */}
+        {matches && (
+          <Card className="mt-12 border-slate-200 shadow-lg">
+            <CardContent className="p-6">
+              <h2 className="text-lg font-semibold text-slate-800 mb-3">
+                MDC programs for {matches.goal}
+              </h2>
+              <ul className="space-y-2">
+                {matches.recommendations.map((r) => (
+                  <li key={r.program.id} className="flex justify-between text-slate-700">
+                    <span>{r.program.name}</span>
+                    <span className="text-slate-500">
+                      {r.remaining_credits} credits · ~{r.estimated_terms} terms
+                    </span>
+                  </li>
+                ))}
+              </ul>
+            </CardContent>
+          </Card>
+        )}
+
         {/* --- GENERATED PATHWAY BELOW CHAT --- */}
         {pathway && (
           <motion.div